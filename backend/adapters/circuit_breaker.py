@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from backend.adapters.resilience import UpstreamError
+from backend.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(UpstreamError):
+    """Raised instead of calling upstream while the breaker is open (fail fast)."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding window of recent call outcomes.
+    - closed: calls flow; once the window holds at least 'min_calls' outcomes and the
+      failure rate (errors, timeouts and calls slower than 'slow_call_s') reaches
+      'failure_rate', the breaker opens
+    - open: calls fail immediately with CircuitOpen for 'open_s' seconds
+    - half-open: up to 'probes' trial calls go through; if they all succeed the
+      breaker closes, any failure re-opens it
+
+    Usage: acquire() before the call (raises CircuitOpen), then record(ok, seconds).
+    """
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_s: float,
+        open_s: float,
+        probes: int,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_s = slow_call_s
+        self.open_s = open_s
+        self.probes = max(1, probes)
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_ok = 0
+        self.transitions: Dict[str, int] = {}
+        self.short_circuited = 0
+
+    def _transition(self, state: str) -> None:
+        edge = f"{self.state}->{state}"
+        self.transitions[edge] = self.transitions.get(edge, 0) + 1
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == HALF_OPEN:
+            self._probes_started = 0
+            self._probes_ok = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def acquire(self) -> None:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_s:
+                self.short_circuited += 1
+                raise CircuitOpen(f"circuit '{self.name}' is open")
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.probes:
+                self.short_circuited += 1
+                raise CircuitOpen(f"circuit '{self.name}' is half-open (probes in flight)")
+            self._probes_started += 1
+
+    def record(self, ok: bool, duration_s: float) -> None:
+        failed = (not ok) or duration_s >= self.slow_call_s
+        if self.state == HALF_OPEN:
+            if failed:
+                self._transition(OPEN)
+            else:
+                self._probes_ok += 1
+                if self._probes_ok >= self.probes:
+                    self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            return  # late result from before the trip
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls:
+            rate = sum(self._outcomes) / len(self._outcomes)
+            if rate >= self.failure_rate:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call that ended without a verdict (e.g. cancelled)."""
+        if self.state == HALF_OPEN and self._probes_started > 0:
+            self._probes_started -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        window = len(self._outcomes)
+        return {
+            "state": self.state,
+            "window_calls": window,
+            "window_failure_rate": (sum(self._outcomes) / window) if window else 0.0,
+            "short_circuited": self.short_circuited,
+            "transitions": dict(self.transitions),
+        }
+
+
+# One breaker per upstream (adapter + model), shared by every caller in the process.
+breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = breakers.get(name)
+    if breaker is None:
+        breaker = breakers[name] = CircuitBreaker(
+            name,
+            window=settings.CB_WINDOW,
+            min_calls=settings.CB_MIN_CALLS,
+            failure_rate=settings.CB_FAILURE_RATE,
+            slow_call_s=settings.CB_SLOW_CALL_MS / 1000.0,
+            open_s=settings.CB_OPEN_MS / 1000.0,
+            probes=settings.CB_HALF_OPEN_PROBES,
+        )
+    return breaker
@@ -1,35 +1,149 @@
-# Simple local generator for dev / fallback
+import re
+from typing import Dict, List, Tuple
+
+from backend.adapters.question_bank import CHOICE_SETS, FRAMING, GENERAL_TOPIC, LANGUAGES, TEMPLATES, TOPICS
+
+# Local generator for dev / fallback / instant drafts, built on the question bank.
+# - the brief is tokenized and looked up in an inverted keyword index (token -> topics);
+#   the best-scoring topics (max 3) are followed by the general topic
+# - candidates are pre-rendered per (language, topic) at import, so a call only picks
+#   and copies dicts: exactly num_questions, round-robin across question types so the
+#   mix stays balanced, output deterministic for a given brief (cache-friendly)
+# - unknown languages fall back to English
+
+QUESTION_TYPES = ("multiple_choice_single", "rating", "open_text", "multiple_choice_multi")  # pick rotation
+_DISPLAY_ORDER = {"multiple_choice_single": 0, "rating": 1, "multiple_choice_multi": 2, "open_text": 3}
+_MAX_TOPICS = 3
+
+_TOKEN = re.compile(r"[^\W\d_]+")
+
+# Candidate question: (type, text, extra) where extra is a choice-label list or (min, max).
+_Candidate = Tuple[str, str, object]
+
+
+def _build_index() -> Dict[str, Tuple[str, ...]]:
+    index: Dict[str, List[str]] = {}
+    for name, topic in TOPICS.items():
+        for kw in topic["keywords"]:
+            if name not in index.setdefault(kw, []):
+                index[kw].append(name)
+    return {kw: tuple(names) for kw, names in index.items()}
+
+
+def _render(lang: str, topic: dict, scopes: Tuple[str, ...]) -> Dict[str, List[_Candidate]]:
+    # Candidates per type for one topic; aspect templates rotate their starting aspect
+    # so satisfaction / rating / open questions don't all ask about the same things first.
+    phrase, aspects = topic[lang]
+    out: Dict[str, List[_Candidate]] = {t: [] for t in QUESTION_TYPES}
+    aspect_template = 0
+    for qtype, scope, text, extra in TEMPLATES[lang]:
+        if scope not in scopes:
+            continue
+        if extra == "aspects":
+            extra = [label for label, _ in aspects]
+        elif isinstance(extra, str):
+            extra = CHOICE_SETS[lang][extra]
+        if scope == "aspect":
+            start = (aspect_template * 2) % len(aspects)
+            aspect_template += 1
+            for _, aspect in aspects[start:] + aspects[:start]:
+                out[qtype].append((qtype, text.format(aspect=aspect), extra))
+        else:
+            out[qtype].append((qtype, text.format(topic=phrase), extra))
+    return out
+
+
+KEYWORD_INDEX = _build_index()
+_TOPIC_QUESTIONS = {
+    (lang, name): _render(lang, topic, ("topic",))
+    for lang in LANGUAGES for name, topic in list(TOPICS.items()) + [("general", GENERAL_TOPIC)]
+}
+_ASPECT_QUESTIONS = {
+    (lang, name): _render(lang, topic, ("aspect",))
+    for lang in LANGUAGES for name, topic in list(TOPICS.items()) + [("general", GENERAL_TOPIC)]
+}
+_GENERAL_QUESTIONS = {lang: _render(lang, GENERAL_TOPIC, ("general",)) for lang in LANGUAGES}
+
+
+def _language(language: str) -> str:
+    lang = (language or "en").lower().replace("_", "-").split("-")[0]
+    return lang if lang in TEMPLATES else "en"
+
+
+def match_topics(description: str, limit: int = _MAX_TOPICS) -> List[str]:
+    """Topics whose keywords occur in 'description', best first (score, then first occurrence)."""
+    scores: Dict[str, List[int]] = {}
+    for pos, token in enumerate(_TOKEN.findall(description.lower())):
+        names = KEYWORD_INDEX.get(token)
+        if names is None and len(token) > 3 and token.endswith("s"):
+            names = KEYWORD_INDEX.get(token[:-1])
+        for name in names or ():
+            hit = scores.get(name)
+            if hit is None:
+                scores[name] = [1, pos]
+            else:
+                hit[0] += 1
+    ranked = sorted(scores, key=lambda name: (-scores[name][0], scores[name][1]))
+    return ranked[:limit]
+
+
+def _question(qid: str, candidate: _Candidate, placeholder: str) -> dict:
+    qtype, text, extra = candidate
+    q = {"id": qid, "type": qtype, "text": text, "required": True}
+    if qtype == "rating":
+        q["scale_min"], q["scale_max"] = extra
+    elif qtype == "open_text":
+        q["required"] = False
+        q["placeholder"] = placeholder
+    else:
+        q["choices"] = [{"id": f"c{i}", "label": label} for i, label in enumerate(extra, start=1)]
+    return q
+
+
 def generate_mock_survey(description: str, num_questions: int = 8, language: str = "en") -> dict:
-    base_title = f"Survey: {description}"
-    qs = []
-    # Always start with satisfaction + rating + two open-text + one multi
-    qs.append({
-        "id": "q1", "type": "multiple_choice_single",
-        "text": "How satisfied are you overall?",
-        "required": True,
-        "choices": [
-            {"id":"c1","label":"Very satisfied"},
-            {"id":"c2","label":"Satisfied"},
-            {"id":"c3","label":"Neutral"},
-            {"id":"c4","label":"Dissatisfied"},
-            {"id":"c5","label":"Very dissatisfied"},
-        ],
-    })
-    qs.append({"id":"q2","type":"rating","text":"Rate your overall experience","scale_min":1,"scale_max":5})
-    qs.append({"id":"q3","type":"open_text","text":"What did we do well?","placeholder":"Your answer..."})
-    qs.append({"id":"q4","type":"open_text","text":"What could we improve?","placeholder":"Your answer..."})
-    qs.append({
-        "id":"q5","type":"multiple_choice_multi",
-        "text":"Which aspects mattered most?",
-        "choices":[
-            {"id":"c1","label":"Price"},
-            {"id":"c2","label":"Quality"},
-            {"id":"c3","label":"Delivery"},
-            {"id":"c4","label":"Customer support"},
-        ],
-    })
+    lang = _language(language)
+    title, summary, placeholder = FRAMING[lang]
+    topics = match_topics(description) + ["general"]
+
+    # Candidate order per type: topic-level questions of the matched topics, the general
+    # questions, then per-aspect questions; the general topic comes last throughout.
+    pools: Dict[str, List[_Candidate]] = {t: [] for t in QUESTION_TYPES}
+    for qtype in QUESTION_TYPES:
+        pool = pools[qtype]
+        for name in topics[:-1]:
+            pool += _TOPIC_QUESTIONS[lang, name][qtype]
+        pool += _GENERAL_QUESTIONS[lang][qtype]
+        for name in topics[:-1]:
+            pool += _ASPECT_QUESTIONS[lang, name][qtype]
+        pool += _TOPIC_QUESTIONS[lang, "general"][qtype]
+        pool += _ASPECT_QUESTIONS[lang, "general"][qtype]
+
+    # Round-robin across types until exactly 'n' distinct questions are picked.
+    n = max(3, min(num_questions, 20))
+    picked: List[_Candidate] = []
+    seen = set()
+    cursors = dict.fromkeys(QUESTION_TYPES, 0)
+    while len(picked) < n:
+        progressed = False
+        for qtype in QUESTION_TYPES:
+            pool = pools[qtype]
+            i = cursors[qtype]
+            while i < len(pool) and pool[i][1] in seen:
+                i += 1
+            if i < len(pool):
+                picked.append(pool[i])
+                seen.add(pool[i][1])
+                i += 1
+                progressed = True
+            cursors[qtype] = i
+            if len(picked) == n:
+                break
+        if not progressed:
+            break
+
+    picked.sort(key=lambda c: _DISPLAY_ORDER[c[0]])
     return {
-        "title": base_title,
-        "description": f'Auto-generated (mock) from brief: "{description}"',
-        "questions": qs[:max(3, min(num_questions, len(qs)))]
+        "title": title.format(brief=description),
+        "description": summary.format(brief=description),
+        "questions": [_question(f"q{i}", c, placeholder) for i, c in enumerate(picked, start=1)],
     }
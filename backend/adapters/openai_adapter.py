@@ -1,6 +1,19 @@
-from typing import Any, Dict
-from openai import AsyncOpenAI
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from backend.config import settings
+from backend.adapters.circuit_breaker import get_breaker
+from backend.metrics import LLM_TOKENS_TOTAL
+from backend.adapters.resilience import (
+    TokenBucket, UpstreamError, UpstreamRateLimited, UpstreamTimeout, UpstreamUnavailable,
+    backoff_delay, hedged, retry_after_seconds,
+)
+
+T = TypeVar("T")
 
 # IMPORTANT: Uses OpenAI Structured Outputs (response_format.json_schema).
 # This enforces the model to return valid JSON conforming to the schema,
@@ -71,22 +84,260 @@ SYSTEM_PROMPT = (
     "Keep language clear and neutral. Return ONLY JSON that matches the provided schema."
 )
 
+def _classify_error(e: Exception) -> Tuple[Optional[UpstreamError], bool, Optional[float]]:
+    """
+    Map SDK/transport errors to (typed error, retryable?, server-requested delay).
+    Anything that isn't an upstream availability problem (400, 401, ...) maps to None
+    and is re-raised unchanged.
+    """
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if isinstance(e, openai.RateLimitError):
+        # Exhausted quota won't recover by retrying; plain 429s will.
+        retryable = getattr(e, "code", None) != "insufficient_quota"
+        return UpstreamRateLimited(str(e)), retryable, retry_after_seconds(headers)
+    if isinstance(e, (openai.APITimeoutError, asyncio.TimeoutError, httpx.TimeoutException)):
+        return UpstreamTimeout(str(e) or "upstream timeout"), True, None
+    if isinstance(e, (openai.APIConnectionError, httpx.TransportError)):
+        return UpstreamUnavailable(str(e)), True, None
+    if isinstance(e, openai.APIStatusError) and e.status_code >= 500:
+        return UpstreamUnavailable(str(e)), True, retry_after_seconds(headers)
+    return None, False, None
+
+def _count_tokens(usage: Any) -> None:
+    if usage is None:
+        return
+    LLM_TOKENS_TOTAL.inc(getattr(usage, "prompt_tokens", 0) or 0, "prompt")
+    LLM_TOKENS_TOTAL.inc(getattr(usage, "completion_tokens", 0) or 0, "completion")
+
 class OpenAIAdapter:
     """
     Thin adapter around the OpenAI Chat Completions API.
     - Accepts a brief, expected count, and language.
     - Requests structured JSON back that conforms to our schema.
+    - Owns the upstream traffic policy: one pooled HTTP client, a concurrency cap,
+      a client-side token bucket (requests/minute), retries with jittered backoff
+      that honor Retry-After, and optional hedged requests.
+    - Wraps each logical call (all retries included) in a circuit breaker, so a
+      degraded upstream fails fast with CircuitOpen instead of timing out per request.
+    - Raises backend.adapters.resilience.Upstream* errors for availability problems.
     """
     def __init__(self, api_key: str | None = None, model: str | None = None, timeout_ms: int | None = None):
-        self.client = AsyncOpenAI(api_key=api_key)
         self.model = model or settings.OPENAI_MODEL
         self.timeout_ms = timeout_ms or settings.OPENAI_TIMEOUT_MS
+        # Retries are ours (below); the SDK's own retry loop is disabled.
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings.OPENAI_BASE_URL,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_POOL_MAX_KEEPALIVE,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(self.timeout_ms / 1000.0, connect=5.0),
+            ),
+        )
+        self.max_concurrency = settings.OPENAI_MAX_CONCURRENCY
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = TokenBucket(rate=settings.OPENAI_RPM / 60.0, burst=settings.OPENAI_BURST)
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+        self.backoff_base_s = settings.OPENAI_BACKOFF_BASE_MS / 1000.0
+        self.backoff_max_s = settings.OPENAI_BACKOFF_MAX_MS / 1000.0
+        self.hedge_after_s = settings.OPENAI_HEDGE_AFTER_MS / 1000.0
+        self.breaker = get_breaker(f"openai:{settings.OPENAI_BASE_URL or 'default'}:{self.model}") if settings.CB_ENABLED else None
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    # -- traffic policy --------------------------------------------------------
+    async def _run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            return await fn()
+        finally:
+            self.in_flight -= 1
+
+    async def _limited(self, fn: Callable[[], Awaitable[T]]) -> T:
+        # Token bucket first (don't hold a slot while throttled), then a concurrency slot.
+        await self._bucket.acquire()
+        async with self._slots:
+            if self.hedge_after_s > 0:
+                # The hedge clock starts once the primary is actually on the wire, so
+                # local queueing never triggers a hedge; the backup gets its own token/slot.
+                return await hedged(
+                    lambda: self._run(fn),
+                    self.hedge_after_s,
+                    self._count_hedge,
+                    backup=lambda: self._limited_once(fn),
+                )
+            return await self._run(fn)
+
+    async def _limited_once(self, fn: Callable[[], Awaitable[T]]) -> T:
+        await self._bucket.acquire()
+        async with self._slots:
+            return await self._run(fn)
+
+    def _count_hedge(self) -> None:
+        self.hedges += 1
+
+    async def _with_retries(self, fn: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._limited(fn)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _guarded(self, fn: Callable[[], Awaitable[T]]) -> T:
+        # Only availability errors (Upstream*) count against the breaker; a 400 or a
+        # cancelled caller says nothing about upstream health and records no verdict.
+        if self.breaker is None:
+            return await fn()
+        self.breaker.acquire()
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except UpstreamError:
+            self.breaker.record(False, time.monotonic() - start)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record(True, time.monotonic() - start)
+        return result
+
+    def _retry_delay(self, e: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying 'e', or None when the caller should give up.
+        Availability errors are re-raised as Upstream* once retries are exhausted.
+        """
+        typed, retryable, retry_after = _classify_error(e)
+        if typed is None:
+            return None
+        if isinstance(typed, UpstreamRateLimited):
+            self.rate_limited += 1
+        if not retryable or attempt >= self.max_retries:
+            self.failures += 1
+            raise typed from e
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max_s)
+        return backoff_delay(attempt, self.backoff_base_s, self.backoff_max_s)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "throttled_wait_s": round(self._bucket.waited_s, 3),
+        }
 
     async def generate_survey(self, description: str, num_questions: int = 8, language: str = "en") -> dict:
         """
         Build a JSON-only request using Structured Outputs so the response matches 'build_survey_json_schema'.
         Falls back to parsing 'content' if SDK doesn't expose 'parsed'.
         """
+        kwargs = self._request_kwargs(description, num_questions, language)
+        resp = await self._guarded(lambda: self._with_retries(lambda: self.client.chat.completions.create(**kwargs)))
+        _count_tokens(getattr(resp, "usage", None))
+
+        # Some SDK builds expose 'parsed' directly on the message.
+        msg = resp.choices[0].message
+        parsed = getattr(msg, "parsed", None)
+        if parsed is not None:
+            return parsed  # type: ignore[return-value]
+
+        # Fallback: parse JSON string content if 'parsed' is not available.
+        content = msg.content or "{}"
+        import json
+        return json.loads(content)
+
+    async def stream_survey(self, description: str, num_questions: int = 8, language: str = "en") -> AsyncIterator[str]:
+        """
+        Same request as 'generate_survey', but streamed: yields raw JSON text deltas
+        as the model produces them. Callers parse incrementally (see backend/jsonstream.py).
+        Retries only happen before the first delta; the concurrency slot is held
+        until the stream ends. Not hedged. The breaker verdict covers the whole stream.
+        """
+        kwargs = self._request_kwargs(description, num_questions, language)
+        if self.breaker is not None:
+            self.breaker.acquire()
+        start = time.monotonic()
+        verdict: Optional[bool] = None
+        try:
+            # aclosing: a caller that stops early closes the inner stream (and its slot) now, not at GC.
+            async with aclosing(self._stream_deltas(kwargs)) as deltas:
+                async for delta in deltas:
+                    yield delta
+            verdict = True
+        except UpstreamError:
+            verdict = False
+            raise
+        finally:
+            if self.breaker is not None:
+                if verdict is None:
+                    self.breaker.release()
+                else:
+                    self.breaker.record(verdict, time.monotonic() - start)
+
+    async def _stream_deltas(self, kwargs: Dict[str, Any]) -> AsyncIterator[str]:
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            await self._slots.acquire()
+            try:
+                stream = await self.client.chat.completions.create(
+                    **kwargs, stream=True, stream_options={"include_usage": True},
+                )
+                break
+            except BaseException as e:
+                # Cancellation included: the slot is only kept once the stream is open.
+                self._slots.release()
+                if not isinstance(e, Exception):
+                    raise
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    _count_tokens(getattr(chunk, "usage", None))  # final chunk (include_usage)
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            typed, _, _ = _classify_error(e)
+            if typed is None:
+                raise
+            self.failures += 1
+            raise typed from e
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def _request_kwargs(self, description: str, num_questions: int, language: str) -> Dict[str, Any]:
         schema = build_survey_json_schema()
 
         # Minimal guidance for the model on size, tone, and types.
@@ -102,27 +353,17 @@ class OpenAIAdapter:
         )
 
         # Chat Completions with response_format.json_schema guarantees valid JSON output.
-        resp = await self.client.chat.completions.create(
-            model=self.model,
-            timeout=self.timeout_ms / 1000.0,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_instruction},
-            ],
-            response_format={  # Structured Outputs
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_instruction},
+        ]
+        return {
+            "model": self.model,
+            "timeout": self.timeout_ms / 1000.0,
+            "messages": messages,
+            "response_format": {  # Structured Outputs
                 "type": "json_schema",
                 "json_schema": schema,
             },
-            temperature=0.7,
-        )
-
-        # Some SDK builds expose 'parsed' directly on the message.
-        msg = resp.choices[0].message
-        parsed = getattr(msg, "parsed", None)
-        if parsed is not None:
-            return parsed  # type: ignore[return-value]
-
-        # Fallback: parse JSON string content if 'parsed' is not available.
-        content = msg.content or "{}"
-        import json
-        return json.loads(content)
+            "temperature": 0.7,
+        }
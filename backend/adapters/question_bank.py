@@ -0,0 +1,565 @@
+# Curated question bank for the local (offline) survey generator, see mock_adapter.py.
+# Pure data: topics with their trigger keywords and localized wording, plus per-language
+# question templates and answer scales. Supported languages: en, es, fr, de.
+#
+# Wording rules that keep every template grammatical without inflection logic:
+# - "phrase" strings are written for the spot they are substituted into: es/fr use
+#   possessives or prepositions that don't contract ("de nuestro producto",
+#   "concernant le design"), de phrases are dative (all de templates use mit/bei/an/von)
+# - "label" strings are standalone and are used as answer choices
+
+LANGUAGES = ("en", "es", "fr", "de")
+
+# topic -> keywords (any language, lowercase) + per-language (phrase, [(label, phrase), ...])
+TOPICS = {
+    "product": {
+        "keywords": (
+            "product", "products", "item", "items", "purchase", "bought", "quality",
+            "producto", "productos", "compra", "produit", "produits", "achat",
+            "produkt", "produkte", "kauf",
+        ),
+        "en": ("our product", [
+            ("Product quality", "the product quality"),
+            ("Design", "the design"),
+            ("Ease of use", "the ease of use"),
+            ("Value for money", "the value for money"),
+            ("Durability", "the durability"),
+        ]),
+        "es": ("nuestro producto", [
+            ("Calidad del producto", "la calidad del producto"),
+            ("Diseño", "el diseño"),
+            ("Facilidad de uso", "la facilidad de uso"),
+            ("Relación calidad-precio", "la relación calidad-precio"),
+            ("Durabilidad", "la durabilidad"),
+        ]),
+        "fr": ("notre produit", [
+            ("Qualité du produit", "la qualité du produit"),
+            ("Design", "le design"),
+            ("Facilité d'utilisation", "la facilité d'utilisation"),
+            ("Rapport qualité-prix", "le rapport qualité-prix"),
+            ("Durabilité", "la durabilité"),
+        ]),
+        "de": ("unserem Produkt", [
+            ("Produktqualität", "der Produktqualität"),
+            ("Design", "dem Design"),
+            ("Benutzerfreundlichkeit", "der Benutzerfreundlichkeit"),
+            ("Preis-Leistungs-Verhältnis", "dem Preis-Leistungs-Verhältnis"),
+            ("Haltbarkeit", "der Haltbarkeit"),
+        ]),
+    },
+    "support": {
+        "keywords": (
+            "support", "helpdesk", "hotline", "agent", "agents", "ticket", "tickets", "complaint",
+            "soporte", "atención", "atencion", "reclamo", "assistance", "conseiller", "réclamation",
+            "kundenservice", "kundendienst", "beschwerde",
+        ),
+        "en": ("our customer support", [
+            ("Response time", "the response time"),
+            ("Friendliness of staff", "the friendliness of our staff"),
+            ("Problem resolution", "how your issue was resolved"),
+            ("Communication", "our communication"),
+            ("Availability", "our availability"),
+        ]),
+        "es": ("nuestra atención al cliente", [
+            ("Tiempo de respuesta", "el tiempo de respuesta"),
+            ("Amabilidad del personal", "la amabilidad del personal"),
+            ("Resolución del problema", "la resolución de su problema"),
+            ("Comunicación", "nuestra comunicación"),
+            ("Disponibilidad", "nuestra disponibilidad"),
+        ]),
+        "fr": ("notre service client", [
+            ("Délai de réponse", "le délai de réponse"),
+            ("Amabilité du personnel", "l'amabilité du personnel"),
+            ("Résolution du problème", "la résolution de votre problème"),
+            ("Communication", "notre communication"),
+            ("Disponibilité", "notre disponibilité"),
+        ]),
+        "de": ("unserem Kundenservice", [
+            ("Reaktionszeit", "der Reaktionszeit"),
+            ("Freundlichkeit des Personals", "der Freundlichkeit unseres Personals"),
+            ("Lösung des Problems", "der Lösung Ihres Problems"),
+            ("Kommunikation", "unserer Kommunikation"),
+            ("Erreichbarkeit", "unserer Erreichbarkeit"),
+        ]),
+    },
+    "delivery": {
+        "keywords": (
+            "delivery", "deliveries", "shipping", "shipment", "order", "orders", "courier", "package",
+            "parcel", "entrega", "envío", "envio", "pedido", "pedidos", "paquete",
+            "livraison", "commande", "commandes", "colis",
+            "lieferung", "versand", "bestellung", "paket",
+        ),
+        "en": ("our delivery service", [
+            ("Delivery speed", "the delivery speed"),
+            ("Packaging", "the packaging"),
+            ("Order tracking", "the order tracking"),
+            ("Condition on arrival", "the condition of your order on arrival"),
+            ("Shipping cost", "the shipping cost"),
+        ]),
+        "es": ("nuestro servicio de entrega", [
+            ("Rapidez de entrega", "la rapidez de entrega"),
+            ("Embalaje", "el embalaje"),
+            ("Seguimiento del pedido", "el seguimiento del pedido"),
+            ("Estado al llegar", "el estado del pedido al llegar"),
+            ("Costo de envío", "el costo de envío"),
+        ]),
+        "fr": ("notre service de livraison", [
+            ("Rapidité de livraison", "la rapidité de livraison"),
+            ("Emballage", "l'emballage"),
+            ("Suivi de commande", "le suivi de commande"),
+            ("État à la réception", "l'état de la commande à la réception"),
+            ("Frais de livraison", "les frais de livraison"),
+        ]),
+        "de": ("unserem Lieferservice", [
+            ("Liefergeschwindigkeit", "der Liefergeschwindigkeit"),
+            ("Verpackung", "der Verpackung"),
+            ("Sendungsverfolgung", "der Sendungsverfolgung"),
+            ("Zustand bei Ankunft", "dem Zustand Ihrer Bestellung bei Ankunft"),
+            ("Versandkosten", "den Versandkosten"),
+        ]),
+    },
+    "digital": {
+        "keywords": (
+            "website", "site", "web", "app", "apps", "application", "mobile", "online", "platform",
+            "software", "saas", "checkout", "dashboard", "sitio", "página", "pagina", "aplicación",
+            "aplicacion", "plataforma", "appli", "plateforme", "logiciel",
+            "webseite", "anwendung", "plattform",
+        ),
+        "en": ("our website and app", [
+            ("Ease of navigation", "the ease of navigation"),
+            ("Speed and performance", "the speed and performance"),
+            ("Visual design", "the visual design"),
+            ("Search", "the search function"),
+            ("Checkout", "the checkout process"),
+        ]),
+        "es": ("nuestro sitio web y aplicación", [
+            ("Facilidad de navegación", "la facilidad de navegación"),
+            ("Velocidad y rendimiento", "la velocidad y el rendimiento"),
+            ("Diseño visual", "el diseño visual"),
+            ("Búsqueda", "la función de búsqueda"),
+            ("Proceso de pago", "el proceso de pago"),
+        ]),
+        "fr": ("notre site et notre application", [
+            ("Facilité de navigation", "la facilité de navigation"),
+            ("Rapidité et performances", "la rapidité et les performances"),
+            ("Design visuel", "le design visuel"),
+            ("Recherche", "la fonction de recherche"),
+            ("Paiement", "le processus de paiement"),
+        ]),
+        "de": ("unserer Website und App", [
+            ("Navigation", "der Navigation"),
+            ("Geschwindigkeit", "der Geschwindigkeit"),
+            ("Visuelles Design", "dem visuellen Design"),
+            ("Suche", "der Suchfunktion"),
+            ("Bezahlvorgang", "dem Bezahlvorgang"),
+        ]),
+    },
+    "event": {
+        "keywords": (
+            "event", "events", "conference", "webinar", "meetup", "workshop", "summit", "festival",
+            "concert", "evento", "eventos", "conferencia", "taller", "événement", "evenement",
+            "conférence", "atelier", "veranstaltung", "konferenz", "messe",
+        ),
+        "en": ("our event", [
+            ("Speakers", "the speakers"),
+            ("Agenda", "the agenda"),
+            ("Venue", "the venue"),
+            ("Networking", "the networking opportunities"),
+            ("Organization", "the overall organization"),
+        ]),
+        "es": ("nuestro evento", [
+            ("Ponentes", "los ponentes"),
+            ("Agenda", "la agenda"),
+            ("Lugar", "el lugar"),
+            ("Networking", "las oportunidades de networking"),
+            ("Organización", "la organización general"),
+        ]),
+        "fr": ("notre événement", [
+            ("Intervenants", "les intervenants"),
+            ("Programme", "le programme"),
+            ("Lieu", "le lieu"),
+            ("Networking", "les opportunités de networking"),
+            ("Organisation", "l'organisation générale"),
+        ]),
+        "de": ("unserer Veranstaltung", [
+            ("Referenten", "den Referenten"),
+            ("Programm", "dem Programm"),
+            ("Veranstaltungsort", "dem Veranstaltungsort"),
+            ("Networking", "den Networking-Möglichkeiten"),
+            ("Organisation", "der Organisation"),
+        ]),
+    },
+    "learning": {
+        "keywords": (
+            "course", "courses", "training", "class", "classes", "lesson", "lessons", "teacher",
+            "instructor", "student", "students", "school", "learning", "curso", "cursos", "formación",
+            "clase", "profesor", "estudiante", "estudiantes", "escuela", "cours", "formation",
+            "enseignant", "étudiant", "étudiants", "école", "kurs", "schulung", "unterricht",
+            "lehrer", "schüler", "schule",
+        ),
+        "en": ("our course", [
+            ("Course content", "the course content"),
+            ("Instructor", "the instructor"),
+            ("Pace", "the pace"),
+            ("Learning materials", "the learning materials"),
+            ("Practical relevance", "the practical relevance"),
+        ]),
+        "es": ("nuestro curso", [
+            ("Contenido", "el contenido del curso"),
+            ("Instructor", "el instructor"),
+            ("Ritmo", "el ritmo"),
+            ("Materiales", "los materiales de aprendizaje"),
+            ("Aplicación práctica", "la aplicación práctica"),
+        ]),
+        "fr": ("notre formation", [
+            ("Contenu", "le contenu de la formation"),
+            ("Formateur", "le formateur"),
+            ("Rythme", "le rythme"),
+            ("Supports", "les supports pédagogiques"),
+            ("Utilité pratique", "l'utilité pratique"),
+        ]),
+        "de": ("unserem Kurs", [
+            ("Kursinhalte", "den Kursinhalten"),
+            ("Kursleitung", "der Kursleitung"),
+            ("Tempo", "dem Tempo"),
+            ("Lernmaterialien", "den Lernmaterialien"),
+            ("Praxisbezug", "dem Praxisbezug"),
+        ]),
+    },
+    "workplace": {
+        "keywords": (
+            "employee", "employees", "staff", "team", "workplace", "job", "manager", "managers",
+            "engagement", "colleagues", "hr", "empleado", "empleados", "trabajo", "equipo",
+            "employé", "employés", "salarié", "salariés", "travail", "équipe",
+            "mitarbeiter", "mitarbeitende", "arbeit", "arbeitsplatz",
+        ),
+        "en": ("our workplace", [
+            ("Workload", "your workload"),
+            ("Management support", "the support from your manager"),
+            ("Team collaboration", "collaboration within your team"),
+            ("Growth opportunities", "the growth opportunities"),
+            ("Work-life balance", "your work-life balance"),
+        ]),
+        "es": ("nuestro lugar de trabajo", [
+            ("Carga de trabajo", "su carga de trabajo"),
+            ("Apoyo del responsable", "el apoyo de su responsable"),
+            ("Colaboración", "la colaboración en su equipo"),
+            ("Desarrollo profesional", "las oportunidades de desarrollo"),
+            ("Conciliación", "el equilibrio entre vida laboral y personal"),
+        ]),
+        "fr": ("notre environnement de travail", [
+            ("Charge de travail", "votre charge de travail"),
+            ("Soutien du responsable", "le soutien de votre responsable"),
+            ("Collaboration", "la collaboration au sein de votre équipe"),
+            ("Évolution", "les perspectives d'évolution"),
+            ("Équilibre vie pro/perso", "l'équilibre entre vie professionnelle et personnelle"),
+        ]),
+        "de": ("Ihrem Arbeitsumfeld", [
+            ("Arbeitsbelastung", "Ihrer Arbeitsbelastung"),
+            ("Unterstützung durch Führung", "der Unterstützung durch Ihre Führungskraft"),
+            ("Zusammenarbeit", "der Zusammenarbeit im Team"),
+            ("Entwicklungsmöglichkeiten", "den Entwicklungsmöglichkeiten"),
+            ("Work-Life-Balance", "Ihrer Work-Life-Balance"),
+        ]),
+    },
+    "dining": {
+        "keywords": (
+            "restaurant", "restaurants", "food", "meal", "meals", "menu", "dining", "cafe", "café",
+            "dish", "dishes", "waiter", "comida", "restaurante", "menú", "plato", "platos",
+            "camarero", "nourriture", "repas", "plat", "plats", "serveur",
+            "essen", "gericht", "speisekarte", "kellner",
+        ),
+        "en": ("our restaurant", [
+            ("Food quality", "the food quality"),
+            ("Service", "the service"),
+            ("Ambience", "the ambience"),
+            ("Waiting time", "the waiting time"),
+            ("Prices", "the prices"),
+        ]),
+        "es": ("nuestro restaurante", [
+            ("Calidad de la comida", "la calidad de la comida"),
+            ("Servicio", "el servicio"),
+            ("Ambiente", "el ambiente"),
+            ("Tiempo de espera", "el tiempo de espera"),
+            ("Precios", "los precios"),
+        ]),
+        "fr": ("notre restaurant", [
+            ("Qualité des plats", "la qualité des plats"),
+            ("Service", "le service"),
+            ("Ambiance", "l'ambiance"),
+            ("Temps d'attente", "le temps d'attente"),
+            ("Prix", "les prix"),
+        ]),
+        "de": ("unserem Restaurant", [
+            ("Qualität der Speisen", "der Qualität der Speisen"),
+            ("Service", "dem Service"),
+            ("Ambiente", "dem Ambiente"),
+            ("Wartezeit", "der Wartezeit"),
+            ("Preise", "den Preisen"),
+        ]),
+    },
+    "travel": {
+        "keywords": (
+            "hotel", "hotels", "stay", "room", "rooms", "travel", "trip", "booking", "flight",
+            "vacation", "holiday", "guest", "guests", "estancia", "habitación", "viaje", "reserva",
+            "vuelo", "vacaciones", "huésped", "séjour", "chambre", "voyage", "réservation", "vol",
+            "vacances", "aufenthalt", "zimmer", "reise", "buchung", "flug", "urlaub",
+        ),
+        "en": ("your stay", [
+            ("Room comfort", "the comfort of your room"),
+            ("Cleanliness", "the cleanliness"),
+            ("Check-in", "the check-in process"),
+            ("Staff", "the staff"),
+            ("Location", "the location"),
+        ]),
+        "es": ("su estancia", [
+            ("Comodidad", "la comodidad de la habitación"),
+            ("Limpieza", "la limpieza"),
+            ("Registro de entrada", "el proceso de registro"),
+            ("Personal", "el personal"),
+            ("Ubicación", "la ubicación"),
+        ]),
+        "fr": ("votre séjour", [
+            ("Confort", "le confort de la chambre"),
+            ("Propreté", "la propreté"),
+            ("Enregistrement", "l'enregistrement"),
+            ("Personnel", "le personnel"),
+            ("Emplacement", "l'emplacement"),
+        ]),
+        "de": ("Ihrem Aufenthalt", [
+            ("Zimmerkomfort", "dem Zimmerkomfort"),
+            ("Sauberkeit", "der Sauberkeit"),
+            ("Check-in", "dem Check-in"),
+            ("Personal", "dem Personal"),
+            ("Lage", "der Lage"),
+        ]),
+    },
+    "health": {
+        "keywords": (
+            "health", "healthcare", "clinic", "hospital", "doctor", "doctors", "patient", "patients",
+            "appointment", "nurse", "salud", "clínica", "clinica", "médico", "medico", "paciente",
+            "pacientes", "cita", "santé", "clinique", "hôpital", "médecin", "soins",
+            "gesundheit", "klinik", "krankenhaus", "arzt", "praxis", "termin",
+        ),
+        "en": ("the care you received", [
+            ("Waiting time", "the waiting time"),
+            ("Staff", "the care from our staff"),
+            ("Clear explanations", "how clearly things were explained"),
+            ("Appointment booking", "booking an appointment"),
+            ("Facilities", "the facilities"),
+        ]),
+        "es": ("la atención recibida", [
+            ("Tiempo de espera", "el tiempo de espera"),
+            ("Trato del personal", "el trato del personal"),
+            ("Explicaciones claras", "la claridad de las explicaciones"),
+            ("Gestión de citas", "la gestión de citas"),
+            ("Instalaciones", "las instalaciones"),
+        ]),
+        "fr": ("les soins reçus", [
+            ("Temps d'attente", "le temps d'attente"),
+            ("Attention du personnel", "l'attention du personnel"),
+            ("Clarté des explications", "la clarté des explications"),
+            ("Prise de rendez-vous", "la prise de rendez-vous"),
+            ("Installations", "les installations"),
+        ]),
+        "de": ("der erhaltenen Versorgung", [
+            ("Wartezeit", "der Wartezeit"),
+            ("Betreuung durch das Personal", "der Betreuung durch das Personal"),
+            ("Verständliche Erklärungen", "der Verständlichkeit der Erklärungen"),
+            ("Terminvergabe", "der Terminvergabe"),
+            ("Räumlichkeiten", "den Räumlichkeiten"),
+        ]),
+    },
+    "pricing": {
+        "keywords": (
+            "price", "prices", "pricing", "cost", "costs", "plan", "plans", "subscription", "billing",
+            "payment", "precio", "precios", "suscripción", "suscripcion", "pago", "factura",
+            "prix", "tarif", "tarifs", "abonnement", "paiement", "facturation",
+            "preis", "preise", "abo", "zahlung", "rechnung",
+        ),
+        "en": ("our pricing", [
+            ("Overall price", "the overall price"),
+            ("Plan options", "the choice of plans"),
+            ("Billing clarity", "the clarity of billing"),
+            ("Payment methods", "the payment methods"),
+            ("Value for money", "the value for money"),
+        ]),
+        "es": ("nuestros precios", [
+            ("Precio general", "el precio general"),
+            ("Variedad de planes", "la variedad de planes"),
+            ("Claridad de la facturación", "la claridad de la facturación"),
+            ("Métodos de pago", "los métodos de pago"),
+            ("Relación calidad-precio", "la relación calidad-precio"),
+        ]),
+        "fr": ("nos tarifs", [
+            ("Prix global", "le prix global"),
+            ("Choix des formules", "le choix des formules"),
+            ("Clarté de la facturation", "la clarté de la facturation"),
+            ("Moyens de paiement", "les moyens de paiement"),
+            ("Rapport qualité-prix", "le rapport qualité-prix"),
+        ]),
+        "de": ("unseren Preisen", [
+            ("Gesamtpreis", "dem Gesamtpreis"),
+            ("Tarifauswahl", "der Auswahl an Tarifen"),
+            ("Verständliche Abrechnung", "der Verständlichkeit der Abrechnung"),
+            ("Zahlungsarten", "den Zahlungsarten"),
+            ("Preis-Leistungs-Verhältnis", "dem Preis-Leistungs-Verhältnis"),
+        ]),
+    },
+}
+
+# Used when no keyword matches, and as the last topic for long surveys.
+GENERAL_TOPIC = {
+    "keywords": (),
+    "en": ("your experience with us", [
+        ("Ease", "how easy it was to get what you needed"),
+        ("Speed", "the speed of service"),
+        ("Quality", "the overall quality"),
+        ("Value for money", "the value for money"),
+        ("Communication", "our communication"),
+    ]),
+    "es": ("su experiencia con nosotros", [
+        ("Facilidad", "la facilidad del proceso"),
+        ("Rapidez", "la rapidez del servicio"),
+        ("Calidad", "la calidad general"),
+        ("Relación calidad-precio", "la relación calidad-precio"),
+        ("Comunicación", "nuestra comunicación"),
+    ]),
+    "fr": ("votre expérience avec nous", [
+        ("Simplicité", "la simplicité du parcours"),
+        ("Rapidité", "la rapidité du service"),
+        ("Qualité", "la qualité globale"),
+        ("Rapport qualité-prix", "le rapport qualité-prix"),
+        ("Communication", "notre communication"),
+    ]),
+    "de": ("Ihrer Erfahrung mit uns", [
+        ("Einfachheit", "der Einfachheit des Ablaufs"),
+        ("Schnelligkeit", "der Schnelligkeit des Service"),
+        ("Qualität", "der Gesamtqualität"),
+        ("Preis-Leistungs-Verhältnis", "dem Preis-Leistungs-Verhältnis"),
+        ("Kommunikation", "unserer Kommunikation"),
+    ]),
+}
+
+# Fixed answer lists for choice templates that aren't built from a topic's aspects.
+CHOICE_SETS = {
+    "en": {
+        "satisfaction": ["Very satisfied", "Satisfied", "Neutral", "Dissatisfied", "Very dissatisfied"],
+        "expectations": ["Exceeded my expectations", "Met my expectations", "Fell short of my expectations"],
+        "likelihood": ["Very likely", "Likely", "Not sure", "Unlikely", "Very unlikely"],
+        "channels": ["Search engine", "Social media", "Friend or colleague", "Advertisement", "Other"],
+        "interests": ["New products and services", "Offers and discounts", "Tips and guides", "Events", "None of these"],
+        "contact": ["Email", "Phone", "Text message", "Social media", "Please don't contact me"],
+    },
+    "es": {
+        "satisfaction": ["Muy satisfecho", "Satisfecho", "Neutral", "Insatisfecho", "Muy insatisfecho"],
+        "expectations": ["Superó mis expectativas", "Cumplió mis expectativas", "No cumplió mis expectativas"],
+        "likelihood": ["Muy probable", "Probable", "No estoy seguro", "Poco probable", "Nada probable"],
+        "channels": ["Buscador", "Redes sociales", "Un amigo o colega", "Publicidad", "Otro"],
+        "interests": ["Nuevos productos y servicios", "Ofertas y descuentos", "Consejos y guías", "Eventos", "Nada de esto"],
+        "contact": ["Correo electrónico", "Teléfono", "SMS", "Redes sociales", "Prefiero no ser contactado"],
+    },
+    "fr": {
+        "satisfaction": ["Très satisfait", "Satisfait", "Neutre", "Insatisfait", "Très insatisfait"],
+        "expectations": ["Au-delà de mes attentes", "Conforme à mes attentes", "En deçà de mes attentes"],
+        "likelihood": ["Très probable", "Probable", "Je ne sais pas", "Peu probable", "Très peu probable"],
+        "channels": ["Moteur de recherche", "Réseaux sociaux", "Un ami ou collègue", "Publicité", "Autre"],
+        "interests": ["Nouveaux produits et services", "Offres et réductions", "Conseils et guides", "Événements", "Rien de tout cela"],
+        "contact": ["E-mail", "Téléphone", "SMS", "Réseaux sociaux", "Ne pas me contacter"],
+    },
+    "de": {
+        "satisfaction": ["Sehr zufrieden", "Zufrieden", "Neutral", "Unzufrieden", "Sehr unzufrieden"],
+        "expectations": ["Übertroffen", "Erfüllt", "Nicht erfüllt"],
+        "likelihood": ["Sehr wahrscheinlich", "Wahrscheinlich", "Weiß nicht", "Unwahrscheinlich", "Sehr unwahrscheinlich"],
+        "channels": ["Suchmaschine", "Soziale Medien", "Freunde oder Kollegen", "Werbung", "Sonstiges"],
+        "interests": ["Neue Produkte und Services", "Angebote und Rabatte", "Tipps und Anleitungen", "Veranstaltungen", "Nichts davon"],
+        "contact": ["E-Mail", "Telefon", "SMS", "Soziale Medien", "Bitte nicht kontaktieren"],
+    },
+}
+
+# Per-language templates: (type, scope, text, extra)
+# - scope "topic" is filled with {topic}, "aspect" with {aspect} (one question per aspect),
+#   "general" is used as-is once per survey
+# - extra: CHOICE_SETS name or "aspects" for choice types, (scale_min, scale_max) for rating
+TEMPLATES = {
+    "en": [
+        ("multiple_choice_single", "topic", "How satisfied are you with {topic}?", "satisfaction"),
+        ("multiple_choice_single", "topic", "How well did {topic} meet your expectations?", "expectations"),
+        ("multiple_choice_single", "general", "How likely are you to choose us again?", "likelihood"),
+        ("multiple_choice_single", "aspect", "How satisfied are you with {aspect}?", "satisfaction"),
+        ("rating", "topic", "Overall, how would you rate {topic}?", (1, 5)),
+        ("rating", "general", "How likely are you to recommend us to a friend or colleague?", (0, 10)),
+        ("rating", "aspect", "How would you rate {aspect}?", (1, 5)),
+        ("multiple_choice_multi", "topic", "Which aspects of {topic} matter most to you?", "aspects"),
+        ("multiple_choice_multi", "topic", "Which aspects of {topic} should we improve first?", "aspects"),
+        ("multiple_choice_multi", "general", "How did you hear about us?", "channels"),
+        ("multiple_choice_multi", "general", "What would you like to hear more about from us?", "interests"),
+        ("multiple_choice_multi", "general", "How would you prefer us to contact you?", "contact"),
+        ("open_text", "topic", "What do you like most about {topic}?", None),
+        ("open_text", "topic", "What is one thing we could do to improve {topic}?", None),
+        ("open_text", "aspect", "What would you change about {aspect}?", None),
+        ("open_text", "general", "Is there anything else you would like to share?", None),
+    ],
+    "es": [
+        ("multiple_choice_single", "topic", "¿Qué tan satisfecho está con {topic}?", "satisfaction"),
+        ("multiple_choice_single", "topic", "¿En qué medida cumplió con sus expectativas {topic}?", "expectations"),
+        ("multiple_choice_single", "general", "¿Qué tan probable es que vuelva a elegirnos?", "likelihood"),
+        ("multiple_choice_single", "aspect", "¿Qué tan satisfecho está con {aspect}?", "satisfaction"),
+        ("rating", "topic", "En general, ¿cómo calificaría {topic}?", (1, 5)),
+        ("rating", "general", "¿Qué tan probable es que nos recomiende a un amigo o colega?", (0, 10)),
+        ("rating", "aspect", "¿Cómo calificaría {aspect}?", (1, 5)),
+        ("multiple_choice_multi", "topic", "¿Qué aspectos de {topic} son más importantes para usted?", "aspects"),
+        ("multiple_choice_multi", "topic", "¿Qué aspectos de {topic} deberíamos mejorar primero?", "aspects"),
+        ("multiple_choice_multi", "general", "¿Cómo nos conoció?", "channels"),
+        ("multiple_choice_multi", "general", "¿Sobre qué le gustaría recibir más información?", "interests"),
+        ("multiple_choice_multi", "general", "¿Cómo prefiere que nos pongamos en contacto con usted?", "contact"),
+        ("open_text", "topic", "¿Qué es lo que más le gusta de {topic}?", None),
+        ("open_text", "topic", "¿Qué podríamos hacer para mejorar {topic}?", None),
+        ("open_text", "aspect", "¿Qué cambiaría en {aspect}?", None),
+        ("open_text", "general", "¿Hay algo más que quiera compartir con nosotros?", None),
+    ],
+    "fr": [
+        ("multiple_choice_single", "topic", "Quel est votre niveau de satisfaction concernant {topic} ?", "satisfaction"),
+        ("multiple_choice_single", "topic", "Concernant {topic}, vos attentes ont-elles été satisfaites ?", "expectations"),
+        ("multiple_choice_single", "general", "Quelle est la probabilité que vous nous choisissiez à nouveau ?", "likelihood"),
+        ("multiple_choice_single", "aspect", "Quel est votre niveau de satisfaction concernant {aspect} ?", "satisfaction"),
+        ("rating", "topic", "Globalement, comment évaluez-vous {topic} ?", (1, 5)),
+        ("rating", "general", "Quelle est la probabilité que vous nous recommandiez à un ami ou un collègue ?", (0, 10)),
+        ("rating", "aspect", "Comment évaluez-vous {aspect} ?", (1, 5)),
+        ("multiple_choice_multi", "topic", "Quels aspects comptent le plus pour vous concernant {topic} ?", "aspects"),
+        ("multiple_choice_multi", "topic", "Quels aspects devrions-nous améliorer en priorité concernant {topic} ?", "aspects"),
+        ("multiple_choice_multi", "general", "Comment nous avez-vous connus ?", "channels"),
+        ("multiple_choice_multi", "general", "Sur quels sujets aimeriez-vous recevoir plus d'informations ?", "interests"),
+        ("multiple_choice_multi", "general", "Comment préférez-vous être contacté ?", "contact"),
+        ("open_text", "topic", "Qu'appréciez-vous le plus concernant {topic} ?", None),
+        ("open_text", "topic", "Que pourrions-nous faire pour améliorer {topic} ?", None),
+        ("open_text", "aspect", "Que changeriez-vous concernant {aspect} ?", None),
+        ("open_text", "general", "Souhaitez-vous ajouter autre chose ?", None),
+    ],
+    "de": [
+        ("multiple_choice_single", "topic", "Wie zufrieden sind Sie mit {topic}?", "satisfaction"),
+        ("multiple_choice_single", "topic", "Wurden Ihre Erwartungen bei {topic} erfüllt?", "expectations"),
+        ("multiple_choice_single", "general", "Wie wahrscheinlich ist es, dass Sie sich wieder für uns entscheiden?", "likelihood"),
+        ("multiple_choice_single", "aspect", "Wie zufrieden sind Sie mit {aspect}?", "satisfaction"),
+        ("rating", "topic", "Wie bewerten Sie Ihre Erfahrung mit {topic} insgesamt?", (1, 5)),
+        ("rating", "general", "Wie wahrscheinlich ist es, dass Sie uns Freunden oder Kollegen empfehlen?", (0, 10)),
+        ("rating", "aspect", "Wie bewerten Sie Ihre Erfahrung mit {aspect}?", (1, 5)),
+        ("multiple_choice_multi", "topic", "Welche Aspekte sind Ihnen bei {topic} am wichtigsten?", "aspects"),
+        ("multiple_choice_multi", "topic", "Was sollten wir bei {topic} zuerst verbessern?", "aspects"),
+        ("multiple_choice_multi", "general", "Wie sind Sie auf uns aufmerksam geworden?", "channels"),
+        ("multiple_choice_multi", "general", "Worüber möchten Sie mehr von uns erfahren?", "interests"),
+        ("multiple_choice_multi", "general", "Wie möchten Sie am liebsten kontaktiert werden?", "contact"),
+        ("open_text", "topic", "Was gefällt Ihnen an {topic} am besten?", None),
+        ("open_text", "topic", "Was könnten wir bei {topic} verbessern?", None),
+        ("open_text", "aspect", "Was würden Sie an {aspect} ändern?", None),
+        ("open_text", "general", "Möchten Sie uns sonst noch etwas mitteilen?", None),
+    ],
+}
+
+# Title / description / open-text placeholder per language.
+FRAMING = {
+    "en": ("Survey: {brief}", 'Auto-generated (mock) from brief: "{brief}"', "Your answer..."),
+    "es": ("Encuesta: {brief}", 'Generada automáticamente (mock) a partir de: "{brief}"', "Tu respuesta..."),
+    "fr": ("Sondage : {brief}", 'Généré automatiquement (mock) à partir de : « {brief} »', "Votre réponse..."),
+    "de": ("Umfrage: {brief}", 'Automatisch erstellt (Mock) aus: „{brief}“', "Ihre Antwort..."),
+}
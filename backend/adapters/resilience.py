@@ -0,0 +1,120 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+# -- Typed upstream errors -----------------------------------------------------
+# The service decides on fallbacks by type instead of matching exception text.
+class UpstreamError(Exception):
+    """The LLM provider could not produce a result (after retries)."""
+
+
+class UpstreamRateLimited(UpstreamError):
+    """429 / quota exhausted."""
+
+
+class UpstreamTimeout(UpstreamError):
+    """The request did not finish within the configured timeout."""
+
+
+class UpstreamUnavailable(UpstreamError):
+    """Connection failures and 5xx responses."""
+
+
+# -- Client-side rate limiting -------------------------------------------------
+class TokenBucket:
+    """
+    Classic token bucket: 'rate' tokens per second, up to 'burst' banked.
+    acquire() waits until a token is available, so callers queue up locally instead
+    of burning upstream quota on requests that would be rejected with 429.
+    A rate of 0 disables limiting.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_s = 0.0
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:  # FIFO: waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                self.waited_s += wait
+                await asyncio.sleep(wait)
+
+
+# -- Retry helpers -------------------------------------------------------------
+def backoff_delay(attempt: int, base_s: float, cap_s: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Parse 'retry-after-ms' / 'Retry-After' (seconds or HTTP date) from response headers."""
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    hedge_after_s: float,
+    on_hedge: Optional[Callable[[], None]] = None,
+    backup: Optional[Callable[[], Awaitable[T]]] = None,
+) -> T:
+    """
+    Run 'call'; if it hasn't finished after 'hedge_after_s', start 'backup' (default:
+    the same call) and return whichever succeeds first (the other is cancelled).
+    If both fail, the first failure is raised.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after_s)
+        if not done:
+            if on_hedge is not None:
+                on_hedge()
+            tasks.append(asyncio.ensure_future((backup or call)()))
+
+        error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Sentinel used to remember "we looked and it wasn't there" (negative caching).
+MISS = object()
+
+
+class TTLLRUCache:
+    """
+    Small in-process LRU with per-entry TTL.
+    - Bounded by 'max_entries'; the least recently used entry is evicted first.
+    - Each entry expires after 'ttl_s' (or a per-call override, e.g. for cached misses).
+    - Counters (hits/misses/evictions/expirations) are kept for observability.
+
+    Not thread-safe by design: it is only touched from the event loop thread.
+    """
+    def __init__(self, max_entries: int, ttl_s: float):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value (which may be MISS for a cached negative lookup),
+        or 'default' when the key is absent or expired.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        if value is MISS:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_s: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)  # least recently used
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -19,11 +19,136 @@ class Settings(BaseModel):
     CORS_ORIGIN: str = os.getenv("CORS_ORIGIN", "*")
     DATABASE_URL: str | None = os.getenv("DATABASE_URL")
 
+    # Connection pool (see db.py); size against db_pool_* metrics rather than guessing
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT_S: float = float(os.getenv("DB_POOL_TIMEOUT_S", "30"))  # max wait for a free connection
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "1") in ("1", "true", "True")  # one extra round trip per checkout
+    DB_POOL_RECYCLE_S: int = int(os.getenv("DB_POOL_RECYCLE_S", "-1"))  # replace connections older than this; -1 = never
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    # 1 = create missing tables/columns on every boot; 0 = only check the schema version (run `manage init-db` per deploy)
+    DB_CREATE_ALL: bool = os.getenv("DB_CREATE_ALL", "1") in ("1", "true", "True")
+
+    # Boot warm-up before readiness (see services/warmup.py): pool prefill, hot L1 preload, LLM client
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "0") in ("1", "true", "True")
+    WARMUP_HOT_KEYS: int = int(os.getenv("WARMUP_HOT_KEYS", "1000"))  # most recently hit survey_cache rows; 0 = skip
+    WARMUP_TIMEOUT_S: float = float(os.getenv("WARMUP_TIMEOUT_S", "10"))  # ready anyway after this
+
     # OpenAI config
+    MOCK_LLM: bool = os.getenv("MOCK_LLM", "0") in ("1", "true", "True")  # local generator only; the OpenAI SDK is never loaded
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     OPENAI_TIMEOUT_MS: int = int(os.getenv("OPENAI_TIMEOUT_MS", "12000"))
+    OPENAI_BASE_URL: str | None = os.getenv("OPENAI_BASE_URL")  # e.g. a local stub server
+
+    # Upstream traffic policy (see adapters/resilience.py)
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+    OPENAI_RPM: float = float(os.getenv("OPENAI_RPM", "0"))  # client-side requests/minute; 0 = unlimited
+    OPENAI_BURST: int = int(os.getenv("OPENAI_BURST", "10"))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_BACKOFF_BASE_MS: int = int(os.getenv("OPENAI_BACKOFF_BASE_MS", "250"))
+    OPENAI_BACKOFF_MAX_MS: int = int(os.getenv("OPENAI_BACKOFF_MAX_MS", "4000"))
+    OPENAI_HEDGE_AFTER_MS: int = int(os.getenv("OPENAI_HEDGE_AFTER_MS", "0"))  # 0 = no hedging
+    OPENAI_POOL_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_POOL_MAX_CONNECTIONS", "64"))
+    OPENAI_POOL_MAX_KEEPALIVE: int = int(os.getenv("OPENAI_POOL_MAX_KEEPALIVE", "32"))
+
+    # Circuit breaker around LLM generation (see adapters/circuit_breaker.py)
+    CB_ENABLED: bool = os.getenv("CB_ENABLED", "1") in ("1", "true", "True")
+    CB_WINDOW: int = int(os.getenv("CB_WINDOW", "20"))
+    CB_MIN_CALLS: int = int(os.getenv("CB_MIN_CALLS", "10"))
+    CB_FAILURE_RATE: float = float(os.getenv("CB_FAILURE_RATE", "0.5"))
+    CB_SLOW_CALL_MS: int = int(os.getenv("CB_SLOW_CALL_MS", "8000"))
+    CB_OPEN_MS: int = int(os.getenv("CB_OPEN_MS", "30000"))
+    CB_HALF_OPEN_PROBES: int = int(os.getenv("CB_HALF_OPEN_PROBES", "3"))
+
+    # In-process (L1) survey cache in front of the survey_cache table
+    SURVEY_L1_CACHE_SIZE: int = int(os.getenv("SURVEY_L1_CACHE_SIZE", "1024"))
+    SURVEY_L1_CACHE_TTL_S: float = float(os.getenv("SURVEY_L1_CACHE_TTL_S", "300"))
+    SURVEY_L1_NEGATIVE_TTL_S: float = float(os.getenv("SURVEY_L1_NEGATIVE_TTL_S", "5"))
+
+    # Node-local cache shared by all workers (SQLite file between L1 and Postgres); empty path = off
+    SHARED_CACHE_PATH: str = os.getenv("SHARED_CACHE_PATH", "")
+    SHARED_CACHE_MAX_MB: float = float(os.getenv("SHARED_CACHE_MAX_MB", "256"))
+    SHARED_CACHE_MMAP_MB: float = float(os.getenv("SHARED_CACHE_MMAP_MB", "256"))
+
+    # Batch generate endpoint: max briefs per request, concurrent cache-miss generations per batch
+    BATCH_GENERATE_MAX_ITEMS: int = int(os.getenv("BATCH_GENERATE_MAX_ITEMS", "500"))
+    BATCH_GENERATE_CONCURRENCY: int = int(os.getenv("BATCH_GENERATE_CONCURRENCY", "16"))
+
+    # Admission control for cache-miss generation (see services/admission.py)
+    GENERATE_MAX_IN_FLIGHT: int = int(os.getenv("GENERATE_MAX_IN_FLIGHT", "64"))
+    GENERATE_QUEUE_SIZE: int = int(os.getenv("GENERATE_QUEUE_SIZE", "256"))
+    GENERATE_QUEUE_PER_CLIENT: int = int(os.getenv("GENERATE_QUEUE_PER_CLIENT", "32"))
+    GENERATE_QUEUE_TIMEOUT_MS: int = int(os.getenv("GENERATE_QUEUE_TIMEOUT_MS", "5000"))
+    GENERATE_RETRY_AFTER_S: int = int(os.getenv("GENERATE_RETRY_AFTER_S", "2"))
+    # Comma-separated X-API-Key values trusted as fairness keys; any other caller is keyed by address
+    CLIENT_API_KEYS: frozenset[str] = frozenset(k.strip() for k in os.getenv("CLIENT_API_KEYS", "").split(",") if k.strip())
+
+    # Write-behind (group commit) ingestion for survey responses; off by default
+    RESPONSE_BATCH_ENABLED: bool = os.getenv("RESPONSE_BATCH_ENABLED", "0") in ("1", "true", "True")
+    RESPONSE_BATCH_MAX_ROWS: int = int(os.getenv("RESPONSE_BATCH_MAX_ROWS", "500"))
+    RESPONSE_BATCH_MAX_DELAY_MS: int = int(os.getenv("RESPONSE_BATCH_MAX_DELAY_MS", "10"))
+    RESPONSE_BATCH_QUEUE_SIZE: int = int(os.getenv("RESPONSE_BATCH_QUEUE_SIZE", "10000"))
+    RESPONSE_BATCH_ENQUEUE_TIMEOUT_MS: int = int(os.getenv("RESPONSE_BATCH_ENQUEUE_TIMEOUT_MS", "1000"))
+
+    # Bulk response import: rows per INSERT batch
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+
+    # Per-question aggregates updated in the same transaction as each response insert
+    ROLLUPS_ENABLED: bool = os.getenv("ROLLUPS_ENABLED", "1") in ("1", "true", "True")
+
+    # Live results over SSE (GET /api/surveys/{id}/live, see repositories/live_results.py)
+    LIVE_TICK_MS: int = int(os.getenv("LIVE_TICK_MS", "500"))  # deltas are coalesced per tick
+    LIVE_BUFFER_TICKS: int = int(os.getenv("LIVE_BUFFER_TICKS", "16"))  # per viewer; overflow -> one snapshot
+    LIVE_RESYNC_S: float = float(os.getenv("LIVE_RESYNC_S", "30"))  # re-read rollups per watched survey; must be > 0
+    LIVE_MAX_SUBSCRIBERS: int = int(os.getenv("LIVE_MAX_SUBSCRIBERS", "10000"))  # per worker
+    LIVE_HEARTBEAT_S: float = float(os.getenv("LIVE_HEARTBEAT_S", "15"))  # SSE comment when idle
+
+    # Survey registry (GET /api/surveys/{id}) and answer validation on record_response / bulk import
+    SURVEY_REGISTRY_CACHE_SIZE: int = int(os.getenv("SURVEY_REGISTRY_CACHE_SIZE", "4096"))
+    SURVEY_REGISTRY_CACHE_TTL_S: float = float(os.getenv("SURVEY_REGISTRY_CACHE_TTL_S", "60"))
+    ANSWER_VALIDATOR_CACHE_SIZE: int = int(os.getenv("ANSWER_VALIDATOR_CACHE_SIZE", "1024"))
+    # strict = unknown survey ids are rejected; known = only registered surveys are checked; off
+    RESPONSE_VALIDATION: str = os.getenv("RESPONSE_VALIDATION", "strict")
+    OPEN_TEXT_MAX_CHARS: int = int(os.getenv("OPEN_TEXT_MAX_CHARS", "5000"))
+
+    # survey_response partitioning and archival (see repositories/response_partitions.py)
+    RESPONSE_PARTITIONING: bool = os.getenv("RESPONSE_PARTITIONING", "0") in ("1", "true", "True")  # new tables only
+    RESPONSE_PARTITION_AHEAD_MONTHS: int = int(os.getenv("RESPONSE_PARTITION_AHEAD_MONTHS", "3"))
+    RESPONSE_PARTITION_INTERVAL_S: float = float(os.getenv("RESPONSE_PARTITION_INTERVAL_S", "3600"))
+    RESPONSE_RETENTION_DAYS: int = int(os.getenv("RESPONSE_RETENTION_DAYS", "0"))  # hot tier; 0 = never archive
+    RESPONSE_ARCHIVE_DIR: str = os.getenv("RESPONSE_ARCHIVE_DIR", "")  # .ndjson.gz files; required for retention
+
+    # Response export: rows fetched per keyset page
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", "5000"))
+
+    # Near-duplicate brief matching (MinHash/LSH) behind the exact cache-key miss
+    SIMILARITY_LOOKUP_ENABLED: bool = os.getenv("SIMILARITY_LOOKUP_ENABLED", "0") in ("1", "true", "True")
+    SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.8"))
+    SIMILARITY_INDEX_MAX_ENTRIES: int = int(os.getenv("SIMILARITY_INDEX_MAX_ENTRIES", "100000"))
+    SIMILARITY_INDEX_REFRESH_S: float = float(os.getenv("SIMILARITY_INDEX_REFRESH_S", "60"))  # 0 = load once
+
+    # survey_cache access tracking and eviction (see repositories/cache_maintenance.py); 0 disables a policy
+    SURVEY_CACHE_TTL_DAYS: float = float(os.getenv("SURVEY_CACHE_TTL_DAYS", "0"))  # idle time since last hit
+    SURVEY_CACHE_MAX_ROWS: int = int(os.getenv("SURVEY_CACHE_MAX_ROWS", "0"))
+    SURVEY_CACHE_MAX_MB: float = float(os.getenv("SURVEY_CACHE_MAX_MB", "0"))  # sum of stored survey sizes
+    SURVEY_CACHE_EVICT_INTERVAL_S: float = float(os.getenv("SURVEY_CACHE_EVICT_INTERVAL_S", "300"))
+    SURVEY_CACHE_EVICT_BATCH: int = int(os.getenv("SURVEY_CACHE_EVICT_BATCH", "500"))
+    SURVEY_CACHE_EVICT_PAUSE_MS: int = int(os.getenv("SURVEY_CACHE_EVICT_PAUSE_MS", "50"))  # between delete batches
+    SURVEY_CACHE_TOUCH_FLUSH_S: float = float(os.getenv("SURVEY_CACHE_TOUCH_FLUSH_S", "5"))
+    SURVEY_CACHE_TOUCH_MAX_KEYS: int = int(os.getenv("SURVEY_CACHE_TOUCH_MAX_KEYS", "50000"))
+
+    # Background pre-generation of popular/scheduled briefs (see services/pregen_service.py)
+    PREGEN_WORKERS: int = int(os.getenv("PREGEN_WORKERS", "2"))  # 0 = disabled
+    PREGEN_QUEUE_SIZE: int = int(os.getenv("PREGEN_QUEUE_SIZE", "10000"))
+    PREGEN_RESERVED_SLOTS: int = int(os.getenv("PREGEN_RESERVED_SLOTS", "8"))  # admission slots kept for interactive traffic
+    PREGEN_JOBS_KEPT: int = int(os.getenv("PREGEN_JOBS_KEPT", "1000"))  # finished jobs kept for status queries
+    PREGEN_MISSED_INTERVAL_S: float = float(os.getenv("PREGEN_MISSED_INTERVAL_S", "60"))  # 0 = don't follow misses
+    PREGEN_MISSED_MIN_COUNT: int = int(os.getenv("PREGEN_MISSED_MIN_COUNT", "3"))
+    PREGEN_MISSED_TOP: int = int(os.getenv("PREGEN_MISSED_TOP", "50"))
+    PREGEN_MISSED_MAX_KEYS: int = int(os.getenv("PREGEN_MISSED_MAX_KEYS", "10000"))
+    ADMIN_TOKEN: str | None = os.getenv("ADMIN_TOKEN")  # X-Admin-Token for /api/admin/*; unset = admin API disabled
 
-# NOTE: MOCK_LLM is defined at module-level above, not as a Settings field.
-# Code that needs it typically does: getattr(settings, "MOCK_LLM", False)
+# NOTE: MOCK_LLM is a Settings field (read after .env is loaded); the module-level
+# constant above is kept for older imports. Code reads getattr(settings, "MOCK_LLM", False).
 settings = Settings()
@@ -0,0 +1,134 @@
+import json
+import re
+from typing import Any, List, Optional
+
+# Characters that matter outside / inside a JSON string.
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_IN_STRING = re.compile(r'["\\]')
+# First character of the next element (scalars=True) and the end of a bare scalar.
+_ELEMENT_START = re.compile(r'[^\s,]')
+_SCALAR_END = re.compile(r'[\s,{}\[\]"]')
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental scanner that pulls complete elements out of a JSON array while the
+    document is still arriving (LLM token stream, chunked HTTP body, ...).
+
+    - 'array_depth' is the nesting depth of the array whose elements we want:
+        1 -> top-level array:            [ {...}, {...} ]
+        2 -> array inside a root object: { "questions": [ {...}, {...} ] }
+    - Only object/array elements are emitted unless scalars=True, which also emits
+      strings, numbers and literals (as raw text) so element positions stay aligned.
+    - 'closed' turns True once the array has been closed by its ']'.
+    - Memory stays bounded by the size of the element being scanned; text before
+      the current element is dropped after every feed().
+    - With raw=True the element text is returned undecoded (callers that want to
+      report a malformed element without losing the rest of the stream).
+    """
+    def __init__(self, array_depth: int = 1, raw: bool = False, scalars: bool = False):
+        self.array_depth = array_depth
+        self.raw = raw
+        self.scalars = scalars
+        self.closed = False
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[str] = []      # open containers: '{' or '['
+        self._in_string = False
+        self._escape = False
+        self._item_start: Optional[int] = None
+        self._scalar: Optional[str] = None  # element being scanned is a "string" / "bare" scalar
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume more text and return the elements completed by it (json-decoded unless raw)."""
+        self._buf += chunk
+        items: List[Any] = []
+        buf = self._buf
+        pos = self._pos
+        n = len(buf)
+
+        while pos < n:
+            if self._escape:
+                # Previous chunk ended right after a backslash.
+                self._escape = False
+                pos += 1
+                continue
+            if self._in_string:
+                m = _IN_STRING.search(buf, pos)
+                if m is None:
+                    pos = n
+                    break
+                if m.group() == "\\":
+                    if m.end() >= n:
+                        self._escape = True
+                        pos = n
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                if self._scalar == "string":
+                    self._emit(items, buf[self._item_start:pos])
+                continue
+
+            if self._scalar == "bare":
+                m = _SCALAR_END.search(buf, pos)
+                if m is None:
+                    pos = n
+                    break
+                pos = m.start()
+                self._emit(items, buf[self._item_start:pos])
+                continue
+            if self.scalars and self._item_start is None and self._at_elements():
+                m = _ELEMENT_START.search(buf, pos)
+                if m is None:
+                    pos = n
+                    break
+                if m.group() not in "{[]":
+                    self._item_start = m.start()
+                    self._scalar = "string" if m.group() == '"' else "bare"
+                    self._in_string = self._scalar == "string"
+                    pos = m.end()
+                    continue
+
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                pos = n
+                break
+            ch = m.group()
+            pos = m.end()
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if (
+                    self._item_start is None
+                    and len(self._stack) == self.array_depth
+                    and self._stack[-1] == "["
+                ):
+                    self._item_start = m.start()
+                self._stack.append(ch)
+            else:  # '}' or ']'
+                if self._stack:
+                    self._stack.pop()
+                    if ch == "]" and len(self._stack) == self.array_depth - 1 and self._item_start is None:
+                        self.closed = True
+                if self._item_start is not None and len(self._stack) == self.array_depth:
+                    self._emit(items, buf[self._item_start:pos])
+
+        # Drop consumed text; keep only the element currently being scanned.
+        if self._item_start is None:
+            self._buf = ""
+            self._pos = 0
+        else:
+            self._buf = buf[self._item_start:]
+            self._pos = pos - self._item_start
+            self._item_start = 0
+        return items
+
+    def _at_elements(self) -> bool:
+        return len(self._stack) == self.array_depth and self._stack[-1] == "["
+
+    def _emit(self, items: List[Any], text: str) -> None:
+        items.append(text if self.raw else json.loads(text))
+        self._item_start = None
+        self._scalar = None
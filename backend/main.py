@@ -1,17 +1,47 @@
-from fastapi import FastAPI, HTTPException
+import hmac
+import json
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from backend.models import GenerateSurveyRequest, GenerateSurveyResponse
-from backend.services.survey_service import generate_survey_service
-from backend.db import engine
-from backend.models_db import Base
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from backend.models import GenerateSurveyRequest, GenerateSurveyResponse, Survey
+from backend.services.survey_service import (
+    generate_survey_service, generate_batch_service, stream_survey_service, survey_flight, SurveyResult, peek_adapter,
+    generate_admission, get_survey_service,
+)
+from backend.services.warmup import boot_warmup
+from backend.services.answer_validation import (
+    InvalidAnswers, UnknownSurvey, get_validator, validate_answers, validator_cache,
+)
+from backend.repositories.survey_registry_repo import registry_cache
+from backend.services.admission import GenerationOverloaded
+from backend.db import engine, pool_stats
+from backend.repositories.schema_repo import check_schema, init_schema
 
 
 
 from backend.models import (
     GenerateSurveyRequest, GenerateSurveyResponse,
     SaveResponsesRequest, SaveResponsesResponse,
+    BulkImportResponse, SurveySummary,
+    PregenSubmitRequest, PregenJobStatus,
+    BatchGenerateRequest, BatchGenerateResponse,
+)
+from backend.repositories.survey_rollup_repo import fetch_summary
+from backend.services.response_import_service import MalformedImport, import_responses
+from backend.services.response_export_service import export_csv, export_ndjson
+from backend.repositories.survey_response_repo import save_response, response_batcher, live_results
+from backend.repositories.response_batcher import InvalidResponseRow, ResponseQueueFull
+from backend.repositories.live_results import LiveSubscribersFull
+from backend.repositories.response_partitions import partition_maintenance
+from backend.config import settings
+from backend.repositories.survey_cache_repo import (
+    l1_cache, node_cache, similarity_index, cache_maintenance, ensure_lookup_index,
 )
-from backend.repositories.survey_response_repo import save_response
+from backend.adapters.circuit_breaker import breakers
+from backend.services.pregen_service import pregen_pool, PregenQueueFull
+from backend.metrics import Gauge, ServerTimingMiddleware, register, render_metrics
 
 
 
@@ -26,24 +56,86 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["POST", "GET", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Survey-Source", "ETag"],
 )
+# Per-stage timings for each request (see backend/metrics.py).
+app.add_middleware(ServerTimingMiddleware)
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    # Create tables if they don't exist (simple, migration-free bootstrapping)
+    # Create tables if they don't exist (simple, migration-free bootstrapping), or with
+    # DB_CREATE_ALL=0 just verify the schema version (one query; see schema_repo.py).
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        if settings.DB_CREATE_ALL:
+            await init_schema(conn)
+        else:
+            await check_schema(conn)
+    if settings.DB_CREATE_ALL:
+        # Outside the transaction above: the index is built CONCURRENTLY.
+        await ensure_lookup_index()
+    cache_maintenance.start()
+    similarity_index.start()
+    partition_maintenance.start()
+    if settings.RESPONSE_BATCH_ENABLED:
+        response_batcher.start()
+    live_results.start()
+    pregen_pool.start()
+    # Optional warm-up (WARMUP_ENABLED=1) runs in the background; /api/internal/ready waits for it.
+    boot_warmup.start()
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    # Flush buffered responses before the process exits.
+    await response_batcher.stop()
+    await live_results.stop()
+    await pregen_pool.stop()
+    await cache_maintenance.stop()
+    await similarity_index.stop()
+    await partition_maintenance.stop()
+    await boot_warmup.stop()
+    await node_cache.close()
+    adapter = peek_adapter()
+    if adapter is not None:
+        await adapter.aclose()
+
+def _survey_response(result: SurveyResult) -> Response:
+    # The body is already serialized and validated (GenerateSurveyResponse shape);
+    # returning a Response skips FastAPI's response_model re-validation/encoding.
+    return Response(
+        content=result.body,
+        media_type="application/json",
+        headers={"X-Survey-Source": result.source},
+    )
+
+
+def _client_id(request: Request) -> str:
+    # Admission-control fairness key: the API key only when it's a known one
+    # (CLIENT_API_KEYS), else the caller's address. An unchecked header would let one
+    # caller spread a burst over made-up keys and get a fresh queue for each.
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in settings.CLIENT_API_KEYS:
+        return "key:" + api_key
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+@app.exception_handler(GenerationOverloaded)
+async def generation_overloaded(request: Request, exc: GenerationOverloaded):
+    # Load shedding: the cache-miss generation queue is saturated, retry shortly.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
 
 # -----------------------------
 # Generate survey (first handler)
 # -----------------------------
 @app.post("/api/surveys/generate", response_model=GenerateSurveyResponse)
-async def generate_survey(req: GenerateSurveyRequest):
+async def generate_survey(req: GenerateSurveyRequest, request: Request):
     try:
-        survey = await generate_survey_service(req)
-        return {"survey": survey}
-    except HTTPException:
-        # Re-raise FastAPI HTTPExceptions (status codes preserved)
+        return _survey_response(await generate_survey_service(req, _client_id(request)))
+    except (HTTPException, GenerationOverloaded):
+        # Re-raise FastAPI HTTPExceptions (status codes preserved) and load shedding (503)
         raise
     except Exception as e:
         # Catch-all to avoid leaking stack traces to clients
@@ -58,28 +150,290 @@ async def generate_survey(req: GenerateSurveyRequest):
 # Kept as-is per instruction to not change logic.
 # -----------------------------
 @app.post("/api/surveys/generate", response_model=GenerateSurveyResponse)
-async def generate_survey(req: GenerateSurveyRequest):
-    survey = await generate_survey_service(req)
-    return {"survey": survey}
+async def generate_survey(req: GenerateSurveyRequest, request: Request):
+    return _survey_response(await generate_survey_service(req, _client_id(request)))
+
+# -----------------------------
+# Generate survey (streamed as server-sent events)
+# Events: meta -> question* -> done (or error). See stream_survey_service.
+# -----------------------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/surveys/generate/stream")
+async def generate_survey_stream(req: GenerateSurveyRequest, request: Request):
+    client = _client_id(request)
+
+    async def events():
+        async for event, data in stream_survey_service(req, client):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# -----------------------------
+# Batch generate: many briefs per call, one multi-key cache query, bounded fan-out
+# -----------------------------
+@app.post("/api/surveys/generate/batch", response_model=BatchGenerateResponse)
+async def generate_survey_batch(req: BatchGenerateRequest, request: Request):
+    if len(req.items) > settings.BATCH_GENERATE_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"at most {settings.BATCH_GENERATE_MAX_ITEMS} items per batch")
+    return Response(content=await generate_batch_service(req.items, _client_id(request)), media_type="application/json")
 
 # 👇 Alias so old frontends calling /v1 keep working
 @app.post("/v1/surveys/generate", response_model=GenerateSurveyResponse, include_in_schema=False)
-async def generate_survey_v1(req: GenerateSurveyRequest):
-    survey = await generate_survey_service(req)
-    return {"survey": survey}
+async def generate_survey_v1(req: GenerateSurveyRequest, request: Request):
+    return _survey_response(await generate_survey_service(req, _client_id(request)))
+
+
 
+# -----------------------------
+# Registered survey by id (strong ETag; If-None-Match -> 304)
+# -----------------------------
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/ prefixes are ignored.
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/").strip('"') == etag for tag in if_none_match.split(","))
 
+@app.get("/api/surveys/{survey_id}", response_model=Survey)
+async def get_survey(survey_id: str, if_none_match: Optional[str] = Header(None)):
+    found = await get_survey_service(survey_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="survey not found")
+    etag, body = found
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # -----------------------------
 # Record a response
 # -----------------------------
+@app.exception_handler(UnknownSurvey)
+async def unknown_survey(request: Request, exc: UnknownSurvey):
+    return JSONResponse(status_code=404, content={"detail": "survey not found"})
+
+@app.exception_handler(InvalidAnswers)
+async def invalid_answers(request: Request, exc: InvalidAnswers):
+    # Same 422 shape family as request validation: a list of per-question problems.
+    return JSONResponse(status_code=422, content={"detail": exc.errors})
+
+@app.exception_handler(InvalidResponseRow)
+async def invalid_response_row(request: Request, exc: InvalidResponseRow):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+@app.exception_handler(MalformedImport)
+async def malformed_import(request: Request, exc: MalformedImport):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+async def _save_response_or_503(survey_id: str, answers: dict) -> int:
+    # Answers are checked against the registered survey first (404 / 422, see answer_validation.py).
+    await validate_answers(survey_id, answers)
+    try:
+        return await save_response(survey_id, answers)
+    except ResponseQueueFull as e:
+        # Backpressure from the group-commit buffer: ask the client to retry shortly.
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
 @app.post("/api/surveys/{survey_id}/responses", response_model=SaveResponsesResponse)
 async def record_response(survey_id: str, req: SaveResponsesRequest):
-    rid = await save_response(survey_id, req.answers)
+    rid = await _save_response_or_503(survey_id, req.answers)
     return {"success": True, "response_id": rid}
 
 # Optional alias if your frontend hits /v1
 @app.post("/v1/surveys/{survey_id}/responses", response_model=SaveResponsesResponse, include_in_schema=False)
 async def record_response_v1(survey_id: str, req: SaveResponsesRequest):
-    rid = await save_response(survey_id, req.answers)
+    rid = await _save_response_or_503(survey_id, req.answers)
     return {"success": True, "response_id": rid}
+
+
+
+# -----------------------------
+# Bulk import of responses (JSON array or NDJSON body, parsed as it streams in)
+# -----------------------------
+@app.post("/api/surveys/{survey_id}/responses/bulk", response_model=BulkImportResponse)
+async def import_responses_bulk(survey_id: str, request: Request):
+    content_type = request.headers.get("content-type", "application/json")
+    return await import_responses(survey_id, request.stream(), content_type)
+
+
+# -----------------------------
+# Export raw responses (streamed; keyset-paginated, flat memory)
+# -----------------------------
+@app.get("/api/surveys/{survey_id}/responses")
+async def export_responses(
+    survey_id: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    if format == "csv":
+        body, media_type = export_csv(survey_id, since, until), "text/csv"
+    else:
+        body, media_type = export_ndjson(survey_id, since, until), "application/x-ndjson"
+    filename = f"{survey_id}-responses.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# -----------------------------
+# Per-question aggregates (served from rollups, constant per response count)
+# -----------------------------
+@app.get("/api/surveys/{survey_id}/summary", response_model=SurveySummary)
+async def survey_summary(survey_id: str):
+    return await fetch_summary(survey_id)
+
+
+# -----------------------------
+# Live per-question aggregates (server-sent events)
+# Events: snapshot (full summary) -> delta* (increments, one per tick with new responses);
+# a snapshot may be resent at any time and replaces the client's totals.
+# -----------------------------
+@app.get("/api/surveys/{survey_id}/live")
+async def survey_live(survey_id: str):
+    # Same 404 rule as recording a response: in strict mode only registered surveys get answers.
+    await get_validator(survey_id)
+    try:
+        sub = await live_results.subscribe(survey_id)
+    except LiveSubscribersFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    async def events():
+        try:
+            async for message in live_results.events(sub):
+                if message is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    event, payload = message
+                    yield b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+        finally:
+            live_results.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -----------------------------
+# Background pre-generation (admin): warm survey_cache ahead of demand
+# -----------------------------
+def _check_admin(token: Optional[str]) -> None:
+    # Closed unless ADMIN_TOKEN is configured; constant-time compare.
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="admin API disabled (ADMIN_TOKEN is not set)")
+    if token is None or not hmac.compare_digest(token.encode("utf-8"), settings.ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="admin token required")
+
+@app.post("/api/admin/pregen", response_model=List[PregenJobStatus], status_code=202)
+async def submit_pregen(req: PregenSubmitRequest, x_admin_token: Optional[str] = Header(None)):
+    _check_admin(x_admin_token)
+    jobs = []
+    try:
+        for item in req.items:
+            brief = GenerateSurveyRequest(description=item.description, num_questions=item.num_questions, language=item.language)
+            jobs.append(pregen_pool.submit(brief, priority=item.priority))
+    except PregenQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return [job.to_dict() for job in jobs]
+
+@app.get("/api/admin/pregen/jobs", response_model=List[PregenJobStatus])
+async def list_pregen_jobs(
+    state: Optional[Literal["queued", "running", "done", "failed"]] = None,
+    limit: int = 100,
+    x_admin_token: Optional[str] = Header(None),
+):
+    _check_admin(x_admin_token)
+    return [job.to_dict() for job in pregen_pool.jobs(state, limit)]
+
+@app.get("/api/admin/pregen/jobs/{job_id}", response_model=PregenJobStatus)
+async def get_pregen_job(job_id: int, x_admin_token: Optional[str] = Header(None)):
+    _check_admin(x_admin_token)
+    job = pregen_pool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+
+# -----------------------------
+# Prometheus metrics
+# -----------------------------
+_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+register(Gauge(
+    "llm_in_flight", "Upstream LLM calls in progress.",
+    lambda: {(): peek_adapter().in_flight if peek_adapter() is not None else 0},
+))
+register(Gauge(
+    "llm_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open).",
+    lambda: {(name,): _BREAKER_STATES[b.state] for name, b in breakers.items()}, ["breaker"],
+))
+register(Gauge(
+    "llm_circuit_transitions_total", "Circuit breaker transitions since start.",
+    lambda: {(name, edge): n for name, b in breakers.items() for edge, n in b.transitions.items()},
+    ["breaker", "transition"], kind="counter",
+))
+register(Gauge("survey_l1_cache_entries", "Entries in the in-process survey cache.", lambda: {(): len(l1_cache)}))
+register(Gauge(
+    "generate_admission_in_flight", "Cache-miss generations holding an admission slot.",
+    lambda: {(): generate_admission.in_flight},
+))
+register(Gauge(
+    "generate_admission_queued", "Cache-miss generations waiting for an admission slot.",
+    lambda: {(): generate_admission.queued},
+))
+register(Gauge("live_subscribers", "Open live-results streams on this worker.", lambda: {(): live_results.subscribers}))
+register(Gauge(
+    "live_watched_surveys", "Surveys with at least one live viewer.",
+    lambda: {(): live_results.stats()["watched_surveys"]},
+))
+register(Gauge("db_pool_checked_out", "DB connections currently checked out.", lambda: {(): engine.pool.checkedout()}))
+register(Gauge("db_pool_size", "Configured DB pool size (DB_POOL_SIZE).", lambda: {(): engine.pool.size()}))
+register(Gauge("db_pool_overflow", "Overflow connections currently open.", lambda: {(): max(engine.pool.overflow(), 0)}))
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# -----------------------------
+# Readiness: 503 until startup warm-up is done (always 200 with WARMUP_ENABLED=0)
+# -----------------------------
+@app.get("/api/internal/ready", include_in_schema=False)
+async def ready():
+    if not boot_warmup.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True}
+
+
+# -----------------------------
+# Internal stats (cache counters etc.)
+# -----------------------------
+@app.get("/api/internal/stats", include_in_schema=False)
+async def internal_stats():
+    return {
+        "db_pool": pool_stats(),
+        "survey_l1_cache": l1_cache.stats(),
+        "survey_registry_cache": registry_cache.stats(),
+        "answer_validators": validator_cache.stats(),
+        "survey_node_cache": node_cache.stats(),
+        "survey_similarity_index": similarity_index.stats(),
+        "survey_cache_maintenance": cache_maintenance.stats(),
+        "generate_singleflight": survey_flight.stats(),
+        "generate_admission": generate_admission.stats(),
+        "response_batcher": response_batcher.stats(),
+        "response_partitions": partition_maintenance.stats(),
+        "live_results": live_results.stats(),
+        "openai_adapter": peek_adapter().stats() if peek_adapter() is not None else None,
+        "warmup": boot_warmup.stats(),
+        "circuit_breakers": {name: b.stats() for name, b in breakers.items()},
+        "pregen": pregen_pool.stats(),
+    }
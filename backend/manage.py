@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+
+# Admin commands:
+#   python -m backend.manage init-db
+#   python -m backend.manage rebuild-rollups [--survey-id srv_x]
+#   python -m backend.manage maintain-partitions
+#   python -m backend.manage evict-cache
+#   python -m backend.manage backfill-cache-sizes
+#   python -m backend.manage backfill-cache-languages
+
+
+async def _init_db(args: argparse.Namespace) -> None:
+    from backend.db import engine
+    from backend.models_db import SCHEMA_VERSION
+    from backend.repositories.schema_repo import init_schema
+    from backend.repositories.survey_cache_repo import ensure_lookup_index
+    async with engine.begin() as conn:
+        await init_schema(conn)
+    if await ensure_lookup_index():
+        print("built ix_survey_cache_desc_lang_num")
+    print(f"schema is at version {SCHEMA_VERSION}")
+
+
+async def _rebuild_rollups(args: argparse.Namespace) -> None:
+    from backend.repositories.survey_rollup_repo import rebuild_rollups
+    scanned = await rebuild_rollups(args.survey_id)
+    target = args.survey_id or "all surveys"
+    print(f"rebuilt rollups for {target} from {scanned} responses")
+
+
+async def _maintain_partitions(args: argparse.Namespace) -> None:
+    from backend.repositories.response_partitions import maintain_partitions
+    done = await maintain_partitions()
+    print(
+        f"created {done['created']} partitions, archived {done['archived']} "
+        f"({done['archived_rows']} responses)"
+    )
+
+
+async def _evict_cache(args: argparse.Namespace) -> None:
+    from backend.repositories.survey_cache_repo import evict_cache
+    evicted = await evict_cache()
+    print(f"evicted {sum(evicted.values())} cached surveys ({evicted})")
+
+
+async def _backfill_cache_sizes(args: argparse.Namespace) -> None:
+    from backend.repositories.survey_cache_repo import backfill_sizes
+    print(f"set size_bytes on {await backfill_sizes()} cached surveys")
+
+
+async def _backfill_cache_languages(args: argparse.Namespace) -> None:
+    from backend.repositories.survey_cache_repo import backfill_languages
+    print(f"case-folded language on {await backfill_languages()} cached surveys")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("init-db", help="create missing tables/columns and stamp the schema version")
+    p.set_defaults(func=_init_db)
+
+    p = sub.add_parser("rebuild-rollups", help="recompute per-question rollups from raw responses")
+    p.add_argument("--survey-id", default=None, help="only this survey (default: all)")
+    p.set_defaults(func=_rebuild_rollups)
+
+    p = sub.add_parser("maintain-partitions", help="create upcoming survey_response partitions, archive expired ones")
+    p.set_defaults(func=_maintain_partitions)
+
+    p = sub.add_parser("evict-cache", help="apply the survey_cache TTL / max-rows / max-size policies now")
+    p.set_defaults(func=_evict_cache)
+
+    p = sub.add_parser("backfill-cache-sizes", help="fill size_bytes for rows cached before it existed")
+    p.set_defaults(func=_backfill_cache_sizes)
+
+    p = sub.add_parser("backfill-cache-languages", help="case-fold language on rows cached before it was stored folded")
+    p.set_defaults(func=_backfill_cache_languages)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
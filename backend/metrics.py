@@ -0,0 +1,191 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus instrumentation (text exposition format 0.0.4), no extra dependency.
+# Hot-path cost is a perf_counter() pair, a dict lookup and a bisect per observation.
+# Per-request stage timings are also collected into a contextvar and emitted as a
+# Server-Timing header by ServerTimingMiddleware, so one slow request can be
+# diagnosed from the browser's network panel.
+
+_DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, v in sorted(self._values.items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(v)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.bounds) + 1), [0.0])
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, c in zip(self.bounds + (float("inf"),), counts):
+                cumulative += c
+                le = 'le="' + _fmt_value(float(bound)) + '"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {_fmt_value(total[0])}"
+            yield f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    """
+    Read at scrape time from a callback returning {label values: value}.
+    kind="counter" exposes a monotonic value that is already tracked elsewhere.
+    """
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        fn: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, v in sorted(self.fn().items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(v)}"
+
+
+_registry: List[object] = []
+
+
+def register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -- Metrics -------------------------------------------------------------------
+STAGE_SECONDS = register(Histogram(
+    "survey_stage_seconds", "Time spent per request stage.", ["stage"],
+))
+SURVEY_SOURCE_TOTAL = register(Counter(
+    "survey_generate_source_total", "Generate requests by where the survey came from.", ["source"],
+))
+DB_POOL_WAIT_SECONDS = register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a DB connection from the pool.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+))
+DB_POOL_OVERFLOW_TOTAL = register(Counter(
+    "db_pool_overflow_total", "Connections opened beyond DB_POOL_SIZE (overflow events).",
+))
+DB_POOL_TIMEOUTS_TOTAL = register(Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT_S.",
+))
+GENERATE_SHED_TOTAL = register(Counter(
+    "generate_admission_shed_total", "Cache-miss generations rejected by admission control.", ["reason"],
+))
+LLM_TOKENS_TOTAL = register(Counter(
+    "llm_tokens_total", "Upstream token usage.", ["kind"],
+))
+
+
+# -- Per-request stage timing --------------------------------------------------
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block into survey_stage_seconds{stage=name} and this request's Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware overhead, streaming-safe).
+    Adds 'Server-Timing: <stage>;dur=<ms>, ..., total;dur=<ms>' covering the stages that
+    finished before the response headers went out.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                parts = [f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in timings]
+                parts.append(f"total;dur={(time.perf_counter() - start) * 1000:.2f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(parts).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
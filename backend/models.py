@@ -44,6 +44,28 @@ class GenerateSurveyResponse(BaseModel):
     # Wrapper so we can evolve the payload later without breaking clients.
     survey: Survey
 
+# ---- Batch generate I/O ----
+class BatchGenerateRequest(BaseModel):
+    # Upper bound is also enforced from settings.BATCH_GENERATE_MAX_ITEMS by the route.
+    items: List[GenerateSurveyRequest] = Field(..., min_length=1)
+
+class BatchGenerateItem(BaseModel):
+    index: int  # position in the request
+    status: Literal["ok", "error"]
+    source: Optional[Literal["cache", "llm", "mock"]] = None
+    survey: Optional[Survey] = None
+    error: Optional[str] = None
+
+class BatchGenerateStats(BaseModel):
+    cache_hits: int      # items answered by the multi-key cache lookup
+    misses: int          # distinct keys that went to the generation path
+    deduplicated: int    # items that shared a key with an earlier item
+    errors: int
+
+class BatchGenerateResponse(BaseModel):
+    results: List[BatchGenerateItem]
+    stats: BatchGenerateStats
+
 # ---- Save responses I/O ----
 class SaveResponsesRequest(BaseModel):
     # Map of questionId -> value (string | number | array | object)
@@ -52,3 +74,57 @@ class SaveResponsesRequest(BaseModel):
 class SaveResponsesResponse(BaseModel):
     success: bool
     response_id: int
+
+# ---- Bulk response import I/O ----
+class BulkImportError(BaseModel):
+    # Position of the record in the uploaded body (0-based) and why it was rejected.
+    index: int
+    detail: str
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    # Aligned with the input records; None where the record was rejected.
+    response_ids: List[Optional[int]]
+    errors: List[BulkImportError]
+
+# ---- Survey summary (from rollups) ----
+class RatingSummary(BaseModel):
+    count: int
+    sum: float
+    mean: Optional[float] = None
+    histogram: Dict[str, int]
+
+class QuestionSummary(BaseModel):
+    answered: int
+    choices: Dict[str, int]
+    rating: Optional[RatingSummary] = None
+    open_text: int
+
+class SurveySummary(BaseModel):
+    survey_id: str
+    responses: int
+    questions: Dict[str, QuestionSummary]
+
+# ---- Background pre-generation (admin) ----
+class PregenItem(GenerateSurveyRequest):
+    # Lower runs first; miss-driven refills use 100.
+    priority: int = Field(10, ge=0, le=1000)
+
+class PregenSubmitRequest(BaseModel):
+    items: List[PregenItem] = Field(..., min_length=1, max_length=1000)
+
+class PregenJobStatus(BaseModel):
+    id: int
+    key: str
+    description: str
+    num_questions: int
+    language: str
+    priority: int
+    origin: Literal["admin", "missed"]
+    state: Literal["queued", "running", "done", "failed"]
+    source: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, func, UniqueConstraint, Index  # <-- Index imported
+from sqlalchemy import String, Integer, BigInteger, Float, DateTime, Text, func, UniqueConstraint, Index  # <-- Index imported
 from sqlalchemy.dialects.postgresql import JSONB
+from backend.config import settings
 
 # SQLAlchemy base class for ORM mappings
 class Base(DeclarativeBase):
@@ -17,26 +18,118 @@ class SurveyCache(Base):
     key: Mapped[str] = mapped_column(String(128), nullable=False)  # sha256 of (desc|num|lang)
     description_norm: Mapped[str] = mapped_column(String(600), nullable=False)
     num_questions: Mapped[int] = mapped_column(Integer, nullable=False)
-    language: Mapped[str] = mapped_column(String(16), nullable=False)
+    language: Mapped[str] = mapped_column(String(16), nullable=False)  # case-folded like the key
     survey_json: Mapped[dict] = mapped_column(JSONB, nullable=False)
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Access metadata for eviction; written back in batches, so it lags hits by a few seconds.
+    last_accessed_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    hit_count: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)  # serialized survey_json
 
     __table_args__ = (
         UniqueConstraint("key", name="uq_survey_cache_key"),
+        # Superset lookup: same brief + language with at least N questions, one index probe.
+        Index("ix_survey_cache_desc_lang_num", "description_norm", "language", "num_questions"),
+        # Eviction scans the least recently used rows first.
+        Index("ix_survey_cache_last_accessed", "last_accessed_at"),
     )
 
 
+# -------------------------
+# Survey registry: the survey served under each srv_<slug>_<hash> id
+# -------------------------
+class SurveyRecord(Base):
+    __tablename__ = "survey"
+
+    id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # Canonical JSON (sorted keys) of {title, description, questions}, served byte-for-byte
+    # by GET /api/surveys/{id}; stored as text, not JSONB, so every worker serves the same bytes.
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str] = mapped_column(String(64), nullable=False)  # sha256(body) prefix
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 # -------------------------
 # Collected survey responses
 # -------------------------
+# With RESPONSE_PARTITIONING=1 a new table is created PARTITION BY RANGE (created_at)
+# (monthly partitions, see repositories/response_partitions.py). Postgres requires the
+# partition key in the primary key, so it becomes (id, created_at). An existing plain
+# table is left as it is.
+_RESPONSE_PARTITIONED = settings.RESPONSE_PARTITIONING
+
+
 class SurveyResponse(Base):
     __tablename__ = "survey_response"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     survey_id: Mapped[str] = mapped_column(String(128), nullable=False)
     answers: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=_RESPONSE_PARTITIONED,
+    )
 
     __table_args__ = (
-        Index("ix_survey_response_survey_id", "survey_id"),  # <-- needs Index import
+        # (survey_id, id) so keyset-paginated reads per survey are a single ordered index range.
+        Index("ix_survey_response_survey_id", "survey_id", "id"),  # <-- needs Index import
+        {"postgresql_partition_by": "RANGE (created_at)"} if _RESPONSE_PARTITIONED else {},
     )
+
+
+# -------------------------
+# Archived survey responses (cold tier, see repositories/response_archive.py)
+# -------------------------
+class ResponseArchiveSegment(Base):
+    __tablename__ = "response_archive_segment"
+
+    # One row per (survey, archived partition): where that survey's rows sit in the
+    # partition's .ndjson.gz file (one gzip member, 'offset'/'length' in bytes).
+    survey_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    partition: Mapped[str] = mapped_column(String(63), primary_key=True)
+    file: Mapped[str] = mapped_column(String(255), nullable=False)  # relative to RESPONSE_ARCHIVE_DIR
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    length: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    range_start: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)  # partition bounds
+    range_end: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# -------------------------
+# Per-question answer rollups (maintained on insert)
+# -------------------------
+class SurveyAnswerRollup(Base):
+    __tablename__ = "survey_answer_rollup"
+
+    # One row per (survey, question, kind, value):
+    #   kind="responses"    question_id=""  -> total responses for the survey
+    #   kind="answered"     value=""        -> responses that answered the question
+    #   kind="choice"       value=<choice>  -> times the choice was picked
+    #   kind="rating"       value=<n>       -> rating histogram bucket
+    #   kind="rating_total" value=""        -> rating count + sum (for the mean)
+    #   kind="text"         value=""        -> non-empty open-text answers
+    survey_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    question_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    value: Mapped[str] = mapped_column(String(128), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+# -------------------------
+# Schema version (single row, id=1)
+# -------------------------
+# Bump SCHEMA_VERSION whenever the tables above (or ensure_access_columns) change.
+# Workers started with DB_CREATE_ALL=0 only compare this row against it.
+SCHEMA_VERSION = 3
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Access tracking and eviction for survey_cache.
+# Hits are counted in memory and written back as one batched UPDATE every few
+# seconds (instead of one write per hit); a background task applies the TTL /
+# max-rows / max-size policies by deleting small batches in short transactions.
+
+# Writes {key: hits} back to survey_cache (hit_count += hits, last_accessed_at = now()).
+FlushTouches = Callable[[Dict[str, int]], Awaitable[None]]
+# Applies the eviction policies; returns {"ttl": n, "rows": n, "size": n} rows deleted.
+Evict = Callable[[], Awaitable[Dict[str, int]]]
+
+
+class AccessTracker:
+    """Pending hit counts per cache key, bounded; keys beyond 'max_keys' are dropped until the next flush."""
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._hits: Dict[str, int] = {}
+        self.dropped = 0
+
+    def touch(self, key: str) -> None:
+        hits = self._hits
+        if key in hits:
+            hits[key] += 1
+        elif len(hits) < self.max_keys:
+            hits[key] = 1
+        else:
+            self.dropped += 1
+
+    def drain(self) -> Dict[str, int]:
+        hits, self._hits = self._hits, {}
+        return hits
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+
+class CacheMaintenance:
+    """
+    One background task:
+    - every 'touch_interval_s' flushes the tracker's pending hits
+    - every 'evict_interval_s' runs 'evict' (0 disables eviction, touches still flush)
+    - stop() flushes whatever is still pending
+    """
+    def __init__(
+        self,
+        tracker: AccessTracker,
+        flush_touches: FlushTouches,
+        evict: Evict,
+        touch_interval_s: float,
+        evict_interval_s: float,
+    ):
+        self.tracker = tracker
+        self._flush_touches = flush_touches
+        self._evict = evict
+        self.touch_interval_s = touch_interval_s
+        self.evict_interval_s = evict_interval_s
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._last_evict = 0.0
+        self.touch_flushes = 0
+        self.touched_keys = 0
+        self.eviction_runs = 0
+        self.evicted: Dict[str, int] = {"ttl": 0, "rows": 0, "size": 0}
+        self.last_eviction_s: Optional[float] = None
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._last_evict = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        touches = self.tracker.drain()
+        if not touches:
+            return
+        try:
+            await self._flush_touches(touches)
+        except Exception:
+            # Access metadata is approximate; losing one interval only ages entries a bit.
+            self.errors += 1
+            logger.exception("survey_cache touch flush failed (%d keys)", len(touches))
+            return
+        self.touch_flushes += 1
+        self.touched_keys += len(touches)
+
+    async def evict_now(self) -> Dict[str, int]:
+        start = time.monotonic()
+        try:
+            evicted = await self._evict()
+        except Exception:
+            self.errors += 1
+            logger.exception("survey_cache eviction failed")
+            return {}
+        self.eviction_runs += 1
+        self.last_eviction_s = round(time.monotonic() - start, 3)
+        for reason, n in evicted.items():
+            self.evicted[reason] = self.evicted.get(reason, 0) + n
+        if any(evicted.values()):
+            logger.info("survey_cache eviction: %s in %.3fs", evicted, self.last_eviction_s)
+        return evicted
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.touch_interval_s)
+            await self.flush()
+            if self.evict_interval_s > 0 and time.monotonic() - self._last_evict >= self.evict_interval_s:
+                self._last_evict = time.monotonic()
+                await self.evict_now()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending_touches": len(self.tracker),
+            "dropped_touches": self.tracker.dropped,
+            "touch_flushes": self.touch_flushes,
+            "touched_keys": self.touched_keys,
+            "eviction_runs": self.eviction_runs,
+            "evicted": dict(self.evicted),
+            "last_eviction_s": self.last_eviction_s,
+            "errors": self.errors,
+        }
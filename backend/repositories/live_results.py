@@ -0,0 +1,299 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from backend.repositories.survey_rollup_repo import Deltas, RollupRow, accumulate_answers, summarize_rollups
+
+# In-process fan-out of live per-question aggregates (GET /api/surveys/{id}/live).
+# Accepted responses are folded into a per-survey pending delta; surveys nobody is
+# watching cost one dict lookup. Once per tick each watched survey's delta is applied to
+# an in-memory copy of its rollups, encoded once and appended to every viewer's buffer.
+# - rollups are read from the DB when the first viewer of a survey arrives and then every
+#   'resync_s' per survey (picks up responses recorded by other workers), never per viewer;
+#   a load replaces the totals and also returns the highest response id it counted, so of
+#   the responses published while it ran only those above that id are added on top
+# - a viewer's buffer holds at most 'buffer_ticks' messages; one that falls behind has its
+#   buffer replaced by a single snapshot of the current totals, so memory per viewer is
+#   bounded and a slow client still converges on exact numbers
+
+# Rollup rows of a survey plus the highest response id they include (same snapshot).
+LoadRows = Callable[[str], Awaitable[Tuple[List[RollupRow], int]]]
+Message = Tuple[str, bytes]  # (event, JSON payload)
+
+
+class LiveSubscribersFull(Exception):
+    """Raised when this worker already serves LIVE_MAX_SUBSCRIBERS viewers (mapped to 503 by the API)."""
+
+
+def _encode(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def delta_patch(survey_id: str, deltas: Deltas) -> Dict[str, Any]:
+    """
+    One tick's increments in the summary shape (models.SurveySummary):
+    - counts are deltas to add; buckets that didn't change are left out
+    - rating "sum"/"count" are increments too, clients recompute the mean
+    """
+    responses = 0
+    questions: Dict[str, Dict[str, Any]] = {}
+    for (_, qid, kind, value), (count, total) in deltas.items():
+        if kind == "responses":
+            responses += count
+            continue
+        q = questions.setdefault(qid, {})
+        if kind == "answered":
+            q["answered"] = count
+        elif kind == "choice":
+            q.setdefault("choices", {})[value] = count
+        elif kind == "text":
+            q["open_text"] = count
+        elif kind == "rating":
+            q.setdefault("rating", {}).setdefault("histogram", {})[value] = count
+        elif kind == "rating_total":
+            rating = q.setdefault("rating", {})
+            rating["count"] = count
+            rating["sum"] = total
+    return {"survey_id": survey_id, "responses": responses, "questions": questions}
+
+
+class _Watch:
+    """Live state of one survey with at least one viewer."""
+    __slots__ = ("survey_id", "subscribers", "pending", "held", "buckets", "snapshot", "loading", "synced_at")
+
+    def __init__(self, survey_id: str):
+        self.survey_id = survey_id
+        self.subscribers: Set["LiveSubscription"] = set()
+        self.pending: Deltas = {}
+        self.held: Optional[List[Tuple[int, Dict[str, Any]]]] = None  # (id, answers) published during a load
+        self.buckets: Optional[Dict[Tuple[str, str, str], list]] = None  # None until the first load
+        self.snapshot: Optional[bytes] = None  # encoded summary of 'buckets', reset on change
+        self.loading: Optional["asyncio.Future[None]"] = None
+        self.synced_at = 0.0
+
+
+class LiveSubscription:
+    __slots__ = ("watch", "buffer", "wakeup", "closed")
+
+    def __init__(self, watch: _Watch):
+        self.watch = watch
+        self.buffer: Deque[Message] = deque()
+        self.wakeup = asyncio.Event()
+        self.closed = False
+
+
+class LiveResults:
+    """
+    Pub/sub hub + tick task.
+    - publish() is called after a response is committed (single, batched and bulk paths)
+    - subscribe() / events() / unsubscribe() serve one viewer; events() yields
+      ("snapshot" | "delta", payload) and None every 'heartbeat_s' when idle
+    - start()/stop() follow the app lifecycle; stop() ends every open stream
+    """
+    def __init__(
+        self,
+        load_rows: LoadRows,
+        tick_ms: int,
+        buffer_ticks: int,
+        resync_s: float,
+        max_subscribers: int,
+        heartbeat_s: float,
+    ):
+        if resync_s <= 0:
+            # Other workers' responses and any published out of id order only arrive this way.
+            raise ValueError("LIVE_RESYNC_S must be > 0")
+        self._load_rows = load_rows
+        self.tick_s = tick_ms / 1000.0
+        self.buffer_ticks = max(1, buffer_ticks)
+        self.resync_s = resync_s
+        self.max_subscribers = max_subscribers
+        self.heartbeat_s = heartbeat_s
+        self._watches: Dict[str, _Watch] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.subscribers = 0
+        self.published = 0
+        self.ticks = 0
+        self.messages = 0
+        self.overflows = 0
+        self.loads = 0
+        self.resyncs = 0
+        self.load_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for watch in list(self._watches.values()):
+            for sub in watch.subscribers:
+                sub.closed = True
+                sub.wakeup.set()
+
+    # -- Publishing ----------------------------------------------------------
+    def publish(self, survey_id: str, answers: Dict[str, Any], response_id: int) -> None:
+        watch = self._watches.get(survey_id)
+        if watch is None:
+            return
+        if watch.held is not None:
+            watch.held.append((response_id, answers))  # sorted out against the load's fence
+        else:
+            accumulate_answers(watch.pending, survey_id, answers or {})
+        self.published += 1
+
+    # -- Viewers -------------------------------------------------------------
+    async def subscribe(self, survey_id: str) -> LiveSubscription:
+        if self.subscribers >= self.max_subscribers:
+            raise LiveSubscribersFull("too many live viewers on this worker")
+        watch = self._watches.get(survey_id)
+        if watch is None:
+            watch = self._watches[survey_id] = _Watch(survey_id)
+            watch.loading = asyncio.ensure_future(self._load(watch))
+        sub = LiveSubscription(watch)
+        watch.subscribers.add(sub)
+        self.subscribers += 1
+        try:
+            # Concurrent first viewers share one load; shield it from a viewer leaving early.
+            await asyncio.shield(watch.loading)
+        except BaseException:
+            self.unsubscribe(sub)
+            raise
+        self._offer(sub, "snapshot", self._snapshot(watch))
+        return sub
+
+    def unsubscribe(self, sub: LiveSubscription) -> None:
+        watch = sub.watch
+        if sub not in watch.subscribers:
+            return
+        watch.subscribers.discard(sub)
+        self.subscribers -= 1
+        sub.closed = True
+        if not watch.subscribers and self._watches.get(watch.survey_id) is watch:
+            del self._watches[watch.survey_id]
+
+    async def events(self, sub: LiveSubscription) -> AsyncIterator[Optional[Message]]:
+        while True:
+            while sub.buffer:
+                yield sub.buffer.popleft()
+            if sub.closed:
+                return
+            sub.wakeup.clear()
+            try:
+                await asyncio.wait_for(sub.wakeup.wait(), self.heartbeat_s)
+            except asyncio.TimeoutError:
+                yield None
+
+    def _offer(self, sub: LiveSubscription, event: str, payload: bytes) -> None:
+        if event == "snapshot":
+            sub.buffer.clear()  # a snapshot supersedes everything queued before it
+        elif len(sub.buffer) >= self.buffer_ticks:
+            # Slow viewer: drop the backlog and resend current totals (they include this tick).
+            sub.buffer.clear()
+            event, payload = "snapshot", self._snapshot(sub.watch)
+            self.overflows += 1
+        sub.buffer.append((event, payload))
+        sub.wakeup.set()
+
+    # -- Aggregates ----------------------------------------------------------
+    def _snapshot(self, watch: _Watch) -> bytes:
+        if watch.snapshot is None:
+            rows = [(qid, kind, value, c, t) for (qid, kind, value), (c, t) in watch.buckets.items()]
+            watch.snapshot = _encode(summarize_rollups(watch.survey_id, rows))
+        return watch.snapshot
+
+    async def _load(self, watch: _Watch) -> None:
+        watch.held = []
+        try:
+            rows, max_id = await self._load_rows(watch.survey_id)
+        except Exception:
+            self.load_errors += 1
+            self._release_held(watch, 0)
+            raise
+        # The rows are authoritative up to 'max_id'. Responses published while they were
+        # read are committed; those at or below it are already counted, the rest are new.
+        # (One that committed after the read with a lower id than a counted one is left
+        # to the next resync.)
+        watch.pending = {}
+        self._release_held(watch, max_id)
+        watch.buckets = {(qid, kind, value): [c, t] for qid, kind, value, c, t in rows}
+        watch.snapshot = None
+        watch.synced_at = time.monotonic()
+        self.loads += 1
+
+    def _release_held(self, watch: _Watch, max_id: int) -> None:
+        held, watch.held = watch.held, None
+        for response_id, answers in held or ():
+            if response_id > max_id:
+                accumulate_answers(watch.pending, watch.survey_id, answers or {})
+
+    async def _resync(self, watch: _Watch) -> None:
+        # Everything published so far is committed, so fold it in before reading the DB.
+        self._flush(watch)
+        try:
+            await self._load(watch)
+        except Exception:
+            watch.synced_at = time.monotonic()  # keep the old totals, try again next period
+            return
+        self.resyncs += 1
+        payload = self._snapshot(watch)
+        for sub in watch.subscribers:
+            self._offer(sub, "snapshot", payload)
+
+    def _flush(self, watch: _Watch) -> None:
+        pending = watch.pending
+        if not pending or watch.buckets is None:
+            return
+        watch.pending = {}
+        buckets = watch.buckets
+        for (_, qid, kind, value), (count, total) in pending.items():
+            bucket = buckets.get((qid, kind, value))
+            if bucket is None:
+                buckets[qid, kind, value] = [count, total]
+            else:
+                bucket[0] += count
+                bucket[1] += total
+        watch.snapshot = None
+        payload = _encode(delta_patch(watch.survey_id, pending))
+        self.ticks += 1
+        for sub in watch.subscribers:
+            self._offer(sub, "delta", payload)
+        self.messages += len(watch.subscribers)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_s)
+            now = time.monotonic()
+            for watch in list(self._watches.values()):
+                if watch.buckets is None:
+                    continue  # first load still running; deltas keep accumulating
+                if now - watch.synced_at >= self.resync_s and watch.loading.done():
+                    watch.loading = asyncio.ensure_future(self._resync(watch))
+                else:
+                    self._flush(watch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "watched_surveys": len(self._watches),
+            "subscribers": self.subscribers,
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "ticks": self.ticks,
+            "messages": self.messages,
+            "overflows": self.overflows,
+            "loads": self.loads,
+            "resyncs": self.resyncs,
+            "load_errors": self.load_errors,
+        }
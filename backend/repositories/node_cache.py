@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Node-local survey cache shared by every uvicorn worker on the machine.
+# One SQLite file (WAL mode, memory-mapped reads) sits between each worker's L1 and
+# Postgres: a survey fetched by any worker is served to the others without a DB
+# round trip, and the file outlives worker restarts and deploys.
+# - reads run inline on the event loop: a primary-key probe served from the mmap'd
+#   page cache, no syscalls on the hot path. The read connection never waits for a
+#   lock (busy timeout 0): a read that would block (SQLITE_BUSY) counts as a miss
+# - writes go to one background thread per worker; SQLite's file locking serializes
+#   writers across processes, and a write that can't get the lock quickly is dropped
+#   (it's a cache)
+# - size is bounded: once the file exceeds 'max_bytes' the least recently read
+#   entries are deleted (read times are refreshed at most every 'touch_s' seconds)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS survey_cache ("
+    " key TEXT PRIMARY KEY, value BLOB NOT NULL, atime INTEGER NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS ix_survey_cache_atime ON survey_cache (atime)",
+)
+
+
+def _is_busy(e: sqlite3.OperationalError) -> bool:
+    code = getattr(e, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(e) or "busy" in str(e)
+
+
+class NodeCache:
+    def __init__(self, path: str, max_bytes: int, mmap_bytes: int, touch_s: float = 60.0, trim_every: int = 64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mmap_bytes = mmap_bytes
+        self.touch_s = touch_s
+        self.trim_every = trim_every
+        self._pid: Optional[int] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set["asyncio.Future[None]"] = set()
+        self._writes_since_trim = 0
+        self._atimes: Dict[str, float] = {}  # last touch we sent, to skip redundant ones
+        self.hits = 0
+        self.misses = 0
+        self.busy = 0
+        self.writes = 0
+        self.dropped_writes = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    # -- connections (opened lazily, per process: never shared across fork) ---
+    def _connect(self, timeout: float) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+        return conn
+
+    def _ensure_open(self) -> None:
+        if self._pid == os.getpid():
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        writer = self._connect(timeout=0.05)  # background thread: may wait briefly
+        for ddl in _SCHEMA:
+            writer.execute(ddl)
+        self._writer = writer
+        self._reader = self._connect(timeout=0.0)  # event loop: never waits
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="node-cache")
+        self._pid = os.getpid()
+
+    # -- reads -----------------------------------------------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        try:
+            self._ensure_open()
+            row = self._reader.execute("SELECT value, atime FROM survey_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError as e:
+            if _is_busy(e):
+                self.busy += 1
+                self.misses += 1
+                return None
+            logger.warning("node cache read failed: %s", e)
+            return None
+        except sqlite3.Error as e:
+            logger.warning("node cache read failed: %s", e)
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value, atime = row
+        now = time.time()
+        if now - max(atime, self._atimes.get(key, 0.0)) >= self.touch_s:
+            if len(self._atimes) >= 100_000:
+                self._atimes.clear()
+            self._atimes[key] = now
+            self._submit(self._touch, key, int(now))
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        found: Dict[str, bytes] = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    # -- writes (background thread) ---------------------------------------------
+    def put(self, key: str, value: bytes) -> None:
+        if self.enabled:
+            self._submit(self._put, key, value)
+
+    def delete(self, key: str) -> None:
+        if self.enabled:
+            self._submit(self._delete, key)
+
+    def _submit(self, fn, *args) -> None:
+        try:
+            self._ensure_open()
+            fut = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        except (RuntimeError, sqlite3.Error) as e:
+            logger.warning("node cache write not scheduled: %s", e)
+            return
+        self._pending.add(fut)
+        fut.add_done_callback(self._pending.discard)
+
+    def _put(self, key: str, value: bytes) -> None:
+        try:
+            self._writer.execute(
+                "INSERT OR REPLACE INTO survey_cache (key, value, atime) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), int(time.time())),
+            )
+            self.writes += 1
+            self._writes_since_trim += 1
+            if self._writes_since_trim >= self.trim_every:
+                self._writes_since_trim = 0
+                self._trim()
+        except sqlite3.Error:
+            self.dropped_writes += 1
+
+    def _touch(self, key: str, atime: int) -> None:
+        try:
+            self._writer.execute("UPDATE survey_cache SET atime = ? WHERE key = ?", (atime, key))
+        except sqlite3.Error:
+            self.dropped_writes += 1
+
+    def _delete(self, key: str) -> None:
+        try:
+            self._writer.execute("DELETE FROM survey_cache WHERE key = ?", (key,))
+        except sqlite3.Error:
+            self.dropped_writes += 1
+
+    def _size_bytes(self, conn: sqlite3.Connection) -> int:
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return (pages - free) * page_size
+
+    def _trim(self) -> None:
+        # Freed pages are reused by later inserts, so the file stays near max_bytes.
+        conn = self._writer
+        while self._size_bytes(conn) > self.max_bytes:
+            deleted = conn.execute(
+                "DELETE FROM survey_cache WHERE key IN (SELECT key FROM survey_cache ORDER BY atime LIMIT 100)"
+            ).rowcount
+            if deleted <= 0:
+                break
+            self.evictions += deleted
+
+    async def flush(self) -> None:
+        """Wait for scheduled writes (tests, shutdown)."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
+            self._reader.close()
+            self._writer.close()
+        self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "busy": self.busy,
+            "writes": self.writes,
+            "dropped_writes": self.dropped_writes,
+            "evictions": self.evictions,
+        }
+        if self.enabled and self._pid == os.getpid():
+            try:
+                out["size_bytes"] = self._size_bytes(self._reader)
+                out["max_bytes"] = self.max_bytes
+            except sqlite3.Error:
+                pass
+        return out
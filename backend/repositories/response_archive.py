@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from backend.config import settings
+from backend.db import engine
+from backend.models_db import ResponseArchiveSegment
+
+# Cold tier for survey_response: one gzip-compressed NDJSON file per archived partition.
+# Every survey's rows are a separate gzip member (concatenated members are still one valid
+# .ndjson.gz file) and response_archive_segment records each member's byte range, so
+# reading one survey back decompresses only that survey's share of the file.
+# Lines are {"response_id", "survey_id", "created_at", "answers"} in (survey_id, id) order.
+# Compression and file IO run in worker threads; the event loop only sees whole pages.
+
+_PAGE_ROWS = 5000
+_READ_BLOCK = 1024 * 1024
+_GZIP_WBITS = 31  # zlib: gzip header + trailer
+
+_segment_table = ResponseArchiveSegment.__table__
+_INSERT_SEGMENT = _segment_table.insert()
+
+
+class _ArchiveWriter:
+    """Blocking writer for one partition's file; used through asyncio.to_thread."""
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp = path + ".tmp"
+        self._file: BinaryIO = open(self._tmp, "wb")
+        self._compressor: Any = None
+        self._segment: Optional[Dict[str, Any]] = None
+        self.segments: List[Dict[str, Any]] = []
+
+    def write_rows(self, rows: List[Tuple[str, int, datetime, str]]) -> None:
+        for survey_id, rid, created_at, answers_text in rows:
+            if self._segment is None or survey_id != self._segment["survey_id"]:
+                self._end_segment()
+                self._compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+                self._segment = {
+                    "survey_id": survey_id, "offset": self._file.tell(), "rows": 0, "first_id": rid, "last_id": rid,
+                }
+            # answers arrive as JSONB text from Postgres: spliced in, never decoded.
+            line = '{"response_id":%d,"survey_id":%s,"created_at":"%s","answers":%s}\n' % (
+                rid, json.dumps(survey_id, ensure_ascii=False), created_at.isoformat(), answers_text,
+            )
+            self._file.write(self._compressor.compress(line.encode("utf-8")))
+            self._segment["rows"] += 1
+            self._segment["last_id"] = rid
+
+    def _end_segment(self) -> None:
+        if self._segment is None:
+            return
+        self._file.write(self._compressor.flush())
+        self._segment["length"] = self._file.tell() - self._segment["offset"]
+        self.segments.append(self._segment)
+        self._segment = None
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the file (fsync + atomic rename); nothing is left on disk for an empty partition."""
+        self._end_segment()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        if self.segments:
+            os.replace(self._tmp, self.path)
+        else:
+            os.remove(self._tmp)
+        return self.segments
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+
+async def archive_partition(name: str, range_start: datetime, range_end: datetime) -> int:
+    """
+    Move one survey_response partition to the cold tier and return its row count:
+    1. stream its rows into RESPONSE_ARCHIVE_DIR/<name>.ndjson.gz
+    2. in ONE transaction: record the segments, DETACH the partition, DROP it
+    Readers see the rows either in the table or through the manifest, never both.
+    A crash before step 2 leaves the partition attached; the next run rewrites the file.
+    """
+    file = f"{name}.ndjson.gz"
+    os.makedirs(settings.RESPONSE_ARCHIVE_DIR, exist_ok=True)
+    writer = await asyncio.to_thread(_ArchiveWriter, os.path.join(settings.RESPONSE_ARCHIVE_DIR, file))
+    try:
+        async with engine.connect() as conn:
+            result = await conn.stream(
+                text(f"SELECT survey_id, id, created_at, answers::text FROM {name} ORDER BY survey_id, id")
+                .execution_options(yield_per=_PAGE_ROWS)
+            )
+            async for page in result.partitions(_PAGE_ROWS):
+                await asyncio.to_thread(writer.write_rows, page)
+        segments = await asyncio.to_thread(writer.close)
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+
+    for segment in segments:
+        segment.update(partition=name, file=file, range_start=range_start, range_end=range_end)
+    async with engine.begin() as conn:
+        if segments:
+            await conn.execute(_INSERT_SEGMENT, segments)
+        await conn.execute(text(f"ALTER TABLE survey_response DETACH PARTITION {name}"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+    return sum(segment["rows"] for segment in segments)
+
+
+def _read_block(f: BinaryIO, decompressor: Any, size: int) -> bytes:
+    return decompressor.decompress(f.read(size))
+
+
+async def _segment_lines(path: str, offset: int, length: int) -> AsyncIterator[bytes]:
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(f.seek, offset)
+        decompressor = zlib.decompressobj(_GZIP_WBITS)
+        remaining = length
+        tail = b""
+        while remaining > 0:
+            size = min(_READ_BLOCK, remaining)
+            data = tail + await asyncio.to_thread(_read_block, f, decompressor, size)
+            remaining -= size
+            lines = data.split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                yield line
+        if tail:
+            yield tail
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+def _aware(dt: Optional[datetime]) -> Optional[datetime]:
+    # Naive bounds mean UTC, as they do for the timestamptz comparison on the hot tier.
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+async def iter_archived(
+    survey_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> AsyncIterator[Tuple[str, int, datetime, dict]]:
+    """
+    Yield (survey_id, id, created_at, answers) from archived partitions, oldest partition
+    first, id order within a survey. 'since' is inclusive, 'until' exclusive (created_at);
+    segments whose partition lies outside the window aren't opened.
+    """
+    since, until = _aware(since), _aware(until)
+    stmt = select(
+        _segment_table.c.survey_id, _segment_table.c.file, _segment_table.c.offset, _segment_table.c.length,
+    ).order_by(_segment_table.c.range_start, _segment_table.c.survey_id)
+    if survey_id is not None:
+        stmt = stmt.where(_segment_table.c.survey_id == survey_id)
+    if since is not None:
+        stmt = stmt.where(_segment_table.c.range_end > since)
+    if until is not None:
+        stmt = stmt.where(_segment_table.c.range_start < until)
+    async with engine.connect() as conn:
+        segments = (await conn.execute(stmt)).all()
+
+    for sid, file, offset, length in segments:
+        async for line in _segment_lines(os.path.join(settings.RESPONSE_ARCHIVE_DIR, file), offset, length):
+            record = json.loads(line)
+            created_at = datetime.fromisoformat(record["created_at"])
+            if (since is not None and created_at < since) or (until is not None and created_at >= until):
+                continue
+            yield sid, record["response_id"], created_at, record["answers"]
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from backend.metrics import stage
+
+# Write-behind "group commit" for survey responses.
+# Callers enqueue (survey_id, answers) and await their own response_id; a single
+# background task flushes the queue as one multi-row INSERT ... RETURNING per batch.
+# Rows Postgres would reject are refused at submit(); if a batch still fails, it is
+# split in halves and retried so only the failing row's caller sees the error.
+
+_Pending = Tuple[str, dict, "asyncio.Future[int]"]
+
+# Writes [{"survey_id", "answers"}, ...] in one transaction and returns ids in row order.
+InsertMany = Callable[[List[Dict[str, Any]]], Awaitable[List[int]]]
+
+
+class ResponseQueueFull(Exception):
+    """Raised when the ingest buffer stays full longer than the enqueue timeout (backpressure)."""
+
+
+class InvalidResponseRow(ValueError):
+    """A row the database would reject (mapped to 422 by the API)."""
+
+
+def check_row(survey_id: str, answers: dict, max_survey_id_len: int) -> None:
+    """Raise InvalidResponseRow for an over-long survey id or NaN/Infinity in the answers (JSONB rejects them)."""
+    if len(survey_id) > max_survey_id_len:
+        raise InvalidResponseRow(f"survey id is longer than {max_survey_id_len} characters")
+    try:
+        json.dumps(answers, allow_nan=False)
+    except ValueError:
+        raise InvalidResponseRow("answers contain NaN or Infinity") from None
+
+
+def _is_outage(e: Exception) -> bool:
+    # Connection-level failures hit every row alike; retrying halves would only multiply them.
+    return isinstance(e, (OSError, asyncio.TimeoutError)) or getattr(e, "connection_invalidated", False)
+
+
+class ResponseBatcher:
+    """
+    Bounded in-process queue + flusher task.
+    - A batch is flushed when it reaches 'max_rows' or 'max_delay_ms' after its first row.
+    - 'queue_size' bounds memory; producers wait up to 'enqueue_timeout_ms' for room,
+      then get ResponseQueueFull (mapped to 503 by the API).
+    - stop() drains everything still buffered before returning (call it on shutdown);
+      rows submitted once stop() has begun are written inline, one INSERT each.
+    """
+    def __init__(
+        self,
+        insert_many: InsertMany,
+        max_rows: int,
+        max_delay_ms: int,
+        queue_size: int,
+        enqueue_timeout_ms: int,
+        max_survey_id_len: int = 128,
+    ):
+        self._insert_many = insert_many
+        self.max_survey_id_len = max_survey_id_len
+        self.max_rows = max_rows
+        self.max_delay_s = max_delay_ms / 1000.0
+        self.queue_size = queue_size
+        self.enqueue_timeout_s = enqueue_timeout_ms / 1000.0
+        self._queue: Optional["asyncio.Queue[Optional[_Pending]]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+        self.batches = 0
+        self.rows = 0
+        self.max_batch = 0
+        self.rejected = 0
+        self.flush_errors = 0
+        self.failed_rows = 0
+        self.inline_rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._closing = True  # from here on submit() writes inline
+        await self._queue.put(None)  # sentinel: flush what's left, then exit
+        await self._task
+        self._task = None
+        await self._drain()  # rows that got queue room only after the task's own drain
+
+    async def submit(self, survey_id: str, answers: dict) -> int:
+        check_row(survey_id, answers, self.max_survey_id_len)
+        if self._closing or self._queue is None:
+            self.inline_rows += 1
+            return (await self._insert_many([{"survey_id": survey_id, "answers": answers}]))[0]
+        fut: "asyncio.Future[int]" = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self._queue.put((survey_id, answers, fut)), self.enqueue_timeout_s)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ResponseQueueFull("response ingest queue is full")
+        if self._closing and self._task is None:
+            await self._drain()  # stop() finished while this row waited for room
+        return await fut
+
+    async def _run(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+            batch: List[_Pending] = [item]
+            deadline = time.monotonic() + self.max_delay_s
+            while len(batch) < self.max_rows:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+        # Drain on shutdown: anything enqueued after the sentinel still gets written.
+        await self._drain()
+
+    async def _drain(self) -> None:
+        rest: List[_Pending] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                rest.append(item)
+        for i in range(0, len(rest), self.max_rows):
+            await self._flush(rest[i:i + self.max_rows])
+
+    async def _flush(self, batch: List[_Pending]) -> None:
+        rows = [{"survey_id": sid, "answers": answers} for sid, answers, _ in batch]
+        try:
+            with stage("response_batch_flush"):
+                ids = await self._insert_many(rows)
+        except Exception as e:
+            self.flush_errors += 1
+            if len(batch) > 1 and not _is_outage(e):
+                # Bisect: the good halves commit, the bad row ends up alone and fails alone.
+                middle = len(batch) // 2
+                await self._flush(batch[:middle])
+                await self._flush(batch[middle:])
+                return
+            self.failed_rows += len(batch)
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+        for (_, _, fut), rid in zip(batch, ids):
+            if not fut.done():  # caller may have gone away; the row is stored regardless
+                fut.set_result(rid)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "batches": self.batches,
+            "rows": self.rows,
+            "max_batch": self.max_batch,
+            "rejected": self.rejected,
+            "flush_errors": self.flush_errors,
+            "failed_rows": self.failed_rows,
+            "inline_rows": self.inline_rows,
+        }
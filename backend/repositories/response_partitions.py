@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from backend.config import settings
+from backend.db import engine
+from backend.repositories.response_archive import archive_partition
+
+# Monthly RANGE partitions of survey_response on created_at (RESPONSE_PARTITIONING=1).
+# - partitions for the current month and RESPONSE_PARTITION_AHEAD_MONTHS after it are
+#   created at boot and then periodically; a DEFAULT partition catches anything else, so
+#   an insert never fails for lack of a partition
+# - with RESPONSE_RETENTION_DAYS and RESPONSE_ARCHIVE_DIR set, partitions that ended
+#   before the retention window are archived to disk and dropped (response_archive.py)
+# - one worker at a time runs maintenance (session advisory lock); every step is idempotent
+# A survey_response table created before partitioning was enabled stays a plain table and
+# maintenance does nothing; see the README for moving it over.
+
+logger = logging.getLogger(__name__)
+
+_PARTITION = re.compile(r"^survey_response_p(\d{4})(\d{2})$")
+DEFAULT_PARTITION = "survey_response_default"
+_LOCK_KEY = 0x73757276_72737031  # arbitrary, shared by all workers
+
+# Runs one maintenance pass; returns {"created": n, "archived": n, "archived_rows": n}.
+RunMaintenance = Callable[[], Awaitable[Dict[str, int]]]
+
+
+def _month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"survey_response_p{month.year:04d}{month.month:02d}"
+
+
+def _partition_range(name: str) -> Optional[Tuple[datetime, datetime]]:
+    m = _PARTITION.match(name)
+    if m is None:
+        return None
+    start = datetime(int(m.group(1)), int(m.group(2)), 1, tzinfo=timezone.utc)
+    return start, _add_months(start, 1)
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    relkind = await conn.scalar(text("SELECT relkind FROM pg_class WHERE oid = to_regclass('survey_response')"))
+    return relkind == "p"
+
+
+async def list_partitions(conn: AsyncConnection) -> List[str]:
+    result = await conn.scalars(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('survey_response') ORDER BY c.relname"
+    ))
+    return list(result)
+
+
+async def ensure_partitions(conn: AsyncConnection, now: datetime, ahead_months: int) -> List[str]:
+    """Create the DEFAULT partition and monthly ones from now's month to 'ahead_months' later; returns new names."""
+    existing = set(await list_partitions(conn))
+    created: List[str] = []
+    if DEFAULT_PARTITION not in existing:
+        await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF survey_response DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+    month = _month_start(now)
+    for i in range(ahead_months + 1):
+        start, end = _add_months(month, i), _add_months(month, i + 1)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        # Fails if the DEFAULT partition already holds rows of this month; those need moving by hand.
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF survey_response "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+async def maintain_partitions() -> Dict[str, int]:
+    """One maintenance pass (see module comment); a no-op while another worker runs one."""
+    out = {"created": 0, "archived": 0, "archived_rows": 0}
+    async with engine.connect() as lock_conn:
+        if not await lock_conn.scalar(select(func.pg_try_advisory_lock(_LOCK_KEY))):
+            return out
+        await lock_conn.commit()
+        try:
+            now = datetime.now(timezone.utc)
+            async with engine.begin() as conn:
+                if not await is_partitioned(conn):
+                    return out
+                out["created"] = len(await ensure_partitions(conn, now, settings.RESPONSE_PARTITION_AHEAD_MONTHS))
+                partitions = await list_partitions(conn)
+
+            if settings.RESPONSE_RETENTION_DAYS <= 0 or not settings.RESPONSE_ARCHIVE_DIR:
+                return out
+            cutoff = now - timedelta(days=settings.RESPONSE_RETENTION_DAYS)
+            for name in partitions:
+                bounds = _partition_range(name)
+                if bounds is None or bounds[1] > cutoff:
+                    continue
+                out["archived_rows"] += await archive_partition(name, *bounds)
+                out["archived"] += 1
+                logger.info("archived partition %s", name)
+        finally:
+            await lock_conn.scalar(select(func.pg_advisory_unlock(_LOCK_KEY)))
+    return out
+
+
+async def hold_off_maintenance(conn: Any) -> None:
+    """
+    Keep maintenance passes from archiving until the caller's transaction ends (waits for
+    a running pass first). For readers that must see each row in exactly one tier.
+    """
+    await conn.execute(select(func.pg_advisory_xact_lock_shared(_LOCK_KEY)))
+
+
+class PartitionMaintenance:
+    """
+    Background task: runs 'maintain' at start() and then every 'interval_s'.
+    Disabled (start() is a no-op) unless RESPONSE_PARTITIONING=1.
+    """
+    def __init__(self, maintain: RunMaintenance, interval_s: float, enabled: bool):
+        self._maintain = maintain
+        self.interval_s = interval_s
+        self.enabled = enabled
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.runs = 0
+        self.created = 0
+        self.archived = 0
+        self.archived_rows = 0
+        self.last_run_s: Optional[float] = None
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.enabled and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_now(self) -> Dict[str, int]:
+        start = time.monotonic()
+        try:
+            done = await self._maintain()
+        except Exception:
+            self.errors += 1
+            logger.exception("survey_response partition maintenance failed")
+            return {}
+        self.runs += 1
+        self.last_run_s = round(time.monotonic() - start, 3)
+        self.created += done["created"]
+        self.archived += done["archived"]
+        self.archived_rows += done["archived_rows"]
+        return done
+
+    async def _run(self) -> None:
+        while True:
+            await self.run_now()
+            await asyncio.sleep(self.interval_s)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "runs": self.runs,
+            "partitions_created": self.created,
+            "partitions_archived": self.archived,
+            "archived_rows": self.archived_rows,
+            "last_run_s": self.last_run_s,
+            "errors": self.errors,
+        }
+
+
+partition_maintenance = PartitionMaintenance(
+    maintain_partitions,
+    interval_s=settings.RESPONSE_PARTITION_INTERVAL_S,
+    enabled=settings.RESPONSE_PARTITIONING,
+)
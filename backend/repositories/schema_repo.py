@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from backend.config import settings
+from backend.models_db import SCHEMA_VERSION, Base, SchemaVersion
+from backend.repositories.response_partitions import ensure_partitions, is_partitioned
+from backend.repositories.survey_cache_repo import ensure_access_columns
+
+# Schema bootstrap vs. the boot-time check.
+# init_schema() is the old on_startup behaviour (create_all + column patches) and stamps
+# SCHEMA_VERSION; it runs on boot with DB_CREATE_ALL=1, or once per deploy through
+# `python -m backend.manage init-db`. With DB_CREATE_ALL=0 a worker only runs
+# check_schema(): one primary-key SELECT instead of a catalog probe per table plus DDL.
+
+_version_table = SchemaVersion.__table__
+_SELECT_VERSION = select(_version_table.c.version).where(_version_table.c.id == 1)
+_insert_version = pg_insert(_version_table)
+_STAMP_VERSION = _insert_version.values(id=1, version=bindparam("version")).on_conflict_do_update(
+    index_elements=["id"],
+    set_={"version": _insert_version.excluded.version, "updated_at": _insert_version.excluded.updated_at},
+    where=_version_table.c.version < _insert_version.excluded.version,
+)
+
+
+class SchemaOutdated(RuntimeError):
+    """The database schema is missing or older than this build expects (DB_CREATE_ALL=0)."""
+
+
+async def init_schema(conn: AsyncConnection) -> None:
+    """Create missing tables/columns (and response partitions) and record SCHEMA_VERSION (never lowers a newer stamp)."""
+    await conn.run_sync(Base.metadata.create_all)
+    await ensure_access_columns(conn)
+    if settings.RESPONSE_PARTITIONING and await is_partitioned(conn):
+        await ensure_partitions(conn, datetime.now(timezone.utc), settings.RESPONSE_PARTITION_AHEAD_MONTHS)
+    await conn.execute(_STAMP_VERSION, {"version": SCHEMA_VERSION})
+
+
+async def check_schema(conn: AsyncConnection) -> int:
+    """
+    Return the stored schema version, or raise SchemaOutdated when it's behind.
+    A newer version is accepted: a rolling deploy migrates before the old workers stop.
+    """
+    try:
+        version = await conn.scalar(_SELECT_VERSION)
+    except DBAPIError as e:  # e.g. schema_version doesn't exist yet
+        raise SchemaOutdated(f"schema version unavailable ({e.orig!r}); run `python -m backend.manage init-db`") from e
+    if version is None or version < SCHEMA_VERSION:
+        raise SchemaOutdated(
+            f"schema version {version} < {SCHEMA_VERSION}; run `python -m backend.manage init-db`"
+        )
+    return version
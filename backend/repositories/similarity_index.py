@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import logging
+import random
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from sqlalchemy import select
+from backend.db import SessionLocal
+from backend.models_db import SurveyCache
+
+logger = logging.getLogger(__name__)
+
+# Near-duplicate lookup over survey_cache.description_norm (MinHash + LSH).
+# Everything is computed locally: briefs are reduced to a set of content words,
+# MinHash signatures are banded into LSH buckets, and candidates from matching
+# buckets are confirmed with the exact Jaccard similarity of their word sets.
+
+_NUM_PERM = 64
+_BANDS = 16
+_ROWS = _NUM_PERM // _BANDS  # 4 rows/band -> candidate pairs from ~0.5 Jaccard upward
+_MERSENNE = (1 << 61) - 1
+
+# Fixed seed: signatures must be identical across processes and restarts.
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(_NUM_PERM)]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or our the to we what with "
+    "about after before during into your you my this that these those survey".split()
+)
+
+
+def tokenize(description_norm: str) -> FrozenSet[str]:
+    """Content words of a normalized brief; order, punctuation and simple plurals are ignored."""
+    words = set()
+    for w in _WORD.findall(description_norm.casefold()):
+        if w in _STOPWORDS:
+            continue
+        if len(w) > 3 and w.endswith("s") and not w.endswith("ss"):
+            w = w[:-1]
+        words.add(w)
+    return frozenset(words)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [_token_hash(t) for t in tokens] or [0]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(i, signature[i * _ROWS:(i + 1) * _ROWS]) for i in range(_BANDS)]
+
+
+_LATE_COMMIT_WINDOW = 1000  # ids below the last one seen that a refresh reads again
+
+
+def _prepare(rows: List[Tuple[str, str, str, int]]) -> List[Tuple[str, str, int, FrozenSet[str], Tuple[int, ...]]]:
+    # CPU-bound (~0.3 ms per brief): called through asyncio.to_thread.
+    out = []
+    for key, description_norm, language, num_questions in rows:
+        tokens = tokenize(description_norm)
+        if tokens:
+            out.append((key, language.casefold(), num_questions, tokens, minhash(tokens)))
+    return out
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    # Two briefs without content words (only stopwords) say nothing about each other.
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class SimilarityIndex:
+    """
+    In-process LSH index of cached briefs.
+    - add()/remove() keep it in sync with this worker's survey_cache writes and
+      evictions; a brief without content words is never indexed
+    - at 'max_entries' the least recently added or matched entry makes room (LRU)
+    - query() returns the best (key, score) with the same language and num_questions;
+      until the first load has finished it only knows this worker's own writes
+    - start() runs a background task that seeds it from Postgres (newest 'max_entries'
+      rows) and then every 'refresh_s' indexes rows written since, by any worker.
+      Tokenizing and MinHashing run in a worker thread, never on the event loop; a
+      failed load is logged and retried next period (lookups just find nothing)
+    """
+    def __init__(self, max_entries: int, refresh_s: float = 60.0, enabled: bool = False):
+        self.max_entries = max_entries
+        self.refresh_s = refresh_s
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[str, int, FrozenSet[str], Tuple[int, ...]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._loaded = False
+        self._last_id: Optional[int] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.lookups = 0
+        self.near_hits = 0
+        self.score_sum = 0.0
+        self.min_score: Optional[float] = None
+        self.evictions = 0
+        self.refreshes = 0
+        self.load_errors = 0
+
+    def add(self, key: str, description_norm: str, language: str, num_questions: int) -> None:
+        if key in self._entries or self.max_entries <= 0:
+            return
+        tokens = tokenize(description_norm)
+        if tokens:
+            self._insert(key, language.casefold(), num_questions, tokens, minhash(tokens))
+
+    def _insert(self, key: str, language: str, num_questions: int, tokens: FrozenSet[str], sig: Tuple[int, ...]) -> None:
+        if key in self._entries:
+            return
+        while len(self._entries) >= self.max_entries:
+            self.remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = (language, num_questions, tokens, sig)
+        for band in _bands(sig):
+            self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in _bands(entry[3]):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def query(self, description_norm: str, language: str, num_questions: int, threshold: float) -> Optional[Tuple[str, float]]:
+        self.lookups += 1
+        tokens = tokenize(description_norm)
+        if not tokens:
+            return None
+        language = language.casefold()
+        candidates: Set[str] = set()
+        for band in _bands(minhash(tokens)):
+            candidates |= self._buckets.get(band, set())
+
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            lang, n, other, _ = self._entries[key]
+            if lang != language or n != num_questions:
+                continue
+            score = jaccard(tokens, other)
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        if best is not None:
+            self._entries.move_to_end(best[0])
+            self.near_hits += 1
+            self.score_sum += best[1]
+            self.min_score = best[1] if self.min_score is None else min(self.min_score, best[1])
+        return best
+
+    # -- Background load / refresh -------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.enabled and self.max_entries > 0 and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                self.load_errors += 1
+                logger.exception("similarity index refresh failed")
+            if self.refresh_s <= 0 and self._loaded:
+                return
+            await asyncio.sleep(self.refresh_s if self.refresh_s > 0 else 60.0)
+
+    async def refresh(self) -> int:
+        """Index survey_cache rows written since the last refresh (the newest 'max_entries' the first time)."""
+        stmt = (
+            select(SurveyCache.id, SurveyCache.key, SurveyCache.description_norm, SurveyCache.language, SurveyCache.num_questions)
+            .order_by(SurveyCache.id.desc())
+            .limit(self.max_entries)
+        )
+        if self._last_id is not None:
+            # ids are assigned at INSERT, not at commit: re-read a small window below the
+            # last one seen so rows committed out of order aren't skipped (known keys are).
+            stmt = stmt.where(SurveyCache.id > self._last_id - _LATE_COMMIT_WINDOW)
+        async with SessionLocal() as session:
+            rows = (await session.execute(stmt)).all()
+        if rows:
+            self._last_id = max(self._last_id or 0, rows[0][0])
+        fresh = [row[1:] for row in reversed(rows) if row[1] not in self._entries]  # oldest first
+        prepared = await asyncio.to_thread(_prepare, fresh)
+        for i, (key, lang, n, tokens, sig) in enumerate(prepared):
+            self._insert(key, lang, n, tokens, sig)
+            if i % 1000 == 999:
+                await asyncio.sleep(0)
+        if not self._loaded:
+            self._loaded = True
+            logger.info("similarity index loaded with %d cached briefs", len(self._entries))
+        self.refreshes += 1
+        return len(prepared)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "loaded": self._loaded,
+            "running": self.running,
+            "refreshes": self.refreshes,
+            "load_errors": self.load_errors,
+            "evictions": self.evictions,
+            "lookups": self.lookups,
+            "near_hits": self.near_hits,
+            "mean_score": self.score_sum / self.near_hits if self.near_hits else None,
+            "min_score": self.min_score,
+        }
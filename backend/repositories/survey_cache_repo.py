@@ -1,15 +1,51 @@
+import asyncio
 import hashlib
+import json
+import logging
 import re
-from typing import Optional
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-from backend.db import SessionLocal
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, cast, delete, func, text, update, any_, bindparam, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from backend.db import SessionLocal, engine
 from backend.models_db import SurveyCache
+from backend.cache import MISS, TTLLRUCache
+from backend.config import settings
+from backend.repositories.similarity_index import SimilarityIndex
+from backend.repositories.cache_maintenance import AccessTracker, CacheMaintenance
+from backend.repositories.node_cache import NodeCache
 
 
 from backend.db import SessionLocal
 from backend.models_db import SurveyCache
 
+# In-process L1 in front of Postgres, keyed by make_key().
+# Warm hits are served without checking out a pooled connection; misses are
+# remembered briefly (negative TTL) so a burst of unknown briefs doesn't hammer the DB.
+l1_cache = TTLLRUCache(
+    max_entries=settings.SURVEY_L1_CACHE_SIZE,
+    ttl_s=settings.SURVEY_L1_CACHE_TTL_S,
+)
+
+# Optional node-local tier shared by all workers on the machine (SHARED_CACHE_PATH set).
+node_cache = NodeCache(
+    path=settings.SHARED_CACHE_PATH,
+    max_bytes=int(settings.SHARED_CACHE_MAX_MB * 1024 * 1024),
+    mmap_bytes=int(settings.SHARED_CACHE_MMAP_MB * 1024 * 1024),
+)
+
+# Optional near-duplicate tier (SIMILARITY_LOOKUP_ENABLED=1) consulted after an exact miss.
+similarity_index = SimilarityIndex(
+    max_entries=settings.SIMILARITY_INDEX_MAX_ENTRIES,
+    refresh_s=settings.SIMILARITY_INDEX_REFRESH_S,
+    enabled=settings.SIMILARITY_LOOKUP_ENABLED,
+)
+
+# Hits are counted here and written back in batches by cache_maintenance (see below).
+access_tracker = AccessTracker(max_keys=settings.SURVEY_CACHE_TOUCH_MAX_KEYS)
+
+logger = logging.getLogger(__name__)
+
 # Helpers for cache normalization and keying.
 
 def normalize_description(text: str) -> str:
@@ -33,33 +69,411 @@ def make_key(description: str, num_questions: int, language: str) -> str:
     payload = f"{normalize_description(description)}|{num_questions}|{language.casefold()}"
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
+def dump_survey_json(survey_json: dict) -> bytes:
+    """Compact UTF-8 JSON, the same encoding FastAPI's JSONResponse produces."""
+    return json.dumps(survey_json, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 async def fetch_cached(description: str, num_questions: int, language: str) -> Optional[dict]:
     """
     Look up a previously generated survey by cache key.
     Returns the stored JSON if present, otherwise None.
     """
+    raw = await fetch_cached_raw(description, num_questions, language)
+    return json.loads(raw) if raw is not None else None
+
+async def fetch_cached_raw(description: str, num_questions: int, language: str) -> Optional[bytes]:
+    """
+    Same lookup as fetch_cached, but returns the stored survey as serialized JSON bytes
+    ({"title", "description", "questions"}, already validated at write time).
+    Lookup order: L1 (this worker) -> node cache (all workers, if enabled) -> Postgres.
+    With similarity lookup enabled, an exact miss falls back to the closest cached
+    paraphrase (same language and num_questions, Jaccard >= SIMILARITY_THRESHOLD).
+    """
     key = make_key(description, num_questions, language)
-    async with SessionLocal() as session:
-        row = await session.scalar(select(SurveyCache).where(SurveyCache.key == key))
-        return row.survey_json if row else None
+    raw = await _fetch_by_key(key)
+    if raw is None and settings.SIMILARITY_LOOKUP_ENABLED:
+        raw = await _fetch_similar(description, num_questions, language)
+    return raw
+
+# -- Hot-path statements ---------------------------------------------------------
+# Core statements built once on the table, run on a bare connection (no ORM session or
+# entity materialization). Their SQL text never changes, so each pooled connection
+# prepares them once; the multi-key lookup binds one array (= ANY) instead of an IN
+# list whose SQL varies with the number of keys.
+_cache_table = SurveyCache.__table__
+_SELECT_JSON_TEXT = (
+    select(cast(_cache_table.c.survey_json, Text)).where(_cache_table.c.key == bindparam("key"))
+)
+_SELECT_JSON_TEXT_MANY = (
+    select(_cache_table.c.key, cast(_cache_table.c.survey_json, Text))
+    .where(_cache_table.c.key == any_(bindparam("keys", type_=ARRAY(String))))
+)
+_SELECT_SUPERSET = (
+    select(_cache_table.c.survey_json)
+    .where(
+        _cache_table.c.description_norm == bindparam("description_norm"),
+        _cache_table.c.language == bindparam("language"),
+        _cache_table.c.num_questions > bindparam("num_questions"),
+    )
+    .order_by(_cache_table.c.num_questions)
+    .limit(1)
+)
+# ON CONFLICT DO NOTHING: a racing duplicate is a no-op (no exception, no rollback);
+# RETURNING tells the caller whether its row won.
+_INSERT_CACHE = (
+    pg_insert(_cache_table)
+    .on_conflict_do_nothing(index_elements=["key"])
+    .returning(_cache_table.c.id)
+)
+
+# Most recently hit rows first (walks ix_survey_cache_last_accessed backwards, no sort).
+_SELECT_HOT = (
+    select(_cache_table.c.key, cast(_cache_table.c.survey_json, Text))
+    .order_by(_cache_table.c.last_accessed_at.desc())
+    .limit(bindparam("limit"))
+)
+
+async def preload_hot_cache(limit: int) -> int:
+    """
+    Load the 'limit' most recently hit surveys into L1 (boot warm-up).
+    Not counted as hits; capped at the L1 size. Returns the number of entries loaded.
+    """
+    limit = min(limit, settings.SURVEY_L1_CACHE_SIZE)
+    if limit <= 0:
+        return 0
+    async with engine.connect() as conn:
+        rows = (await conn.execute(_SELECT_HOT, {"limit": limit})).all()
+    # Oldest first, so the hottest rows end up most recently used in the LRU.
+    for key, text_json in reversed(rows):
+        l1_cache.set(key, text_json.encode("utf-8"))
+    return len(rows)
+
+async def _fetch_by_key(key: str) -> Optional[bytes]:
+    hit = l1_cache.get(key)
+    if hit is MISS:
+        return None
+    if hit is not None:
+        access_tracker.touch(key)
+        return hit
+    shared = node_cache.get(key)
+    if shared is not None:
+        l1_cache.set(key, shared)
+        access_tracker.touch(key)
+        return shared
+
+    # JSONB rendered as text by Postgres: no JSON decode/encode round trip in Python.
+    async with engine.connect() as conn:
+        text_json = await conn.scalar(_SELECT_JSON_TEXT, {"key": key})
+    if text_json is None:
+        l1_cache.set(key, MISS, ttl_s=settings.SURVEY_L1_NEGATIVE_TTL_S)
+        return None
+    raw = text_json.encode("utf-8")
+    l1_cache.set(key, raw)
+    node_cache.put(key, raw)
+    access_tracker.touch(key)
+    return raw
+
+async def fetch_cached_many(keys: List[str]) -> Dict[str, bytes]:
+    """
+    Batch form of the exact-key lookup: L1 first, then ONE query for every remaining key.
+    Returns {key: survey bytes} for the hits; misses are remembered in L1 like single lookups.
+    """
+    found: Dict[str, bytes] = {}
+    missing: List[str] = []
+    for key in dict.fromkeys(keys):
+        hit = l1_cache.get(key)
+        if hit is MISS:
+            continue
+        if hit is not None:
+            access_tracker.touch(key)
+            found[key] = hit
+        else:
+            missing.append(key)
+    for key, raw in node_cache.get_many(missing).items():
+        l1_cache.set(key, raw)
+        access_tracker.touch(key)
+        found[key] = raw
+    missing = [key for key in missing if key not in found]
+    if not missing:
+        return found
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(_SELECT_JSON_TEXT_MANY, {"keys": missing})).all()
+    for key, text_json in rows:
+        raw = text_json.encode("utf-8")
+        l1_cache.set(key, raw)
+        node_cache.put(key, raw)
+        access_tracker.touch(key)
+        found[key] = raw
+    for key in missing:
+        if key not in found:
+            l1_cache.set(key, MISS, ttl_s=settings.SURVEY_L1_NEGATIVE_TTL_S)
+    return found
+
+async def _fetch_similar(description: str, num_questions: int, language: str) -> Optional[bytes]:
+    # The index loads in the background (similarity_index.start()); never on a request.
+    match = similarity_index.query(
+        normalize_description(description), language, num_questions, settings.SIMILARITY_THRESHOLD
+    )
+    if match is None:
+        return None
+    key, score = match
+    logger.info("near-duplicate cache hit (score=%.3f) for brief %r", score, description[:80])
+    return await _fetch_by_key(key)
+
+async def fetch_cached_superset(description: str, num_questions: int, language: str) -> Optional[dict]:
+    """
+    Find the smallest cached survey for the same normalized brief and language that
+    has MORE than 'num_questions' questions (callers slice it down).
+    Served by ix_survey_cache_desc_lang_num as a single index probe. A miss is
+    remembered in L1 for SURVEY_L1_NEGATIVE_TTL_S, like an exact-key miss, so repeats
+    of an uncached brief don't probe again.
+    """
+    miss_key = ("superset", make_key(description, num_questions, language))
+    if l1_cache.get(miss_key) is MISS:
+        return None
+    params = {
+        "description_norm": normalize_description(description),
+        "language": language.casefold(),
+        "num_questions": num_questions,
+    }
+    async with engine.connect() as conn:
+        survey = await conn.scalar(_SELECT_SUPERSET, params)
+    if survey is None:
+        l1_cache.set(miss_key, MISS, ttl_s=settings.SURVEY_L1_NEGATIVE_TTL_S)
+    return survey
 
-async def save_cache(description: str, num_questions: int, language: str, survey_json: dict) -> None:
+async def save_cache(
+    description: str,
+    num_questions: int,
+    language: str,
+    survey_json: dict,
+    survey_bytes: Optional[bytes] = None,
+) -> None:
     """
     Insert a new cache record; if a duplicate key races in, we silently ignore it.
-    (The unique constraint on key is expected to raise IntegrityError in that case.)
+    (INSERT ... ON CONFLICT (key) DO NOTHING: one round trip either way.)
+    'survey_json' must already be in its final, validated wire form; 'survey_bytes'
+    is its serialization if the caller has it (computed otherwise).
     """
     key = make_key(description, num_questions, language)
-    rec = SurveyCache(
-        key=key,
-        description_norm=normalize_description(description),
-        num_questions=num_questions,
-        language=language,
-        survey_json=survey_json,
+    if survey_bytes is None:
+        survey_bytes = dump_survey_json(survey_json)
+    description_norm = normalize_description(description)
+    row = {
+        "key": key,
+        "description_norm": description_norm,
+        "num_questions": num_questions,
+        "language": language.casefold(),
+        "survey_json": survey_json,
+        "size_bytes": len(survey_bytes),
+    }
+    async with engine.begin() as conn:
+        inserted = await conn.scalar(_INSERT_CACHE, row)
+    if inserted is None:
+        # Another request committed the same key first; treat as a cache "hit" for future requests.
+        # Drop any cached negative entry; the winner's row is read on next lookup.
+        l1_cache.invalidate(key)
+        return
+    # Write-through: replaces a cached miss for this key as well.
+    l1_cache.set(key, survey_bytes)
+    node_cache.put(key, survey_bytes)
+    if settings.SIMILARITY_LOOKUP_ENABLED:
+        similarity_index.add(key, description_norm, language, num_questions)
+
+
+# -- Access tracking & eviction -------------------------------------------------
+# Columns added after the table first shipped; create_all() won't add them to an
+# existing table. Each statement is metadata-only on Postgres 11+, but still takes an
+# ACCESS EXCLUSIVE lock, so only the missing ones run (one catalog read per boot).
+ACCESS_COLUMNS_DDL = (
+    ("last_accessed_at", "ALTER TABLE survey_cache ADD COLUMN IF NOT EXISTS last_accessed_at TIMESTAMPTZ NOT NULL DEFAULT now()"),
+    ("hit_count", "ALTER TABLE survey_cache ADD COLUMN IF NOT EXISTS hit_count BIGINT NOT NULL DEFAULT 0"),
+    ("size_bytes", "ALTER TABLE survey_cache ADD COLUMN IF NOT EXISTS size_bytes INTEGER NOT NULL DEFAULT 0"),
+    ("ix_survey_cache_last_accessed", "CREATE INDEX IF NOT EXISTS ix_survey_cache_last_accessed ON survey_cache (last_accessed_at)"),
+)
+_SELECT_APPLIED = text(
+    "SELECT column_name::text FROM information_schema.columns "
+    "WHERE table_schema = current_schema() AND table_name = 'survey_cache' "
+    "UNION ALL "
+    "SELECT indexname::text FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'survey_cache'"
+)
+
+async def ensure_access_columns(conn) -> int:
+    """Apply the ACCESS_COLUMNS_DDL entries that are missing; returns how many ran."""
+    applied = set(await conn.scalars(_SELECT_APPLIED))
+    missing = [ddl for name, ddl in ACCESS_COLUMNS_DDL if name not in applied]
+    for ddl in missing:
+        await conn.execute(text(ddl))
+    return len(missing)
+
+# ix_survey_cache_desc_lang_num came with superset lookups. Building it inside the
+# init_schema transaction would block cache writes for the whole build, so it is built
+# CONCURRENTLY on its own autocommit connection (one worker at a time). A build that
+# failed half-way leaves an INVALID index behind; that one is dropped and rebuilt.
+_LOOKUP_INDEX_LOCK_KEY = 0x73757276_6c6b6978  # arbitrary, shared by all workers
+_SELECT_LOOKUP_INDEX = text(
+    "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE c.relname = 'ix_survey_cache_desc_lang_num' AND n.nspname = current_schema()"
+)
+_DROP_LOOKUP_INDEX = text("DROP INDEX CONCURRENTLY IF EXISTS ix_survey_cache_desc_lang_num")
+_CREATE_LOOKUP_INDEX = text(
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_survey_cache_desc_lang_num "
+    "ON survey_cache (description_norm, language, num_questions)"
+)
+
+async def ensure_lookup_index() -> bool:
+    """Build the superset-lookup index if it is missing or invalid; returns True if it was built."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if await conn.scalar(_SELECT_LOOKUP_INDEX):
+            return False
+        if not await conn.scalar(select(func.pg_try_advisory_lock(_LOOKUP_INDEX_LOCK_KEY))):
+            return False  # another worker is building it
+        try:
+            valid = await conn.scalar(_SELECT_LOOKUP_INDEX)
+            if valid:
+                return False
+            if valid is not None:
+                await conn.execute(_DROP_LOOKUP_INDEX)
+            await conn.execute(_CREATE_LOOKUP_INDEX)
+            return True
+        finally:
+            await conn.scalar(select(func.pg_advisory_unlock(_LOOKUP_INDEX_LOCK_KEY)))
+
+_TOUCH = (
+    update(_cache_table)
+    .where(_cache_table.c.key == bindparam("b_key"))
+    .values(hit_count=_cache_table.c.hit_count + bindparam("b_hits"), last_accessed_at=func.now())
+)
+
+async def flush_touches(touches: Dict[str, int]) -> None:
+    """One executemany UPDATE for all keys hit since the last flush (sorted: stable lock order)."""
+    params = [{"b_key": k, "b_hits": n} for k, n in sorted(touches.items())]
+    async with engine.begin() as conn:
+        await conn.execute(_TOUCH, params)
+
+async def _delete_lru_batch(limit: int, idle_before: Optional[datetime] = None) -> List[Tuple[str, int]]:
+    """
+    Delete up to 'limit' least recently used rows in one short transaction.
+    SKIP LOCKED: rows being touched or deleted by another worker are left for later.
+    Evicted keys are dropped from this process's L1 and similarity index and from the
+    node cache; other workers' L1 entries age out within SURVEY_L1_CACHE_TTL_S.
+    """
+    victims = (
+        select(SurveyCache.id)
+        .order_by(SurveyCache.last_accessed_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if idle_before is not None:
+        victims = victims.where(SurveyCache.last_accessed_at < idle_before)
+    stmt = (
+        delete(SurveyCache)
+        .where(SurveyCache.id.in_(victims.scalar_subquery()))
+        .returning(SurveyCache.key, SurveyCache.size_bytes)
+        .execution_options(synchronize_session=False)
     )
     async with SessionLocal() as session:
-        session.add(rec)
+        rows = (await session.execute(stmt)).all()
+        await session.commit()
+    for key, _ in rows:
+        l1_cache.invalidate(key)
+        node_cache.delete(key)
+        similarity_index.remove(key)
+    return [(key, size) for key, size in rows]
+
+_EVICT_LOCK_KEY = 0x73757276_65766963  # arbitrary, shared by all workers
+
+async def evict_cache() -> Dict[str, int]:
+    """
+    Apply the configured policies, oldest access first, in SURVEY_CACHE_EVICT_BATCH batches:
+    - ttl:  rows not hit for SURVEY_CACHE_TTL_DAYS
+    - rows: rows beyond SURVEY_CACHE_MAX_ROWS
+    - size: stored surveys beyond SURVEY_CACHE_MAX_MB in total
+    One worker at a time runs a pass (session advisory lock); the others skip theirs, so
+    the excess computed up front is deleted once, not once per worker.
+    """
+    async with engine.connect() as lock_conn:
+        if not await lock_conn.scalar(select(func.pg_try_advisory_lock(_EVICT_LOCK_KEY))):
+            return {"ttl": 0, "rows": 0, "size": 0}
+        await lock_conn.commit()
         try:
+            return await _evict_pass()
+        finally:
+            await lock_conn.scalar(select(func.pg_advisory_unlock(_EVICT_LOCK_KEY)))
+
+async def _evict_pass() -> Dict[str, int]:
+    batch = settings.SURVEY_CACHE_EVICT_BATCH
+    pause_s = settings.SURVEY_CACHE_EVICT_PAUSE_MS / 1000.0
+    evicted = {"ttl": 0, "rows": 0, "size": 0}
+
+    if settings.SURVEY_CACHE_TTL_DAYS > 0:
+        idle_before = datetime.now(timezone.utc) - timedelta(days=settings.SURVEY_CACHE_TTL_DAYS)
+        while True:
+            deleted = await _delete_lru_batch(batch, idle_before)
+            evicted["ttl"] += len(deleted)
+            if len(deleted) < batch:
+                break
+            await asyncio.sleep(pause_s)
+
+    max_rows = settings.SURVEY_CACHE_MAX_ROWS
+    max_bytes = int(settings.SURVEY_CACHE_MAX_MB * 1024 * 1024)
+    if max_rows <= 0 and max_bytes <= 0:
+        return evicted
+    async with SessionLocal() as session:
+        rows, total = (await session.execute(
+            select(func.count(), func.coalesce(func.sum(SurveyCache.size_bytes), 0))
+        )).one()
+    excess_rows = rows - max_rows if max_rows > 0 else 0
+    excess_bytes = total - max_bytes if max_bytes > 0 else 0
+    while excess_rows > 0 or excess_bytes > 0:
+        reason = "rows" if excess_rows > 0 else "size"
+        limit = min(batch, excess_rows) if excess_bytes <= 0 else batch
+        deleted = await _delete_lru_batch(limit)
+        if not deleted:
+            break
+        evicted[reason] += len(deleted)
+        excess_rows -= len(deleted)
+        excess_bytes -= sum(size for _, size in deleted)
+        await asyncio.sleep(pause_s)
+    return evicted
+
+async def backfill_sizes(batch: int = 1000) -> int:
+    """Set size_bytes for rows cached before the column existed (one-off, batched)."""
+    updated = 0
+    stmt = text(
+        "UPDATE survey_cache SET size_bytes = octet_length(survey_json::text) "
+        "WHERE id IN (SELECT id FROM survey_cache WHERE size_bytes = 0 LIMIT :n FOR UPDATE SKIP LOCKED)"
+    )
+    while True:
+        async with SessionLocal() as session:
+            n = (await session.execute(stmt, {"n": batch})).rowcount
+            await session.commit()
+        updated += n
+        if n < batch:
+            return updated
+
+async def backfill_languages(batch: int = 1000) -> int:
+    """Case-fold survey_cache.language on rows cached before it was stored folded (one-off, batched)."""
+    updated = 0
+    stmt = text(
+        "UPDATE survey_cache SET language = lower(language) "
+        "WHERE id IN (SELECT id FROM survey_cache WHERE language <> lower(language) LIMIT :n FOR UPDATE SKIP LOCKED)"
+    )
+    while True:
+        async with SessionLocal() as session:
+            n = (await session.execute(stmt, {"n": batch})).rowcount
             await session.commit()
-        except IntegrityError:
-            # Another request committed the same key first; treat as a cache "hit" for future requests.
-            await session.rollback()  # another request saved it first; fine
+        updated += n
+        if n < batch:
+            return updated
+
+cache_maintenance = CacheMaintenance(
+    access_tracker,
+    flush_touches,
+    evict_cache,
+    touch_interval_s=settings.SURVEY_CACHE_TOUCH_FLUSH_S,
+    evict_interval_s=settings.SURVEY_CACHE_EVICT_INTERVAL_S,
+)
@@ -0,0 +1,95 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from backend.db import engine
+from backend.models_db import SurveyRecord
+from backend.cache import MISS, TTLLRUCache
+from backend.config import settings
+
+# Survey registry: the survey last served under each srv_<slug>_<hash> id.
+# Generate paths register what they return; GET /api/surveys/{id} and answer
+# validation read it back. The stored body is canonical JSON (sorted keys), so the
+# same survey gets the same ETag whether it came from a fresh generation or from
+# Postgres' JSONB rendering in another worker.
+
+# (etag, body) per survey id, or MISS for ids looked up and not found.
+registry_cache = TTLLRUCache(
+    max_entries=settings.SURVEY_REGISTRY_CACHE_SIZE,
+    ttl_s=settings.SURVEY_REGISTRY_CACHE_TTL_S,
+)
+# Last survey bytes each id was registered from in this process: a repeat (the common
+# cache-hit case) is recognized by a bytes comparison, with no JSON work and no write.
+# No TTL: the row can only go stale through another registration with different bytes,
+# which a later hit detects by the same comparison. So a warm hit registers once per
+# id per process (while it stays among the SURVEY_REGISTRY_CACHE_SIZE most recent).
+_registered = TTLLRUCache(max_entries=settings.SURVEY_REGISTRY_CACHE_SIZE, ttl_s=float("inf"))
+
+_survey_table = SurveyRecord.__table__
+_insert_survey = pg_insert(_survey_table)
+# Rewrites the row only when the content actually changed.
+_UPSERT_SURVEY = _insert_survey.on_conflict_do_update(
+    index_elements=["id"],
+    set_={"body": _insert_survey.excluded.body, "etag": _insert_survey.excluded.etag, "updated_at": func.now()},
+    where=_survey_table.c.etag != _insert_survey.excluded.etag,
+)
+_SELECT_SURVEY = select(_survey_table.c.etag, _survey_table.c.body).where(_survey_table.c.id == bindparam("id"))
+
+
+def canonical_body(survey_bytes: bytes) -> bytes:
+    return json.dumps(json.loads(survey_bytes), ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+async def register_surveys(items: List[Tuple[str, bytes]]) -> None:
+    """
+    Record (survey_id, survey bytes) pairs; one executemany for everything that changed.
+    'survey bytes' is the stored {title, description, questions} object (any key order).
+    """
+    pending: Dict[str, Tuple[bytes, bytes, str]] = {}  # id -> (source bytes, body, etag)
+    for survey_id, survey_bytes in items:
+        seen = _registered.get(survey_id)
+        if seen is not None and seen[0] == survey_bytes:
+            continue
+        body = canonical_body(survey_bytes)
+        etag = make_etag(body)
+        if seen is not None and seen[1] == etag:
+            _registered.set(survey_id, (survey_bytes, etag))
+            continue
+        pending[survey_id] = (survey_bytes, body, etag)
+    if not pending:
+        return
+    params = [
+        {"id": survey_id, "body": body.decode("utf-8"), "etag": etag}
+        for survey_id, (_, body, etag) in sorted(pending.items())  # stable lock order
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(_UPSERT_SURVEY, params)
+    for survey_id, (survey_bytes, body, etag) in pending.items():
+        _registered.set(survey_id, (survey_bytes, etag))
+        registry_cache.set(survey_id, (etag, body))
+
+
+async def register_survey(survey_id: str, survey_bytes: bytes) -> None:
+    await register_surveys([(survey_id, survey_bytes)])
+
+
+async def fetch_survey(survey_id: str) -> Optional[Tuple[str, bytes]]:
+    """(etag, canonical body) for a registered survey, else None."""
+    hit = registry_cache.get(survey_id)
+    if hit is MISS:
+        return None
+    if hit is not None:
+        return hit
+    async with engine.connect() as conn:
+        row = (await conn.execute(_SELECT_SURVEY, {"id": survey_id})).first()
+    if row is None:
+        registry_cache.set(survey_id, MISS, ttl_s=settings.SURVEY_L1_NEGATIVE_TTL_S)
+        return None
+    entry = (row.etag, row.body.encode("utf-8"))
+    registry_cache.set(survey_id, entry)
+    return entry
@@ -1,19 +1,127 @@
-from sqlalchemy import select
-from backend.db import SessionLocal
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy import select, insert
+from backend.db import engine
 from backend.models_db import SurveyResponse
+from backend.config import settings
+from backend.repositories.response_batcher import ResponseBatcher, check_row
+from backend.repositories.live_results import LiveResults
+from backend.repositories.response_archive import iter_archived
+from backend.repositories.survey_rollup_repo import apply_rollups, fetch_rollup_rows_as_of
+from backend.metrics import stage
 
 # Repository for persisting end-user survey responses.
 
+# Core statements on the table (not the mapped class): no ORM unit of work per write.
+# sort_by_parameter_order keeps RETURNING rows aligned with the submitted rows,
+# so every caller gets its own id back.
+_response_table = SurveyResponse.__table__
+_INSERT_RETURNING_ID = insert(_response_table).returning(_response_table.c.id, sort_by_parameter_order=True)
+_INSERT_ONE = insert(_response_table).returning(_response_table.c.id)
+SURVEY_ID_MAX_LEN = _response_table.c.survey_id.type.length
+
+# Live aggregates for GET /api/surveys/{id}/live; every committed response is published here.
+live_results = LiveResults(
+    load_rows=fetch_rollup_rows_as_of,
+    tick_ms=settings.LIVE_TICK_MS,
+    buffer_ticks=settings.LIVE_BUFFER_TICKS,
+    resync_s=settings.LIVE_RESYNC_S,
+    max_subscribers=settings.LIVE_MAX_SUBSCRIBERS,
+    heartbeat_s=settings.LIVE_HEARTBEAT_S,
+)
+
+
+async def insert_responses(rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Persist many responses in one transaction:
+    - rows are {"survey_id": ..., "answers": ...}
+    - executed as multi-row INSERT ... RETURNING id (SQLAlchemy "insertmanyvalues")
+    - ids come back in the same order as 'rows'
+    - per-question rollups are updated in the same transaction
+    - after commit the rows are published to live viewers
+    """
+    if not rows:
+        return []
+    async with engine.begin() as conn:
+        result = await conn.execute(_INSERT_RETURNING_ID, rows)
+        ids = list(result.scalars())
+        if settings.ROLLUPS_ENABLED:
+            await apply_rollups(conn, rows)
+    for row, rid in zip(rows, ids):
+        live_results.publish(row["survey_id"], row["answers"], rid)
+    return ids
+
+
+# Optional group-commit path (RESPONSE_BATCH_ENABLED=1); started/stopped by the app lifecycle.
+response_batcher = ResponseBatcher(
+    insert_many=insert_responses,
+    max_rows=settings.RESPONSE_BATCH_MAX_ROWS,
+    max_delay_ms=settings.RESPONSE_BATCH_MAX_DELAY_MS,
+    queue_size=settings.RESPONSE_BATCH_QUEUE_SIZE,
+    enqueue_timeout_ms=settings.RESPONSE_BATCH_ENQUEUE_TIMEOUT_MS,
+    max_survey_id_len=SURVEY_ID_MAX_LEN,
+)
+
 async def save_response(survey_id: str, answers: dict) -> int:
     """
     Persist a single response:
     - 'answers' is stored as JSONB as-is
     - primary key is returned to the caller for reference
+    - one INSERT ... RETURNING id round trip (plus the rollup upsert) in one transaction
+    - with batching enabled, the row is group-committed with other concurrent responses
+    - raises InvalidResponseRow for rows Postgres would reject (long id, NaN/Infinity)
     """
-    async with SessionLocal() as session:
-        rec = SurveyResponse(survey_id=survey_id, answers=answers)
-        session.add(rec)
-        await session.flush()     # assigns primary key (rec.id) without full commit
-        rid = rec.id
-        await session.commit()
+    with stage("save_response"):
+        if response_batcher.running:
+            return await response_batcher.submit(survey_id, answers)
+
+        check_row(survey_id, answers, SURVEY_ID_MAX_LEN)
+        row = {"survey_id": survey_id, "answers": answers}
+        async with engine.begin() as conn:
+            rid = await conn.scalar(_INSERT_ONE, row)
+            if settings.ROLLUPS_ENABLED:
+                await apply_rollups(conn, [row])
+        live_results.publish(survey_id, answers, rid)
         return rid
+
+
+async def iter_responses(
+    survey_id: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    page_size: int = 5000,
+) -> AsyncIterator[Tuple[int, datetime, dict]]:
+    """
+    Yield (id, created_at, answers) for a survey in id order.
+    - keyset pagination on (survey_id, id): each page is "id > last seen", never OFFSET
+    - every page uses its own short-lived session, so no connection or snapshot is
+      held while the consumer (e.g. a slow HTTP client) catches up
+    - 'since' is inclusive, 'until' exclusive (created_at)
+    - with an archive (RESPONSE_ARCHIVE_DIR) archived rows come first: every archived
+      partition is older than the attached ones
+    """
+    if settings.RESPONSE_ARCHIVE_DIR:
+        async for _, rid, created_at, answers in iter_archived(survey_id, since, until):
+            yield rid, created_at, answers
+
+    stmt = (
+        select(SurveyResponse.id, SurveyResponse.created_at, SurveyResponse.answers)
+        .where(SurveyResponse.survey_id == survey_id)
+        .order_by(SurveyResponse.id)
+        .limit(page_size)
+    )
+    if since is not None:
+        stmt = stmt.where(SurveyResponse.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(SurveyResponse.created_at < until)
+
+    last_id = 0
+    while True:
+        async with engine.connect() as conn:
+            result = await conn.execute(stmt.where(SurveyResponse.id > last_id))
+            rows = result.all()
+        for row in rows:
+            yield row.id, row.created_at, row.answers
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1].id
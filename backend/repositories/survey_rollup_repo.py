@@ -0,0 +1,253 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import bindparam, delete, func, select, text, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from backend.config import settings
+from backend.db import SessionLocal, engine
+from backend.models_db import ResponseArchiveSegment, SurveyAnswerRollup, SurveyResponse
+from backend.repositories.response_archive import iter_archived
+from backend.repositories.response_partitions import hold_off_maintenance
+
+# Repository for per-question aggregates ("rollups") of survey answers.
+# Rollups are bumped in the same transaction as the response insert, so a summary
+# is a read of O(questions x buckets) rows no matter how many responses exist.
+
+# (survey_id, question_id, kind, value) -> [count, total]
+RollupKey = Tuple[str, str, str, str]
+Deltas = Dict[RollupKey, list]
+# Rollups are written inside the caller's transaction: a Core connection on the
+# ingestion paths, a session for rebuilds.
+Executor = Union[AsyncConnection, AsyncSession]
+
+# Choice ids generated by the LLM/mock look like "c1", "c2", ...
+_CHOICE_ID = re.compile(r"^c\d+$")
+
+_VALUE_MAX = 128  # matches SurveyAnswerRollup.value
+
+
+def _bump(deltas: Deltas, key: RollupKey, total: float = 0.0) -> None:
+    d = deltas.get(key)
+    if d is None:
+        deltas[key] = [1, total]
+    else:
+        d[0] += 1
+        d[1] += total
+
+
+def accumulate_answers(deltas: Deltas, survey_id: str, answers: Dict[str, Any]) -> Deltas:
+    """
+    Fold one response into 'deltas'.
+    The answer value decides the bucket: numbers -> rating, lists -> multi choice,
+    choice-id strings ("c3") -> single choice, any other non-empty string -> open text.
+    """
+    _bump(deltas, (survey_id, "", "responses", ""))
+    for qid, value in answers.items():
+        qid = str(qid)[:_VALUE_MAX]
+        if value is None or value == "" or value == []:
+            continue
+        _bump(deltas, (survey_id, qid, "answered", ""))
+        if isinstance(value, bool):
+            _bump(deltas, (survey_id, qid, "choice", str(value).lower()))
+        elif isinstance(value, (int, float)):
+            _bump(deltas, (survey_id, qid, "rating", str(value)[:_VALUE_MAX]))
+            _bump(deltas, (survey_id, qid, "rating_total", ""), float(value))
+        elif isinstance(value, list):
+            for choice in value:
+                _bump(deltas, (survey_id, qid, "choice", str(choice)[:_VALUE_MAX]))
+        elif isinstance(value, str):
+            if _CHOICE_ID.match(value):
+                _bump(deltas, (survey_id, qid, "choice", value))
+            else:
+                _bump(deltas, (survey_id, qid, "text", ""))
+    return deltas
+
+
+# INSERT ... ON CONFLICT DO UPDATE: add the delta to an existing bucket or create it.
+_insert_rollup = pg_insert(SurveyAnswerRollup)
+_UPSERT = _insert_rollup.on_conflict_do_update(
+    index_elements=["survey_id", "question_id", "kind", "value"],
+    set_={
+        "count": SurveyAnswerRollup.count + _insert_rollup.excluded.count,
+        "total": SurveyAnswerRollup.total + _insert_rollup.excluded.total,
+    },
+)
+
+
+def _lock_order(item: Tuple[RollupKey, list]) -> Tuple[bool, RollupKey]:
+    # The per-survey "responses" counter is bumped by every response of the survey, so it
+    # is locked last: it stays locked only for the tail of the statement plus the commit.
+    key = item[0]
+    return key[2] == "responses", key
+
+
+async def apply_deltas(session: Executor, deltas: Deltas) -> None:
+    """Add 'deltas' to the stored rollups (caller owns the transaction)."""
+    if not deltas:
+        return
+    # One fixed order for all writers, so concurrent upserts never deadlock.
+    params = [
+        {"survey_id": k[0], "question_id": k[1], "kind": k[2], "value": k[3], "count": c, "total": t}
+        for k, (c, t) in sorted(deltas.items(), key=_lock_order)
+    ]
+    await session.execute(_UPSERT, params)
+
+
+# Ingestion vs. rebuild_rollups(), per survey: every insert transaction holds a shared
+# advisory lock on each survey it writes (inserts never wait for each other), a rebuild
+# the exclusive one for the survey it recomputes. Inserts into other surveys go on.
+_LOCK_SURVEYS_SHARED = text(
+    "SELECT count(pg_advisory_xact_lock_shared(hashtext(s))) FROM unnest(CAST(:survey_ids AS text[])) AS s"
+)
+_LOCK_SURVEY = text("SELECT pg_advisory_xact_lock(hashtext(:survey_id))")
+
+
+async def apply_rollups(session: Executor, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Aggregate freshly inserted {"survey_id", "answers"} rows and apply them in one statement,
+    so a group commit bumps each bucket (including the hot "responses" counter) once.
+    Taking the shared survey locks first means a concurrent rebuild either already counted
+    these rows or finishes before they are added.
+    """
+    deltas: Deltas = {}
+    for row in rows:
+        accumulate_answers(deltas, row["survey_id"], row["answers"])
+    if not deltas:
+        return
+    await session.execute(_LOCK_SURVEYS_SHARED, {"survey_ids": sorted({k[0] for k in deltas})})
+    await apply_deltas(session, deltas)
+
+
+# (question_id, kind, value, count, total)
+RollupRow = Tuple[str, str, str, int, float]
+
+
+_SELECT_ROLLUP_ROWS = select(
+    SurveyAnswerRollup.question_id,
+    SurveyAnswerRollup.kind,
+    SurveyAnswerRollup.value,
+    SurveyAnswerRollup.count,
+    SurveyAnswerRollup.total,
+).where(SurveyAnswerRollup.survey_id == bindparam("survey_id"))
+
+
+async def fetch_rollup_rows(survey_id: str) -> List[RollupRow]:
+    """All rollup buckets stored for a survey."""
+    async with engine.connect() as conn:
+        result = await conn.execute(_SELECT_ROLLUP_ROWS, {"survey_id": survey_id})
+        return [tuple(row) for row in result.all()]
+
+
+async def fetch_rollup_rows_as_of(survey_id: str) -> Tuple[List[RollupRow], int]:
+    """
+    All rollup buckets of a survey plus the highest response id they include: both are
+    read from one REPEATABLE READ snapshot (the id is one probe of (survey_id, id)).
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+        async with conn.begin():
+            max_id = await conn.scalar(
+                select(func.coalesce(func.max(SurveyResponse.id), 0)).where(SurveyResponse.survey_id == survey_id)
+            )
+            result = await conn.execute(_SELECT_ROLLUP_ROWS, {"survey_id": survey_id})
+            return [tuple(row) for row in result.all()], max_id
+
+
+def summarize_rollups(survey_id: str, rows: Iterable[RollupRow]) -> Dict[str, Any]:
+    """Turn rollup buckets into the per-question summary (shape of models.SurveySummary)."""
+    responses = 0
+    questions: Dict[str, Dict[str, Any]] = {}
+    for qid, kind, value, count, total in rows:
+        if kind == "responses":
+            responses = count
+            continue
+        q = questions.setdefault(qid, {"answered": 0, "choices": {}, "rating": None, "open_text": 0})
+        if kind == "answered":
+            q["answered"] = count
+        elif kind == "choice":
+            q["choices"][value] = count
+        elif kind == "text":
+            q["open_text"] = count
+        elif kind in ("rating", "rating_total"):
+            rating = q["rating"] or {"count": 0, "sum": 0.0, "mean": None, "histogram": {}}
+            if kind == "rating":
+                rating["histogram"][value] = count
+            else:
+                rating["count"] = count
+                rating["sum"] = total
+                rating["mean"] = total / count if count else None
+            q["rating"] = rating
+    return {"survey_id": survey_id, "responses": responses, "questions": questions}
+
+
+async def fetch_summary(survey_id: str) -> Dict[str, Any]:
+    """
+    Build the per-question summary for a survey from its rollup rows.
+    Shape matches models.SurveySummary.
+    """
+    return summarize_rollups(survey_id, await fetch_rollup_rows(survey_id))
+
+
+async def fetch_question_ids(survey_id: str) -> List[str]:
+    """Question ids that have at least one answer for the survey (from the rollups)."""
+    async with engine.connect() as conn:
+        result = await conn.scalars(
+            select(SurveyAnswerRollup.question_id).where(
+                SurveyAnswerRollup.survey_id == survey_id,
+                SurveyAnswerRollup.kind == "answered",
+            )
+        )
+        return list(result)
+
+
+async def _rollup_survey_ids() -> List[str]:
+    # Every survey with raw rows, archived rows or (possibly stale) rollups.
+    stmt = union(
+        select(SurveyResponse.survey_id).distinct(),
+        select(ResponseArchiveSegment.survey_id),
+        select(SurveyAnswerRollup.survey_id).distinct(),
+    )
+    async with engine.connect() as conn:
+        return sorted(await conn.scalars(stmt))
+
+
+async def rebuild_rollups(survey_id: Optional[str] = None, batch_size: int = 5000) -> int:
+    """
+    Recompute rollups from raw survey_response rows (one survey, or all of them),
+    archived partitions included.
+    Each survey is rebuilt in its own transaction holding that survey's exclusive
+    advisory lock, so its concurrent inserts wait (instead of being double-counted or
+    missed) while every other survey keeps ingesting.
+    Returns the number of responses scanned.
+    """
+    survey_ids = [survey_id] if survey_id is not None else await _rollup_survey_ids()
+    scanned = 0
+    for sid in survey_ids:
+        scanned += await _rebuild_survey(sid, batch_size)
+    return scanned
+
+
+async def _rebuild_survey(survey_id: str, batch_size: int) -> int:
+    scanned = 0
+    deltas: Deltas = {}
+    async with SessionLocal() as session:
+        async with session.begin():
+            # Maintenance first (an archive pass must not move rows between the table
+            # scan and the archive read), then the survey; always in this order.
+            await hold_off_maintenance(session)
+            await session.execute(_LOCK_SURVEY, {"survey_id": survey_id})
+
+            stmt = select(SurveyResponse.answers).where(SurveyResponse.survey_id == survey_id)
+            # Server-side cursor: memory is bounded by the rollups, not by the row count.
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for answers in result.scalars():
+                accumulate_answers(deltas, survey_id, answers or {})
+                scanned += 1
+            if settings.RESPONSE_ARCHIVE_DIR:
+                async for _, _, _, answers in iter_archived(survey_id):
+                    accumulate_answers(deltas, survey_id, answers or {})
+                    scanned += 1
+
+            await session.execute(delete(SurveyAnswerRollup).where(SurveyAnswerRollup.survey_id == survey_id))
+            await apply_deltas(session, deltas)
+    return scanned
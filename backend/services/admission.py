@@ -0,0 +1,164 @@
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Tuple
+
+from backend.metrics import GENERATE_SHED_TOTAL, stage
+
+# Admission control for cache-miss generation.
+# Only requests that would start a new generation pass through here; cache hits,
+# coalesced waiters and response ingestion never do. At most 'max_in_flight'
+# generations run at once; the rest wait in per-client FIFO queues that are served
+# round-robin, so one noisy client can't starve the others. Waiting is bounded by
+# queue size and time; past either limit the request is shed with 503 + Retry-After.
+# Background work (pre-generation) waits in a separate FIFO with no timeout and only
+# gets a slot while no interactive request is queued and 'reserve' slots stay free.
+
+
+class GenerationOverloaded(Exception):
+    """Raised when a cache-miss generation can't be admitted (mapped to 503 by the API)."""
+    def __init__(self, detail: str, retry_after_s: int):
+        super().__init__(detail)
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight: int, queue_size: int, per_client_queue: int, timeout_s: float, retry_after_s: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.queue_size = queue_size
+        self.per_client_queue = per_client_queue
+        self.timeout_s = timeout_s
+        self.retry_after_s = retry_after_s
+        self.in_flight = 0
+        self.queued = 0
+        self._queues: "OrderedDict[str, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._background: "Deque[Tuple[int, asyncio.Future[None]]]" = deque()  # (reserve, waiter)
+        self.admitted = 0
+        self.waited = 0
+        self.background_admitted = 0
+        self.background_waited = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "client_queue_full": 0, "timeout": 0}
+
+    def _reject(self, reason: str, detail: str) -> GenerationOverloaded:
+        self.shed[reason] += 1
+        GENERATE_SHED_TOTAL.inc(1, reason)
+        return GenerationOverloaded(detail, self.retry_after_s)
+
+    async def acquire(self, client: str) -> None:
+        if self.in_flight < self.max_in_flight and self.queued == 0:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if self.queued >= self.queue_size:
+            raise self._reject("queue_full", "generation queue is full")
+        queue = self._queues.setdefault(client, deque())
+        if len(queue) >= self.per_client_queue:
+            raise self._reject("client_queue_full", "too many queued generations for this client")
+
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        queue.append(fut)
+        self.queued += 1
+        self.waited += 1
+        try:
+            with stage("admission_wait"):
+                await asyncio.wait_for(fut, self.timeout_s)
+        except asyncio.TimeoutError:
+            self._forget(client, fut)
+            raise self._reject("timeout", "timed out waiting for a generation slot")
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as the caller went away
+            else:
+                self._forget(client, fut)
+            raise
+        self.admitted += 1  # release() handed its slot to us; in_flight is unchanged
+
+    def _forget(self, client: str, fut: "asyncio.Future[None]") -> None:
+        queue = self._queues.get(client)
+        if queue is not None and fut in queue:
+            queue.remove(fut)
+            self.queued -= 1
+            if not queue:
+                del self._queues[client]
+
+    def release(self) -> None:
+        # Hand the slot to the next waiter, rotating through clients.
+        while self._queues:
+            client, queue = next(iter(self._queues.items()))
+            fut = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+        self._wake_background()
+
+    def _background_fits(self, reserve: int) -> bool:
+        reserve = min(reserve, self.max_in_flight - 1)
+        return self.queued == 0 and self.in_flight < self.max_in_flight - reserve
+
+    def _wake_background(self) -> None:
+        while self._background:
+            reserve, fut = self._background[0]
+            if fut.done():
+                self._background.popleft()
+                continue
+            if not self._background_fits(reserve):
+                return
+            self._background.popleft()
+            self.in_flight += 1
+            fut.set_result(None)
+
+    async def acquire_background(self, reserve: int) -> None:
+        """Wait (no timeout) for a slot while interactive traffic keeps 'reserve' free."""
+        if not self._background and self._background_fits(reserve):
+            self.in_flight += 1
+            self.background_admitted += 1
+            return
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        entry = (reserve, fut)
+        self._background.append(entry)
+        self.background_waited += 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was handed over just as the caller went away
+            elif entry in self._background:
+                self._background.remove(entry)
+            raise
+        self.background_admitted += 1
+
+    @asynccontextmanager
+    async def background_slot(self, reserve: int) -> AsyncIterator[None]:
+        await self.acquire_background(reserve)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot(self, client: str) -> AsyncIterator[None]:
+        await self.acquire(client)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queued_clients": len(self._queues),
+            "admitted": self.admitted,
+            "waited": self.waited,
+            "background_queued": len(self._background),
+            "background_admitted": self.background_admitted,
+            "background_waited": self.background_waited,
+            "shed": dict(self.shed),
+        }
@@ -0,0 +1,147 @@
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.cache import TTLLRUCache
+from backend.config import settings
+from backend.repositories.survey_registry_repo import fetch_survey
+
+# Answer validation for record_response and bulk import.
+# Each registered survey is compiled once into a table of per-question checks
+# (allowed choice ids as frozensets, rating bounds, required ids); checking an answer
+# map is then a dict lookup and a type/membership test per answer.
+# Compiled validators are cached by survey ETag, so a re-registered survey gets a new
+# validator and identical surveys share one.
+
+Check = Callable[[Any], Optional[str]]  # returns an error message or None
+
+
+class UnknownSurvey(Exception):
+    """No survey is registered under this id (RESPONSE_VALIDATION=strict)."""
+
+
+class InvalidAnswers(Exception):
+    def __init__(self, errors: List[Dict[str, str]]):
+        super().__init__(f"{len(errors)} invalid answer(s)")
+        self.errors = errors
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _single_choice(allowed: frozenset) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, str) and value in allowed:
+            return None
+        return "expected one of " + ", ".join(sorted(allowed))
+    return check
+
+
+def _multi_choice(allowed: frozenset) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if (
+            isinstance(value, list)
+            and all(isinstance(v, str) and v in allowed for v in value)
+            and len(set(value)) == len(value)
+        ):
+            return None
+        return "expected a list of distinct choices from " + ", ".join(sorted(allowed))
+    return check
+
+
+def _rating(lo: int, hi: int) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if type(value) in (int, float) and lo <= value <= hi and value == int(value):
+            return None
+        return f"expected a whole number from {lo} to {hi}"
+    return check
+
+
+def _open_text(max_chars: int) -> Check:
+    def check(value: Any) -> Optional[str]:
+        if isinstance(value, str) and len(value) <= max_chars:
+            return None
+        return f"expected text of at most {max_chars} characters"
+    return check
+
+
+class AnswerValidator:
+    __slots__ = ("checks", "required")
+
+    def __init__(self, checks: Dict[str, Check], required: tuple):
+        self.checks = checks
+        self.required = required
+
+    def errors(self, answers: Dict[str, Any]) -> List[Dict[str, str]]:
+        errors: List[Dict[str, str]] = []
+        checks = self.checks
+        for qid, value in answers.items():
+            check = checks.get(qid)
+            if check is None:
+                errors.append({"question_id": qid, "detail": "unknown question"})
+            elif not _is_empty(value):
+                msg = check(value)
+                if msg is not None:
+                    errors.append({"question_id": qid, "detail": msg})
+        for qid in self.required:
+            if _is_empty(answers.get(qid)):
+                errors.append({"question_id": qid, "detail": "answer required"})
+        return errors
+
+
+def compile_validator(survey: Dict[str, Any]) -> AnswerValidator:
+    """Build the checks for a stored survey ({title, description, questions})."""
+    checks: Dict[str, Check] = {}
+    required = []
+    for q in survey.get("questions") or []:
+        qtype = q.get("type")
+        allowed = frozenset(c["id"] for c in q.get("choices") or [])
+        if qtype == "multiple_choice_single":
+            check = _single_choice(allowed)
+        elif qtype == "multiple_choice_multi":
+            check = _multi_choice(allowed)
+        elif qtype == "rating":
+            lo = q.get("scale_min")
+            hi = q.get("scale_max")
+            check = _rating(1 if lo is None else lo, 5 if hi is None else hi)
+        else:
+            check = _open_text(settings.OPEN_TEXT_MAX_CHARS)
+        checks[q["id"]] = check
+        if q.get("required", True):
+            required.append(q["id"])
+    return AnswerValidator(checks, tuple(required))
+
+
+validator_cache = TTLLRUCache(max_entries=settings.ANSWER_VALIDATOR_CACHE_SIZE, ttl_s=3600.0)
+
+
+async def get_validator(survey_id: str) -> Optional[AnswerValidator]:
+    """
+    The validator for 'survey_id' according to RESPONSE_VALIDATION:
+    - None when validation is off, or the survey is unknown in "known" mode
+    - raises UnknownSurvey for an unknown survey in "strict" mode
+    """
+    mode = settings.RESPONSE_VALIDATION
+    if mode == "off":
+        return None
+    entry = await fetch_survey(survey_id)
+    if entry is None:
+        if mode == "strict":
+            raise UnknownSurvey(survey_id)
+        return None
+    etag, body = entry
+    validator = validator_cache.get(etag)
+    if validator is None:
+        validator = compile_validator(json.loads(body))
+        validator_cache.set(etag, validator)
+    return validator
+
+
+async def validate_answers(survey_id: str, answers: Dict[str, Any]) -> None:
+    """Raise UnknownSurvey / InvalidAnswers unless 'answers' fit the registered survey."""
+    validator = await get_validator(survey_id)
+    if validator is None:
+        return
+    errors = validator.errors(answers)
+    if errors:
+        raise InvalidAnswers(errors)
@@ -0,0 +1,40 @@
+from typing import Dict, List, Tuple
+
+from backend.models import GenerateSurveyRequest
+
+
+class MissCounter:
+    """
+    Bounded counter of briefs left uncached by a miss (shed, or the save failed), used
+    to pick pre-generation candidates.
+    - record() counts a miss under its cache key (first request seen is kept as the sample)
+    - when full, the least-missed half is dropped, so only recurring briefs survive
+    - top() returns the most-missed keys and resets the counter (each interval starts fresh)
+    """
+    def __init__(self, max_keys: int):
+        self.max_keys = max(2, max_keys)
+        self._counts: Dict[str, int] = {}
+        self._samples: Dict[str, GenerateSurveyRequest] = {}
+        self.recorded = 0
+
+    def record(self, key: str, req: GenerateSurveyRequest) -> None:
+        self.recorded += 1
+        if key in self._counts:
+            self._counts[key] += 1
+            return
+        if len(self._counts) >= self.max_keys:
+            keep = sorted(self._counts, key=self._counts.__getitem__, reverse=True)[: self.max_keys // 2]
+            self._counts = {k: self._counts[k] for k in keep}
+            self._samples = {k: self._samples[k] for k in keep}
+        self._counts[key] = 1
+        self._samples[key] = req
+
+    def top(self, limit: int, min_count: int) -> List[Tuple[str, GenerateSurveyRequest, int]]:
+        ranked = sorted(self._counts.items(), key=lambda kv: kv[1], reverse=True)
+        out = [(k, self._samples[k], c) for k, c in ranked[:limit] if c >= min_count]
+        self._counts.clear()
+        self._samples.clear()
+        return out
+
+    def stats(self) -> Dict[str, int]:
+        return {"tracked_keys": len(self._counts), "recorded": self.recorded}
@@ -0,0 +1,189 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from backend.config import settings
+from backend.models import GenerateSurveyRequest
+from backend.repositories.survey_cache_repo import make_key
+from backend.services.survey_service import missed_briefs, warm_survey
+
+logger = logging.getLogger(__name__)
+
+# Background pre-generation ("cache warming").
+# Jobs come from the admin API (known seasonal/onboarding briefs) and from the
+# most-missed cache keys; a small worker pool generates them ahead of demand so the
+# first interactive request is a cache hit instead of a multi-second LLM call.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Lower runs first. Admin submissions default ahead of miss-driven refills.
+PRIORITY_ADMIN = 10
+PRIORITY_MISSED = 100
+
+
+@dataclass
+class PregenJob:
+    id: int
+    key: str
+    request: GenerateSurveyRequest
+    priority: int
+    origin: str  # "admin" | "missed"
+    state: str = QUEUED
+    source: Optional[str] = None  # "cache" | "llm" | "mock" once done
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "key": self.key,
+            "description": self.request.description,
+            "num_questions": self.request.num_questions,
+            "language": self.request.language,
+            "priority": self.priority,
+            "origin": self.origin,
+            "state": self.state,
+            "source": self.source,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PregenQueueFull(Exception):
+    """Raised when the pre-generation queue has no room for another job."""
+
+
+class PregenPool:
+    """
+    Priority queue + asyncio worker pool.
+    - submit() de-duplicates by cache key while a job for that key is queued/running
+    - 'workers' bounds pre-generation concurrency; on top of that a worker only starts a
+      generation through a background admission slot, granted while no interactive
+      generation is queued and at least 'reserved_slots' slots stay free, so warming
+      never competes with interactive /generate traffic for upstream capacity
+    - finished jobs are kept (newest 'jobs_kept') so their state can be queried
+    - optionally refills itself from the most-missed keys every 'missed_interval_s'
+    """
+    def __init__(self, workers: int, queue_size: int, reserved_slots: int, jobs_kept: int, missed_interval_s: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.reserved_slots = reserved_slots
+        self.jobs_kept = jobs_kept
+        self.missed_interval_s = missed_interval_s
+        self._queue: Optional["asyncio.PriorityQueue[Tuple[int, int, PregenJob]]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._jobs: "OrderedDict[int, PregenJob]" = OrderedDict()
+        self._active: Dict[str, PregenJob] = {}  # key -> queued/running job
+        self._ids = itertools.count(1)
+        self.submitted = 0
+        self.finished = {DONE: 0, FAILED: 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self.running or self.workers <= 0:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.missed_interval_s > 0:
+            self._tasks.append(asyncio.create_task(self._follow_misses()))
+
+    async def stop(self) -> None:
+        # Queued jobs are dropped; they are only warm-ups.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, req: GenerateSurveyRequest, priority: int = PRIORITY_ADMIN, origin: str = "admin") -> PregenJob:
+        if not self.running:
+            raise PregenQueueFull("pre-generation is disabled (PREGEN_WORKERS=0)")
+        key = make_key(req.description, req.num_questions, req.language)
+        existing = self._active.get(key)
+        if existing is not None:
+            return existing
+        job = PregenJob(id=next(self._ids), key=key, request=req, priority=priority, origin=origin)
+        try:
+            self._queue.put_nowait((priority, job.id, job))
+        except asyncio.QueueFull:
+            raise PregenQueueFull("pre-generation queue is full")
+        self._active[key] = job
+        self._remember(job)
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: int) -> Optional[PregenJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self, state: Optional[str] = None, limit: int = 100) -> List[PregenJob]:
+        jobs = [j for j in reversed(self._jobs.values()) if state is None or j.state == state]
+        return jobs[:limit]
+
+    def _remember(self, job: PregenJob) -> None:
+        self._jobs[job.id] = job
+        # Trim the oldest finished jobs; queued/running ones are always kept.
+        excess = len(self._jobs) - self.jobs_kept
+        if excess > 0:
+            for old_id in [i for i, j in self._jobs.items() if j.state in (DONE, FAILED)][:excess]:
+                del self._jobs[old_id]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            job.state = RUNNING
+            job.started_at = time.time()
+            try:
+                job.source = await warm_survey(job.request, self.reserved_slots)
+                job.state = DONE
+            except asyncio.CancelledError:
+                job.state, job.error = FAILED, "cancelled"
+                raise
+            except Exception as e:
+                job.state, job.error = FAILED, f"{type(e).__name__}: {e}"
+                logger.warning("pre-generation job %d failed: %s", job.id, job.error)
+            finally:
+                job.finished_at = time.time()
+                self.finished[job.state] += 1
+                self._active.pop(job.key, None)
+                self._queue.task_done()
+
+    async def _follow_misses(self) -> None:
+        while True:
+            await asyncio.sleep(self.missed_interval_s)
+            for _key, req, _count in missed_briefs.top(settings.PREGEN_MISSED_TOP, settings.PREGEN_MISSED_MIN_COUNT):
+                try:
+                    self.submit(req, priority=PRIORITY_MISSED, origin="missed")
+                except PregenQueueFull:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers if self.running else 0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": sum(1 for j in self._active.values() if j.state == RUNNING),
+            "submitted": self.submitted,
+            "done": self.finished[DONE],
+            "failed": self.finished[FAILED],
+            "missed_briefs": missed_briefs.stats(),
+        }
+
+
+pregen_pool = PregenPool(
+    workers=settings.PREGEN_WORKERS,
+    queue_size=settings.PREGEN_QUEUE_SIZE,
+    reserved_slots=settings.PREGEN_RESERVED_SLOTS,
+    jobs_kept=settings.PREGEN_JOBS_KEPT,
+    missed_interval_s=settings.PREGEN_MISSED_INTERVAL_S,
+)
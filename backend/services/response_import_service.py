@@ -0,0 +1,174 @@
+import codecs
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from backend.config import settings
+from backend.jsonstream import JSONArrayStreamParser
+from backend.models import SaveResponsesRequest
+from backend.repositories.response_batcher import InvalidResponseRow, check_row
+from backend.repositories.survey_response_repo import SURVEY_ID_MAX_LEN, insert_responses
+from backend.services.answer_validation import get_validator
+
+# Bulk import of SaveResponsesRequest records for one survey.
+# The body is consumed chunk by chunk (never fully buffered) and rows are written
+# in batches of BULK_IMPORT_BATCH_SIZE via a multi-row INSERT ... RETURNING.
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+logger = logging.getLogger(__name__)
+
+# (index, decoded record) or (index, parse error message)
+_Record = Tuple[int, Any, Optional[str]]
+
+
+class MalformedImport(Exception):
+    """The body as a whole can't be read as records (mapped to 400 by the API)."""
+
+
+class _NDJSONReader:
+    """Splits a byte stream into lines and decodes each one; blank lines are skipped."""
+    def __init__(self):
+        self._tail = b""
+        self._index = 0
+
+    def feed(self, chunk: bytes) -> Iterator[_Record]:
+        lines = (self._tail + chunk).split(b"\n")
+        self._tail = lines.pop()
+        return self._decode(lines)
+
+    def close(self) -> Iterator[_Record]:
+        line, self._tail = self._tail, b""
+        return self._decode([line])
+
+    def _decode(self, lines: List[bytes]) -> Iterator[_Record]:
+        for line in lines:
+            if not line.strip():
+                continue
+            index = self._index
+            self._index += 1
+            try:
+                yield index, json.loads(line), None
+            except ValueError as e:
+                yield index, None, f"invalid JSON: {e}"
+
+
+class _JSONArrayReader:
+    """
+    Pulls the elements of a top-level JSON array out of a byte stream.
+    Every element gets an index, scalars included (they then fail validation);
+    a body that isn't an array, or whose array is never closed, raises MalformedImport.
+    """
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._parser = JSONArrayStreamParser(array_depth=1, raw=True, scalars=True)
+        self._index = 0
+        self._started = False
+
+    def feed(self, chunk: bytes) -> Iterator[_Record]:
+        return self._decode(self._decoder.decode(chunk))
+
+    def close(self) -> Iterator[_Record]:
+        records = list(self._decode(self._decoder.decode(b"", final=True)))
+        if not self._parser.closed:
+            raise MalformedImport("body is not a complete JSON array" if self._started else "empty body")
+        return iter(records)
+
+    def _decode(self, text: str) -> Iterator[_Record]:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return iter(())
+            if text[0] != "[":
+                raise MalformedImport("body must be a JSON array of records (or NDJSON)")
+            self._started = True
+        return self._elements(text)
+
+    def _elements(self, text: str) -> Iterator[_Record]:
+        for item in self._parser.feed(text):
+            index = self._index
+            self._index += 1
+            try:
+                yield index, json.loads(item), None
+            except ValueError as e:
+                yield index, None, f"invalid JSON: {e}"
+
+
+async def import_responses(survey_id: str, body: AsyncIterator[bytes], content_type: str) -> Dict[str, Any]:
+    """
+    Import records from a JSON array or NDJSON body.
+    - each record must validate as SaveResponsesRequest and its answers must fit the
+      registered survey (answer_validation.py); invalid ones are reported, not inserted
+    - raises UnknownSurvey up front when the survey isn't registered (strict mode)
+    - raises MalformedImport when a JSON body isn't one closed array; batches already
+      written by then stay written (the message says how many records that was)
+    - returns per-record response ids (aligned with input order) plus the error list
+    """
+    validator = await get_validator(survey_id)
+    is_ndjson = content_type.split(";")[0].strip().lower() in NDJSON_TYPES
+    reader = _NDJSONReader() if is_ndjson else _JSONArrayReader()
+    batch_size = settings.BULK_IMPORT_BATCH_SIZE
+
+    response_ids: List[Optional[int]] = []
+    errors: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, dict]] = []  # (index, answers)
+
+    async def flush() -> None:
+        batch = pending[:batch_size]
+        del pending[:batch_size]
+        rows = [{"survey_id": survey_id, "answers": answers} for _, answers in batch]
+        try:
+            ids = await insert_responses(rows)
+        except Exception:
+            # The DB error is logged, not echoed to the client.
+            logger.exception("bulk import into %s: insert of %d records failed", survey_id, len(batch))
+            errors.extend({"index": i, "detail": "insert failed"} for i, _ in batch)
+        else:
+            for (i, _), rid in zip(batch, ids):
+                response_ids[i] = rid
+
+    def accept(records: Iterator[_Record]) -> None:
+        for index, obj, error in records:
+            response_ids.append(None)
+            if error is None:
+                try:
+                    answers = SaveResponsesRequest.model_validate(obj).answers
+                except ValidationError as e:
+                    error = e.errors(include_url=False)[0]["msg"]
+                else:
+                    problems = validator.errors(answers) if validator is not None else None
+                    if problems:
+                        error = "; ".join(f"{p['question_id']}: {p['detail']}" for p in problems)
+                    else:
+                        try:
+                            # One row Postgres rejects would fail its whole INSERT batch.
+                            check_row(survey_id, answers, SURVEY_ID_MAX_LEN)
+                        except InvalidResponseRow as e:
+                            error = str(e)
+                        else:
+                            pending.append((index, answers))
+                            continue
+            errors.append({"index": index, "detail": error})
+
+    async for chunk in body:
+        accept(reader.feed(chunk))
+        while len(pending) >= batch_size:
+            await flush()
+    try:
+        accept(reader.close())
+    except MalformedImport as e:
+        inserted = sum(1 for rid in response_ids if rid is not None)
+        if inserted:
+            raise MalformedImport(f"{e}; {inserted} records before the error were imported") from None
+        raise
+    while pending:
+        await flush()
+
+    errors.sort(key=lambda e: e["index"])
+    inserted = sum(1 for rid in response_ids if rid is not None)
+    return {
+        "inserted": inserted,
+        "failed": len(response_ids) - inserted,
+        "response_ids": response_ids,
+        "errors": errors,
+    }
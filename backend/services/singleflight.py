@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Per-key request coalescing ("single flight").
+    - The first caller for a key starts the work in its own task; concurrent callers
+      for the same key await that task instead of starting their own.
+    - A caller that is cancelled only stops waiting; the shared work keeps running
+      for the others and is cancelled only once nobody is waiting for it anymore.
+    - Exceptions propagate to every waiter of that flight.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = _Call(task)
+            self._calls[key] = call
+            task.add_done_callback(lambda _t, k=key, c=call: self._forget(k, c))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield(): cancelling this waiter must not cancel the shared task.
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                # Last one out: nobody wants the result anymore. Unregister first so a
+                # caller arriving before the task unwinds starts fresh work instead of
+                # joining (and inheriting the CancelledError of) this flight.
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def active(self, key: Hashable) -> bool:
+        """True while a flight for 'key' is running (callers joining it won't start new work)."""
+        return key in self._calls
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        # Only drop the entry if it still belongs to this flight.
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Retrieve the exception so asyncio doesn't warn when all waiters left.
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -1,68 +1,100 @@
+import copy
+import json
+import logging
 import re
+from dataclasses import dataclass
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 from pydantic import ValidationError
-from backend.models import GenerateSurveyRequest, Survey
-from backend.adapters.openai_adapter import OpenAIAdapter
+from backend.models import GenerateSurveyRequest, Survey, Question
+from backend.jsonstream import JSONArrayStreamParser
+from backend.adapters.mock_adapter import generate_mock_survey
+from backend.adapters.resilience import UpstreamError
 from backend.config import settings
-from backend.repositories.survey_cache_repo import fetch_cached, save_cache
+from backend.repositories.survey_cache_repo import (
+    fetch_cached_raw, fetch_cached_many, fetch_cached_superset, save_cache, make_key, dump_survey_json,
+)
+from backend.repositories.survey_registry_repo import fetch_survey, register_surveys
+from backend.services.singleflight import SingleFlight
+from backend.services.miss_counter import MissCounter
+from backend.metrics import SURVEY_SOURCE_TOTAL, stage
+from backend.services.admission import AdmissionController, GenerationOverloaded
+
+if TYPE_CHECKING:
+    from backend.adapters.openai_adapter import OpenAIAdapter
+
+
+logger = logging.getLogger(__name__)
 
 
 # -- Local mock generator (used for MOCK_LLM=1 or as fallback) -----------------
 # Deterministic output that keeps UX working when the LLM is unavailable
 # (e.g., missing/invalid API key, quota issues, timeouts).
 def _generate_mock_survey(description: str, num_questions: int = 8, language: str = "en") -> dict:
-    base_title = f"Survey: {description}"
-    qs = [
-        {
-            "id": "q1",
-            "type": "multiple_choice_single",
-            "text": "How satisfied are you overall?",
-            "required": True,
-            "choices": [
-                {"id": "c1", "label": "Very satisfied"},
-                {"id": "c2", "label": "Satisfied"},
-                {"id": "c3", "label": "Neutral"},
-                {"id": "c4", "label": "Dissatisfied"},
-                {"id": "c5", "label": "Very dissatisfied"},
-            ],
-        },
-        {"id": "q2", "type": "rating", "text": "Rate your overall experience", "scale_min": 1, "scale_max": 5},
-        {"id": "q3", "type": "open_text", "text": "What did we do well?", "placeholder": "Your answer..."},
-        {"id": "q4", "type": "open_text", "text": "What could we improve?", "placeholder": "Your answer..."},
-        {
-            "id": "q5",
-            "type": "multiple_choice_multi",
-            "text": "Which aspects mattered most?",
-            "choices": [
-                {"id": "c1", "label": "Price"},
-                {"id": "c2", "label": "Quality"},
-                {"id": "c3", "label": "Delivery"},
-                {"id": "c4", "label": "Customer support"},
-            ],
-        },
-    ]
-    # Respect requested length (min 3)
-    qs = qs[: max(3, min(num_questions, len(qs)))]
-    return {
-        "title": base_title,
-        "description": f'Auto-generated (mock) from brief: "{description}"',
-        "questions": qs,
-    }
+    # Local question-bank generator (adapters/mock_adapter.py): exactly num_questions, offline, <1 ms.
+    return generate_mock_survey(description, num_questions, language)
 
 
 # -- OpenAI adapter -------------------------------------------------------------
-# Adapter is created once; settings.* provide API key/model/timeout.
-adapter = OpenAIAdapter(
-    api_key=settings.OPENAI_API_KEY,
-    model=getattr(settings, "OPENAI_MODEL", "gpt-4o-mini"),
-    timeout_ms=getattr(settings, "OPENAI_TIMEOUT_MS", 12000),
+# Created once, on the first upstream call (or by the boot warm-up); settings.* provide
+# API key/model/timeout. Importing the OpenAI SDK and building its HTTP client is most of
+# a worker's import time, and MOCK_LLM or cache-hit-only workers never need either.
+# That ~1 s of blocking work runs in a worker thread, never on the event loop.
+_adapter: Optional["OpenAIAdapter"] = None
+_adapter_lock = asyncio.Lock()
+
+
+def _build_adapter() -> "OpenAIAdapter":
+    from backend.adapters.openai_adapter import OpenAIAdapter
+    return OpenAIAdapter(
+        api_key=settings.OPENAI_API_KEY,
+        model=getattr(settings, "OPENAI_MODEL", "gpt-4o-mini"),
+        timeout_ms=getattr(settings, "OPENAI_TIMEOUT_MS", 12000),
+    )
+
+
+async def get_adapter() -> "OpenAIAdapter":
+    global _adapter
+    if _adapter is None:
+        async with _adapter_lock:  # concurrent first calls share one build
+            if _adapter is None:
+                _adapter = await asyncio.to_thread(_build_adapter)
+    return _adapter
+
+
+def peek_adapter() -> Optional["OpenAIAdapter"]:
+    """The adapter if something has used it already (metrics, shutdown); never builds it."""
+    return _adapter
+
+
+# Coalesces concurrent cache misses for the same key into one upstream generation.
+survey_flight = SingleFlight()
+
+# Caps concurrent cache-miss generations; excess waits in fair per-client queues or is shed.
+generate_admission = AdmissionController(
+    max_in_flight=settings.GENERATE_MAX_IN_FLIGHT,
+    queue_size=settings.GENERATE_QUEUE_SIZE,
+    per_client_queue=settings.GENERATE_QUEUE_PER_CLIENT,
+    timeout_s=settings.GENERATE_QUEUE_TIMEOUT_MS / 1000.0,
+    retry_after_s=settings.GENERATE_RETRY_AFTER_S,
 )
 
+# Most-missed briefs feed the background pre-generation pool (services/pregen_service.py).
+missed_briefs = MissCounter(settings.PREGEN_MISSED_MAX_KEYS)
+
 
 def _make_safe_id(text: str) -> str:
     # Lowercase, replace spaces with underscores, strip unsafe chars; limit length.
     return re.sub(r"[^a-z0-9_]", "", text.lower().replace(" ", "_"))[:24] or "survey"
 
 
+def _survey_id(req: GenerateSurveyRequest) -> str:
+    # Registry id: readable slug plus a cache-key prefix, so briefs that share a slug (or the
+    # same brief at another length / language) never share an id or overwrite each other.
+    key = make_key(req.description, req.num_questions, req.language)
+    return f"srv_{_make_safe_id(req.description)}_{key[:12]}"
+
+
 def _fill_missing_ids(survey_dict: dict) -> dict:
     # Ensure 'id' exists for questions/choices to keep frontend stable.
     for i, q in enumerate(survey_dict.get("questions", []), start=1):
@@ -73,52 +105,291 @@ def _fill_missing_ids(survey_dict: dict) -> dict:
     return survey_dict
 
 
-async def generate_survey_service(req: GenerateSurveyRequest) -> Survey:
-    # 1) Try cache first (idempotent by description+num_questions+language)
-    cached = await fetch_cached(req.description, req.num_questions, req.language)
-    if cached:
-        survey = Survey.model_validate({
-            "id": f"srv_{_make_safe_id(req.description)}",
-            "title": cached.get("title"),
-            "description": cached.get("description"),
-            "questions": cached.get("questions"),
-        })
-        # Normalize rating defaults (pydantic allows None; enforce 1–5)
-        for q in survey.questions:
-            if q.type == "rating":
-                if q.scale_min is None:
-                    q.scale_min = 1
-                if q.scale_max is None:
-                    q.scale_max = 5
-        return survey
+def _slice_survey(survey_dict: dict, num_questions: int) -> dict:
+    """
+    Cut a cached survey down to 'num_questions' questions.
+    - picks round-robin across question types (in order of first appearance) so the
+      subset keeps the original's type variety
+    - keeps the original question order and renumbers ids q1..qN
+    """
+    questions = survey_dict.get("questions") or []
+    by_type: Dict[str, List[int]] = {}
+    for i, q in enumerate(questions):
+        by_type.setdefault(q.get("type"), []).append(i)
+
+    picked: List[int] = []
+    queues = [list(idx) for idx in by_type.values()]
+    while len(picked) < num_questions and any(queues):
+        for queue in queues:
+            if queue and len(picked) < num_questions:
+                picked.append(queue.pop(0))
+
+    sliced = []
+    for i in sorted(picked):
+        q = copy.deepcopy(questions[i])
+        q.pop("id", None)
+        sliced.append(q)
+    return _fill_missing_ids({
+        "title": survey_dict.get("title"),
+        "description": survey_dict.get("description"),
+        "questions": sliced,
+    })
+
+
+async def _lookup_cached(req: GenerateSurveyRequest) -> Optional[bytes]:
+    # Exact (and near-duplicate) hit first; otherwise slice a larger cached survey
+    # for the same brief and store the slice under this request's own key.
+    cached = await fetch_cached_raw(req.description, req.num_questions, req.language)
+    if cached is not None:
+        return cached
+    superset = await fetch_cached_superset(req.description, req.num_questions, req.language)
+    if not superset:
+        return None
+    sliced = _slice_survey(superset, req.num_questions)
+    sliced_bytes = dump_survey_json(sliced)
+    await save_cache(req.description, req.num_questions, req.language, sliced, sliced_bytes)
+    return sliced_bytes
+
+
+def _is_fallback_error(e: Exception) -> bool:
+    # Upstream errors we paper over with the local generator (quota, rate limit,
+    # timeout, outage). The adapter has already retried them per its policy.
+    return isinstance(e, UpstreamError)
+
+
+@dataclass
+class SurveyResult:
+    # Wire-ready generate response: serialized {"survey": {...}} and where it came from.
+    source: str   # "cache" | "llm" | "mock"
+    body: bytes
+
+
+async def _register(items: List[Tuple[str, bytes]]) -> None:
+    # Record what was served under each id (GET /api/surveys/{id}, answer validation).
+    # A repeat of the last registration is a bytes comparison; failures don't fail generation.
+    try:
+        with stage("register"):
+            await register_surveys(items)
+    except Exception:
+        logger.exception("survey registry write failed for %s", [survey_id for survey_id, _ in items])
+
+
+def _survey_object(survey_id: str, survey_bytes: bytes) -> bytes:
+    # survey_bytes is the stored {"title", "description", "questions"} object;
+    # splice in the per-request id instead of decoding and re-encoding it.
+    return b'{"id":' + json.dumps(survey_id).encode("utf-8") + b"," + survey_bytes.lstrip()[1:]
+
+
+def _response_body(survey_id: str, survey_bytes: bytes) -> bytes:
+    return b'{"survey":' + _survey_object(survey_id, survey_bytes) + b"}"
+
+
+async def generate_survey_service(req: GenerateSurveyRequest, client: str = "anonymous") -> SurveyResult:
+    survey_id = _survey_id(req)
+
+    # 1) Try cache first (idempotent by description+num_questions+language).
+    #    Cached surveys are stored in their final validated form, so a hit is
+    #    returned as bytes without another Pydantic round trip.
+    with stage("cache_lookup"):
+        cached = await _lookup_cached(req)
+    if cached is not None:
+        SURVEY_SOURCE_TOTAL.inc(1, "cache")
+        await _register([(survey_id, cached)])
+        return SurveyResult("cache", _response_body(survey_id, cached))
+
+    # 2) Cache miss: only one generation runs per key; concurrent identical
+    #    requests await the same result instead of calling the LLM again.
+    #    (Coalesced briefs may differ in whitespace/case, hence the per-caller id.)
+    survey_bytes, source = await _generate_on_miss(req, client)
+    await _register([(survey_id, survey_bytes)])
+    return SurveyResult(source, _response_body(survey_id, survey_bytes))
+
+
+async def _generate_on_miss(req: GenerateSurveyRequest, client: str) -> Tuple[bytes, str]:
+    # Raises GenerationOverloaded when admission control sheds the request; that brief is
+    # then recorded as a pre-generation candidate (see _generate_and_cache for the other case).
+    key = make_key(req.description, req.num_questions, req.language)
+    with stage("generate"):
+        try:
+            if survey_flight.active(key):
+                # Joining a generation that's already running costs no extra slot.
+                survey_bytes, source = await survey_flight.do(key, lambda: _generate_and_cache(req))
+            else:
+                async with generate_admission.slot(client):
+                    survey_bytes, source = await survey_flight.do(key, lambda: _generate_and_cache(req))
+        except GenerationOverloaded:
+            missed_briefs.record(key, req)
+            raise
+        except UpstreamError:
+            # Only a pre-generation flight (warm_survey) lets upstream errors through;
+            # an interactive caller that joined it still gets the local fallback.
+            with stage("mock"):
+                raw = _generate_mock_survey(req.description, req.num_questions, req.language)
+            survey_bytes, source = await _save_survey(req, _survey_from_raw(req, raw)), "fallback"
+    # "fallback" (mock after an upstream error) is reported to clients as "mock".
+    SURVEY_SOURCE_TOTAL.inc(1, source)
+    return survey_bytes, "mock" if source == "fallback" else source
 
+
+async def get_survey_service(survey_id: str) -> Optional[Tuple[str, bytes]]:
+    """(etag, serialized Survey) for a registered survey id, else None."""
+    entry = await fetch_survey(survey_id)
+    if entry is None:
+        return None
+    etag, body = entry
+    return etag, _survey_object(survey_id, body)
+
+
+# -- Batch generation -----------------------------------------------------------
+async def generate_batch_service(reqs: List[GenerateSurveyRequest], client: str = "anonymous") -> bytes:
+    """
+    Generate many surveys in one call; returns the serialized BatchGenerateResponse.
+    - every exact cache hit is resolved with ONE multi-key query
+    - identical briefs (same cache key) are generated once and shared
+    - misses fan out to the adapter, at most BATCH_GENERATE_CONCURRENCY at a time
+    - results keep input order; a failed item (including one shed by admission control)
+      doesn't fail the batch
+    """
+    keys = [make_key(r.description, r.num_questions, r.language) for r in reqs]
+    with stage("batch_cache_lookup"):
+        hits = await fetch_cached_many(keys)
+
+    slots = asyncio.Semaphore(max(1, settings.BATCH_GENERATE_CONCURRENCY))
+
+    async def resolve_miss(req: GenerateSurveyRequest) -> Tuple[bytes, str]:
+        async with slots:
+            # Near-duplicate / superset tiers still apply; the exact probe is an L1 negative hit.
+            cached = await _lookup_cached(req)
+            if cached is not None:
+                SURVEY_SOURCE_TOTAL.inc(1, "cache")
+                return cached, "cache"
+            return await _generate_on_miss(req, client)
+
+    tasks: Dict[str, "asyncio.Task[Tuple[bytes, str]]"] = {}
+    for key, req in zip(keys, reqs):
+        if key not in hits and key not in tasks:
+            tasks[key] = asyncio.ensure_future(resolve_miss(req))
+    try:
+        if tasks:
+            await asyncio.wait(tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    items: List[bytes] = []
+    served: List[Tuple[str, bytes]] = []
+    counts = {"cache_hits": 0, "misses": len(tasks), "deduplicated": len(reqs) - len(set(keys)), "errors": 0}
+    for i, (key, req) in enumerate(zip(keys, reqs)):
+        head = b'{"index":' + str(i).encode() + b","
+        if key in hits:
+            counts["cache_hits"] += 1
+            SURVEY_SOURCE_TOTAL.inc(1, "cache")
+            survey_bytes, source = hits[key], "cache"
+        else:
+            task = tasks[key]
+            if task.exception() is not None:
+                counts["errors"] += 1
+                detail = json.dumps(str(task.exception()) or type(task.exception()).__name__, ensure_ascii=False)
+                items.append(head + b'"status":"error","error":' + detail.encode("utf-8") + b"}")
+                continue
+            survey_bytes, source = task.result()
+        survey_id = _survey_id(req)
+        served.append((survey_id, survey_bytes))
+        items.append(
+            head + b'"status":"ok","source":' + json.dumps(source).encode() + b',"survey":'
+            + _survey_object(survey_id, survey_bytes) + b"}"
+        )
+    await _register(served)
+    return b'{"results":[' + b",".join(items) + b'],"stats":' + json.dumps(counts).encode() + b"}"
+
+
+async def warm_survey(req: GenerateSurveyRequest, reserve: int = 0) -> str:
+    """
+    Make sure 'req' is cached; used by background pre-generation.
+    Returns "cache" if it already was, else "llm" (or "mock" in MOCK_LLM mode).
+    Unlike the interactive path there is no mock fallback: upstream errors propagate,
+    so a degraded upstream never fills the cache with placeholder surveys.
+    Generation goes through survey_flight, so a warm-up and interactive misses for the
+    same key share one upstream call whichever of them started it. Starting one takes a
+    background admission slot, which waits while interactive generations are queued or
+    fewer than 'reserve' slots are free.
+    """
+    if await _lookup_cached(req) is not None:
+        return "cache"
+    key = make_key(req.description, req.num_questions, req.language)
+    if survey_flight.active(key):
+        _, source = await survey_flight.do(key, lambda: _warm_and_cache(req))
+    else:
+        async with generate_admission.background_slot(reserve):
+            _, source = await survey_flight.do(key, lambda: _warm_and_cache(req))
+    if source == "fallback":
+        # Joined an interactive generation whose upstream call failed.
+        raise UpstreamError("upstream failed; the shared generation fell back to the mock generator")
+    return source
+
+
+async def _warm_and_cache(req: GenerateSurveyRequest) -> Tuple[bytes, str]:
+    if getattr(settings, "MOCK_LLM", False):
+        raw, source = _generate_mock_survey(req.description, req.num_questions, req.language), "mock"
+    else:
+        adapter = await get_adapter()
+        raw = await adapter.generate_survey(req.description, num_questions=req.num_questions, language=req.language)
+        source = "llm"
+    return await _save_survey(req, _survey_from_raw(req, raw)), source
+
+
+async def _generate_and_cache(req: GenerateSurveyRequest) -> Tuple[bytes, str]:
     # 2) Generate (MOCK first if enabled)
     # NOTE: Settings.MOCK_LLM may or may not exist depending on config;
     # getattr(..., False) keeps behavior consistent if it is missing.
+    source = "llm"
     if getattr(settings, "MOCK_LLM", False):
-        raw = _generate_mock_survey(req.description, req.num_questions, req.language)
+        with stage("mock"):
+            raw = _generate_mock_survey(req.description, req.num_questions, req.language)
+        source = "mock"
     else:
         try:
-            raw = await adapter.generate_survey(
-                req.description,
-                num_questions=req.num_questions,
-                language=req.language,
-            )
+            with stage("llm"):
+                adapter = await get_adapter()
+                raw = await adapter.generate_survey(
+                    req.description,
+                    num_questions=req.num_questions,
+                    language=req.language,
+                )
         except Exception as e:
             # Graceful fallback for common upstream errors (quota, rate limit, timeout)
-            msg = str(e).lower()
-            if "insufficient_quota" in msg or "429" in msg or "rate" in msg or "timeout" in msg:
-                raw = _generate_mock_survey(req.description, req.num_questions, req.language)
+            if _is_fallback_error(e):
+                with stage("mock"):
+                    raw = _generate_mock_survey(req.description, req.num_questions, req.language)
+                source = "fallback"
             else:
                 # Unknown error → bubble up to route handler
                 raise
 
+    # 3) Validate, 4) save to cache for identical inputs (works for both LLM and mock)
+    with stage("validate"):
+        survey = _survey_from_raw(req, raw)
+    with stage("save_cache"):
+        survey_bytes = await _save_generated(req, survey)
+    return survey_bytes, source
+
+
+async def _save_generated(req: GenerateSurveyRequest, survey: Survey) -> bytes:
+    # An interactive generation that couldn't be cached is recorded for pre-generation.
+    try:
+        return await _save_survey(req, survey)
+    except Exception:
+        missed_briefs.record(make_key(req.description, req.num_questions, req.language), req)
+        raise
+
+
+def _survey_from_raw(req: GenerateSurveyRequest, raw: dict) -> Survey:
     raw = _fill_missing_ids(raw)
 
     # 3) Validate to our Pydantic model (ensures the JSON matches our contract)
     try:
         survey = Survey.model_validate({
-            "id": f"srv_{_make_safe_id(req.description)}",
+            "id": _survey_id(req),
             "title": raw.get("title"),
             "description": raw.get("description"),
             "questions": raw.get("questions"),
@@ -134,17 +405,122 @@ async def generate_survey_service(req: GenerateSurveyRequest) -> Survey:
                 q.scale_min = 1
             if q.scale_max is None:
                 q.scale_max = 5
+    return survey
+
+
+async def _save_survey(req: GenerateSurveyRequest, survey: Survey) -> bytes:
+    # 4) Save to cache for identical inputs (works for both LLM and mock).
+    #    Returns the serialized form that was cached.
+    survey_json = {
+        "title": survey.title,
+        "description": survey.description,
+        "questions": [q.model_dump() for q in survey.questions],
+    }
+    survey_bytes = dump_survey_json(survey_json)
+    await save_cache(req.description, req.num_questions, req.language, survey_json, survey_bytes)
+    return survey_bytes
+
+
+# -- Streaming generation (SSE) -------------------------------------------------
+# Yields (event, data) pairs:
+#   meta     -> {"id", "source"}            once, before any question
+#   question -> validated Question dict     as soon as each one is complete
+#   done     -> {"survey": {...}}           the full validated survey (also cached)
+#   error    -> {"detail": "..."}           generation failed midway
+SurveyEvent = Tuple[str, Dict[str, Any]]
+
+
+def _validate_question(item: dict, position: int) -> Question:
+    # Same id/rating normalization as the blocking path, applied per question.
+    item.setdefault("id", f"q{position}")
+    for j, c in enumerate(item.get("choices") or [], start=1):
+        c.setdefault("id", f"c{j}")
+    q = Question.model_validate(item)
+    if q.type == "rating":
+        if q.scale_min is None:
+            q.scale_min = 1
+        if q.scale_max is None:
+            q.scale_max = 5
+    return q
+
+
+async def _replay_survey(survey: Survey, source: str) -> AsyncIterator[SurveyEvent]:
+    yield "meta", {"id": survey.id, "source": source}
+    for q in survey.questions:
+        yield "question", q.model_dump()
+    yield "done", {"survey": survey.model_dump()}
 
-    # 4) Save to cache for identical inputs (works for both LLM and mock)
-    await save_cache(
-        req.description,
-        req.num_questions,
-        req.language,
-        {
-            "title": survey.title,
-            "description": survey.description,
-            "questions": [q.model_dump() for q in survey.questions],
-        },
-    )
 
+async def _mock_and_cache(req: GenerateSurveyRequest) -> Survey:
+    survey = _survey_from_raw(req, _generate_mock_survey(req.description, req.num_questions, req.language))
+    await _register([(survey.id, await _save_survey(req, survey))])
     return survey
+
+
+async def stream_survey_service(req: GenerateSurveyRequest, client: str = "anonymous") -> AsyncIterator[SurveyEvent]:
+    survey_id = _survey_id(req)
+
+    # 1) Cache hits (and mock mode) replay the finished survey immediately.
+    with stage("cache_lookup"):
+        cached = await _lookup_cached(req)
+    if cached is not None:
+        SURVEY_SOURCE_TOTAL.inc(1, "cache")
+        await _register([(survey_id, cached)])
+        async for event in _replay_survey(_survey_from_raw(req, json.loads(cached)), "cache"):
+            yield event
+        return
+    if getattr(settings, "MOCK_LLM", False):
+        SURVEY_SOURCE_TOTAL.inc(1, "mock")
+        async for event in _replay_survey(await _mock_and_cache(req), "mock"):
+            yield event
+        return
+
+    # 2) Stream from the LLM, emitting each question once its JSON object closes.
+    #    The admission slot is held for the whole stream.
+    try:
+        await generate_admission.acquire(client)
+    except GenerationOverloaded as e:
+        missed_briefs.record(make_key(req.description, req.num_questions, req.language), req)
+        yield "error", {"detail": str(e), "retry_after_s": e.retry_after_s}
+        return
+    parser = JSONArrayStreamParser(array_depth=2)  # { "questions": [ <here> ] }
+    chunks = []
+    emitted = 0
+    try:
+        adapter = await get_adapter()
+        async for delta in adapter.stream_survey(
+            req.description,
+            num_questions=req.num_questions,
+            language=req.language,
+        ):
+            chunks.append(delta)
+            for item in parser.feed(delta):
+                emitted += 1
+                q = _validate_question(item, emitted)
+                if emitted == 1:
+                    yield "meta", {"id": survey_id, "source": "llm"}
+                yield "question", q.model_dump()
+        survey = _survey_from_raw(req, json.loads("".join(chunks) or "{}"))
+        generate_admission.release()
+    except BaseException as e:
+        generate_admission.release()
+        if not isinstance(e, Exception):
+            raise
+        if emitted == 0 and _is_fallback_error(e):
+            # Nothing sent yet: degrade to the local generator like the blocking path.
+            SURVEY_SOURCE_TOTAL.inc(1, "fallback")
+            async for event in _replay_survey(await _mock_and_cache(req), "mock"):
+                yield event
+            return
+        yield "error", {"detail": str(e)}
+        return
+
+    if emitted == 0:
+        yield "meta", {"id": survey_id, "source": "llm"}
+
+    # 3) Persist the finished survey like the blocking path does.
+    SURVEY_SOURCE_TOTAL.inc(1, "llm")
+    with stage("save_cache"):
+        survey_bytes = await _save_generated(req, survey)
+    await _register([(survey_id, survey_bytes)])
+    yield "done", {"survey": survey.model_dump()}
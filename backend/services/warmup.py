@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.config import settings
+from backend.db import prefill_pool
+from backend.repositories.survey_cache_repo import preload_hot_cache
+from backend.services.survey_service import get_adapter
+
+# Boot warm-up, reported through GET /api/internal/ready.
+# Steps run in a background task after startup, so the port and liveness are up at
+# once; readiness flips when they finish, fail or run past 'timeout_s'. Warm-up only
+# makes the first requests cheaper, it never keeps a worker out of rotation for good.
+
+Step = Tuple[str, Callable[[], Awaitable[Any]]]
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    def __init__(self, steps: List[Step], timeout_s: float):
+        self.steps = steps
+        self.timeout_s = timeout_s
+        self.ready = False
+        self.timed_out = False
+        self.duration_s: Optional[float] = None
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        if not self.steps:
+            self.ready = True
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._run_steps(), self.timeout_s)
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            logger.warning("warm-up did not finish within %.1fs; reporting ready", self.timeout_s)
+        finally:
+            self.duration_s = round(time.perf_counter() - start, 3)
+            self.ready = True
+
+    async def _run_steps(self) -> None:
+        for name, step in self.steps:
+            try:
+                self.results[name] = await step()
+            except Exception as e:
+                self.errors[name] = repr(e)
+                logger.warning("warm-up step %s failed: %r", name, e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "steps": [name for name, _ in self.steps],
+            "duration_s": self.duration_s,
+            "timed_out": self.timed_out,
+            "results": dict(self.results),
+            "errors": dict(self.errors),
+        }
+
+
+async def _build_llm_client() -> str:
+    # First use imports the OpenAI SDK and builds its HTTP client (in a worker thread);
+    # do it before traffic arrives.
+    return type(await get_adapter()).__name__
+
+
+def _steps() -> List[Step]:
+    if not settings.WARMUP_ENABLED:
+        return []
+    steps: List[Step] = [("db_pool", lambda: prefill_pool(settings.DB_POOL_SIZE))]
+    if settings.WARMUP_HOT_KEYS > 0:
+        steps.append(("survey_l1", lambda: preload_hot_cache(settings.WARMUP_HOT_KEYS)))
+    if not getattr(settings, "MOCK_LLM", False):
+        steps.append(("llm_client", _build_llm_client))
+    return steps
+
+
+boot_warmup = Warmup(_steps(), timeout_s=settings.WARMUP_TIMEOUT_S)
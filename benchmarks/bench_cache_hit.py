@@ -0,0 +1,88 @@
+"""
+Per-hit CPU cost of serving a cached survey: old dict -> Pydantic -> response_model
+path vs. the pre-serialized bytes fast path.
+
+    python -m benchmarks.bench_cache_hit [--iterations 20000]
+
+No database or network involved; both paths start from what the L1 cache holds.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.adapters.mock_adapter import generate_mock_survey
+from backend.models import GenerateSurveyResponse, Survey
+from backend.repositories.survey_cache_repo import dump_survey_json
+from backend.services.survey_service import _fill_missing_ids, _response_body
+
+RESPONSE_FIELD = create_model_field(name="Response_generate", type_=GenerateSurveyResponse, mode="serialization")
+
+
+def _cached_survey() -> dict:
+    raw = _fill_missing_ids(generate_mock_survey("Customer onboarding feedback", 8))
+    survey = Survey.model_validate({"id": "srv_x", **raw})
+    return {
+        "title": survey.title,
+        "description": survey.description,
+        "questions": [q.model_dump() for q in survey.questions],
+    }
+
+
+async def old_path(cached: dict) -> bytes:
+    # What a cache hit used to cost: validate, normalize, response_model validate + encode.
+    survey = Survey.model_validate({
+        "id": "srv_customer_onboarding_f",
+        "title": cached.get("title"),
+        "description": cached.get("description"),
+        "questions": cached.get("questions"),
+    })
+    for q in survey.questions:
+        if q.type == "rating":
+            if q.scale_min is None:
+                q.scale_min = 1
+            if q.scale_max is None:
+                q.scale_max = 5
+    content = await serialize_response(field=RESPONSE_FIELD, response_content={"survey": survey})
+    return JSONResponse(content).body
+
+
+async def new_path(cached: bytes) -> bytes:
+    return Response(content=_response_body("srv_customer_onboarding_f", cached), media_type="application/json").body
+
+
+async def _time(fn, arg, iterations: int) -> float:
+    for _ in range(200):  # warm-up
+        await fn(arg)
+    start = time.process_time()
+    for _ in range(iterations):
+        await fn(arg)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    cached = _cached_survey()
+    cached_bytes = dump_survey_json(cached)
+    assert json.loads(await old_path(cached)) == json.loads(await new_path(cached_bytes))
+
+    old_us = await _time(old_path, cached, args.iterations)
+    new_us = await _time(new_path, cached_bytes, args.iterations)
+    print(json.dumps({
+        "benchmark": "cache_hit_serialization",
+        "iterations": args.iterations,
+        "old_us_per_hit": round(old_us, 2),
+        "new_us_per_hit": round(new_us, 2),
+        "speedup": round(old_us / new_us, 1),
+    }))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+"""
+Per-call CPU cost of the local question-bank generator (MOCK_LLM / fallback path).
+
+    python -m benchmarks.bench_mock_generator [--iterations 20000]
+
+Cycles through briefs in every supported language at 3, 8 and 20 questions.
+"""
+import argparse
+import json
+import time
+
+from backend.adapters.mock_adapter import generate_mock_survey
+
+BRIEFS = [
+    ("Feedback on our new coffee machine and its delivery", "en"),
+    ("Post-event survey for our annual developer conference", "en"),
+    ("Quick pulse check", "en"),
+    ("Encuesta sobre nuestro restaurante y el servicio de entrega", "es"),
+    ("Sondage sur la formation en ligne et la plateforme", "fr"),
+    ("Umfrage zur Zufriedenheit der Mitarbeiter am Arbeitsplatz", "de"),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+    for n in (3, 8, 20):
+        for brief, lang in BRIEFS:  # warm-up
+            assert len(generate_mock_survey(brief, n, lang)["questions"]) == n
+        start = time.process_time()
+        for i in range(args.iterations):
+            brief, lang = BRIEFS[i % len(BRIEFS)]
+            generate_mock_survey(brief, n, lang)
+        results[f"us_per_call_{n}q"] = round((time.process_time() - start) / args.iterations * 1e6, 2)
+    print(json.dumps({"benchmark": "mock_generator", "iterations": args.iterations, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cold-start cost of a worker: importing backend.main, and (with a database) booting
+uvicorn until /api/internal/ready answers 200.
+
+    python -m benchmarks.bench_startup [--runs 10]
+    python -m benchmarks.bench_startup --database-url "$DATABASE_URL" --env DB_CREATE_ALL=0 --env WARMUP_ENABLED=1
+
+Every run is a fresh interpreter, so nothing is shared through module caches
+(the OS page cache still is: the first run is dropped as warm-up).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.run import _free_port
+
+_IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import backend.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'import_ms': elapsed * 1000, 'modules': len(sys.modules),"
+    " 'openai_loaded': 'openai' in sys.modules}))\n"
+)
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "median": round(statistics.median(ordered), 1),
+        "p90": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def _import_once(env: Dict[str, str]) -> Dict[str, float]:
+    start = time.perf_counter()
+    out = subprocess.check_output([sys.executable, "-c", _IMPORT_PROBE], env=env, text=True)
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000  # interpreter start + import + exit
+    return result
+
+
+def _boot_once(env: Dict[str, str], timeout_s: float) -> float:
+    # Spawn -> first 200 from the readiness endpoint (startup hooks + warm-up included).
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/api/internal/ready", timeout=1.0).status_code == 200:
+                    return (time.perf_counter() - start) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"not ready within {timeout_s:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_startup")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url", default=None, help="also measure boot-to-ready (needs Postgres)")
+    parser.add_argument("--boot-timeout-s", type=float, default=60.0)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra app settings")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.update(dict(kv.split("=", 1) for kv in args.env))
+
+    _import_once(env)  # warm-up
+    imports = [_import_once(env) for _ in range(args.runs)]
+    results = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "env": args.env,
+        "import_ms": _summary([r["import_ms"] for r in imports]),
+        "process_ms": _summary([r["process_ms"] for r in imports]),
+        "modules": imports[-1]["modules"],
+        "openai_loaded_at_import": imports[-1]["openai_loaded"],
+    }
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+        _boot_once(env, args.boot_timeout_s)  # warm-up (also creates the schema on a fresh DB)
+        results["boot_to_ready_ms"] = _summary([_boot_once(env, args.boot_timeout_s) for _ in range(args.runs)])
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Local OpenAI-compatible stub for exercising the adapter without the real API.
+
+    python -m benchmarks.fake_openai --port 8900 --latency-ms 800 --jitter-ms 400 \
+        --rate-429 0.1 --retry-after-s 1 --rate-500 0.02
+
+Then point the backend at it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=test uvicorn backend.main:app
+
+Implements POST /v1/chat/completions (plain and stream=true) and returns a survey
+built by the local mock generator. GET /stats reports what was injected.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from backend.adapters.mock_adapter import generate_mock_survey
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 500.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    retry_after_s: float = 1.0
+    rate_500: float = 0.0
+    stream_chunks: int = 20
+    counters: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "ok": 0, "429": 0, "500": 0, "in_flight": 0, "max_in_flight": 0})
+
+
+def create_app(config: FaultConfig) -> FastAPI:
+    app = FastAPI(title="fake-openai")
+    counters = config.counters
+
+    def _latency_s() -> float:
+        return max(0.0, config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)) / 1000.0
+
+    def _survey_text(body: Dict[str, Any]) -> str:
+        prompt = " ".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "user")
+        brief = re.search(r"Brief: (.*)", prompt)
+        num = re.search(r"Target number of questions: (\d+)", prompt)
+        lang = re.search(r"Language: (\S+)", prompt)
+        survey = generate_mock_survey(
+            brief.group(1) if brief else "fake brief",
+            int(num.group(1)) if num else 8,
+            lang.group(1) if lang else "en",
+        )
+        return json.dumps(survey)
+
+    def _inject_fault():
+        roll = random.random()
+        if roll < config.rate_429:
+            counters["429"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": str(config.retry_after_s)},
+            )
+        if roll < config.rate_429 + config.rate_500:
+            counters["500"] += 1
+            return JSONResponse({"error": {"message": "upstream error (fake)", "type": "server_error"}}, status_code=500)
+        return None
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        fault = _inject_fault()
+        if fault is not None:
+            return fault
+
+        content = _survey_text(body)
+        model = body.get("model", "fake-model")
+        created = int(time.time())
+        usage = {"prompt_tokens": 180, "completion_tokens": len(content) // 4, "total_tokens": 180 + len(content) // 4}
+
+        if not body.get("stream"):
+            counters["in_flight"] += 1
+            counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+            try:
+                await asyncio.sleep(_latency_s())
+            finally:
+                counters["in_flight"] -= 1
+            counters["ok"] += 1
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        async def events():
+            counters["in_flight"] += 1
+            counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+            try:
+                n = max(1, config.stream_chunks)
+                step = -(-len(content) // n)
+                pause = _latency_s() / n
+                for i in range(0, len(content), step):
+                    await asyncio.sleep(pause)
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+                counters["ok"] += 1
+            finally:
+                counters["in_flight"] -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return counters
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_openai")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="probability of answering 429")
+    parser.add_argument("--retry-after-s", type=float, default=1.0)
+    parser.add_argument("--rate-500", type=float, default=0.0, help="probability of answering 500")
+    parser.add_argument("--seed", type=int, default=None, help="seed latency/fault injection for repeatable runs")
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    config = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after_s=args.retry_after_s,
+        rate_500=args.rate_500,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
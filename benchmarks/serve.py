@@ -0,0 +1,67 @@
+"""
+backend.main:app with benchmark instrumentation, started by benchmarks.run.
+
+    python -m benchmarks.serve --port 8800 [--trace-allocations]
+
+Adds two routes that production never serves:
+- GET  /__bench__/counters  DB statements executed, allocated blocks, tracemalloc figures
+- POST /__bench__/reset     zero the counters between scenarios
+"""
+import argparse
+import sys
+import tracemalloc
+from typing import Any, Dict
+
+import uvicorn
+from sqlalchemy import event
+
+from backend.db import engine
+from backend.main import app
+
+_counters = {"db_statements": 0}
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    # One cursor execute == one round trip to Postgres (executemany batches count once).
+    _counters["db_statements"] += 1
+
+
+def _snapshot() -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "db_statements": _counters["db_statements"],
+        "allocated_blocks": sys.getallocatedblocks(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        out["traced_current_bytes"] = current
+        out["traced_peak_bytes"] = peak
+    return out
+
+
+@app.get("/__bench__/counters", include_in_schema=False)
+async def bench_counters():
+    return _snapshot()
+
+
+@app.post("/__bench__/reset", include_in_schema=False)
+async def bench_reset():
+    _counters["db_statements"] = 0
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    return _snapshot()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--trace-allocations", action="store_true", help="run under tracemalloc (slower, but reports bytes)")
+    args = parser.parse_args()
+    if args.trace_allocations:
+        tracemalloc.start()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
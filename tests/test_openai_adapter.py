@@ -0,0 +1,280 @@
+"""
+OpenAIAdapter traffic policy against a scripted in-process upstream (httpx.MockTransport):
+retries and backoff, hedged requests, the token bucket and concurrency-slot accounting.
+
+    python -m pytest -q tests
+"""
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, List, Union
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from backend.adapters.openai_adapter import OpenAIAdapter
+from backend.adapters.resilience import (
+    TokenBucket,
+    UpstreamRateLimited,
+    UpstreamUnavailable,
+    backoff_delay,
+    retry_after_seconds,
+)
+
+Handler = Callable[[httpx.Request], Union[httpx.Response, Awaitable[httpx.Response]]]
+
+SURVEY = {"title": "t", "description": "d", "questions": [{"id": "q1", "type": "open_text", "text": "Why?"}]}
+
+
+# -- Stub upstream -------------------------------------------------------------
+def _completion() -> httpx.Response:
+    return httpx.Response(200, json={
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(SURVEY)}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    })
+
+
+def _stream() -> httpx.Response:
+    text = json.dumps(SURVEY)
+    events = []
+    for i in range(0, len(text), 16):
+        chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": 0, "model": "stub",
+                 "choices": [{"index": 0, "delta": {"content": text[i:i + 16]}, "finish_reason": None}]}
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return httpx.Response(200, content="".join(events).encode(), headers={"content-type": "text/event-stream"})
+
+
+def _error(status: int, headers: Dict[str, str] = None) -> httpx.Response:
+    return httpx.Response(status, json={"error": {"message": f"stub {status}", "type": "stub"}}, headers=headers)
+
+
+class Upstream:
+    """Answers with the scripted responses in order, then with a completion; counts requests."""
+    def __init__(self, script: List[Handler] = ()):
+        self.script = list(script)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            step = self.script.pop(0) if self.script else None
+            if step is None:
+                return _stream() if json.loads(request.content).get("stream") else _completion()
+            result = step(request)
+            return await result if asyncio.iscoroutine(result) else result
+        finally:
+            self.in_flight -= 1
+
+
+def _adapter(upstream: Upstream, **policy) -> OpenAIAdapter:
+    adapter = OpenAIAdapter(api_key="test")
+    adapter.client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://upstream.test/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)),
+    )
+    adapter.breaker = None
+    adapter.max_retries = policy.get("max_retries", 2)
+    adapter.backoff_base_s = policy.get("backoff_base_s", 0.001)
+    adapter.backoff_max_s = policy.get("backoff_max_s", 0.01)
+    adapter.hedge_after_s = policy.get("hedge_after_s", 0.0)
+    adapter.max_concurrency = policy.get("max_concurrency", 4)
+    adapter._slots = asyncio.Semaphore(adapter.max_concurrency)
+    adapter._bucket = TokenBucket(rate=policy.get("rate", 0.0), burst=policy.get("burst", 10))
+    return adapter
+
+
+async def _collect(adapter: OpenAIAdapter) -> str:
+    return "".join([delta async for delta in adapter.stream_survey("brief", 1)])
+
+
+# -- Retries and backoff -------------------------------------------------------
+def test_retries_429_and_5xx_then_succeeds():
+    async def run():
+        upstream = Upstream([lambda r: _error(429, {"retry-after-ms": "5"}), lambda r: _error(503)])
+        adapter = _adapter(upstream)
+        assert await adapter.generate_survey("brief", 1) == SURVEY
+        assert upstream.requests == 3
+        assert adapter.retries == 2 and adapter.rate_limited == 1 and adapter.failures == 0
+    asyncio.run(run())
+
+
+def test_gives_up_with_typed_error_after_max_retries():
+    async def run():
+        upstream = Upstream([lambda r: _error(500)] * 3)
+        adapter = _adapter(upstream, max_retries=2)
+        with pytest.raises(UpstreamUnavailable):
+            await adapter.generate_survey("brief", 1)
+        assert upstream.requests == 3 and adapter.failures == 1
+    asyncio.run(run())
+
+
+def test_exhausted_quota_and_client_errors_are_not_retried():
+    async def run():
+        quota = httpx.Response(429, json={"error": {"message": "quota", "type": "insufficient_quota", "code": "insufficient_quota"}})
+        upstream = Upstream([lambda r: quota, lambda r: _error(400)])
+        adapter = _adapter(upstream)
+        with pytest.raises(UpstreamRateLimited):
+            await adapter.generate_survey("brief", 1)
+        with pytest.raises(Exception) as info:
+            await adapter.generate_survey("brief", 1)
+        assert getattr(info.value, "status_code", None) == 400
+        assert upstream.requests == 2 and adapter.retries == 0
+    asyncio.run(run())
+
+
+def test_retry_after_caps_at_backoff_max():
+    async def run():
+        upstream = Upstream([lambda r: _error(429, {"retry-after": "30"})])
+        adapter = _adapter(upstream, backoff_max_s=0.02)
+        start = time.monotonic()
+        await adapter.generate_survey("brief", 1)
+        assert time.monotonic() - start < 1.0
+        assert adapter.retries == 1
+    asyncio.run(run())
+
+
+def test_backoff_helpers():
+    for attempt in range(6):
+        assert 0 <= backoff_delay(attempt, 0.25, 4.0) <= min(4.0, 0.25 * 2 ** attempt)
+    assert retry_after_seconds({"retry-after-ms": "1500"}) == 1.5
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({}) is None
+
+
+# -- Hedging -------------------------------------------------------------------
+def test_slow_primary_is_hedged_and_backup_wins():
+    async def slow(request):
+        await asyncio.sleep(5)
+        return _completion()
+
+    async def run():
+        upstream = Upstream([slow])
+        adapter = _adapter(upstream, hedge_after_s=0.05)
+        start = time.monotonic()
+        assert await adapter.generate_survey("brief", 1) == SURVEY
+        assert time.monotonic() - start < 1.0
+        assert adapter.hedges == 1 and upstream.requests == 2
+        await asyncio.sleep(0)  # let the cancelled primary unwind
+        assert adapter._slots._value == adapter.max_concurrency and adapter.in_flight == 0
+    asyncio.run(run())
+
+
+def test_fast_primary_is_not_hedged():
+    async def run():
+        upstream = Upstream()
+        adapter = _adapter(upstream, hedge_after_s=1.0)
+        await adapter.generate_survey("brief", 1)
+        assert adapter.hedges == 0 and upstream.requests == 1
+    asyncio.run(run())
+
+
+# -- Token bucket --------------------------------------------------------------
+def test_token_bucket_spends_burst_then_paces():
+    async def run():
+        bucket = TokenBucket(rate=20.0, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert elapsed >= 0.09  # two tokens banked, two more at 20/s
+        assert bucket.waited_s > 0
+    asyncio.run(run())
+
+
+def test_token_bucket_disabled_at_rate_zero():
+    async def run():
+        bucket = TokenBucket(rate=0.0, burst=1)
+        for _ in range(100):
+            await bucket.acquire()
+        assert bucket.waited_s == 0
+    asyncio.run(run())
+
+
+def test_adapter_requests_are_paced_by_the_bucket():
+    async def run():
+        upstream = Upstream()
+        adapter = _adapter(upstream, rate=20.0, burst=1)
+        start = time.monotonic()
+        await asyncio.gather(*(adapter.generate_survey("brief", 1) for _ in range(3)))
+        assert time.monotonic() - start >= 0.09
+        assert upstream.requests == 3
+    asyncio.run(run())
+
+
+# -- Concurrency slots ---------------------------------------------------------
+def test_concurrency_is_capped_and_slots_return():
+    async def slow(request):
+        await asyncio.sleep(0.02)
+        return _completion()
+
+    async def run():
+        upstream = Upstream([slow] * 8)
+        adapter = _adapter(upstream, max_concurrency=2)
+        await asyncio.gather(*(adapter.generate_survey("brief", 1) for _ in range(8)))
+        assert upstream.max_in_flight == 2
+        assert adapter._slots._value == 2 and adapter.in_flight == 0 and adapter.calls == 8
+    asyncio.run(run())
+
+
+def test_stream_returns_its_slot_on_success_and_error():
+    async def run():
+        upstream = Upstream([lambda r: _error(400)])
+        adapter = _adapter(upstream, max_concurrency=1)
+        with pytest.raises(Exception):
+            await _collect(adapter)
+        assert adapter._slots._value == 1
+        assert json.loads(await _collect(adapter)) == SURVEY
+        assert adapter._slots._value == 1 and adapter.in_flight == 0
+    asyncio.run(run())
+
+
+def test_stream_retries_before_first_delta():
+    async def run():
+        upstream = Upstream([lambda r: _error(503), lambda r: _error(429, {"retry-after-ms": "1"})])
+        adapter = _adapter(upstream, max_concurrency=1)
+        assert json.loads(await _collect(adapter)) == SURVEY
+        assert upstream.requests == 3 and adapter.retries == 2
+        assert adapter._slots._value == 1
+    asyncio.run(run())
+
+
+def test_stream_cancelled_while_opening_returns_its_slot():
+    async def hang(request):
+        await asyncio.sleep(5)
+        return _stream()
+
+    async def run():
+        upstream = Upstream([hang])
+        adapter = _adapter(upstream, max_concurrency=1)
+        task = asyncio.ensure_future(_collect(adapter))
+        while upstream.in_flight == 0:
+            await asyncio.sleep(0.005)
+        assert adapter._slots._value == 0
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert adapter._slots._value == 1
+    asyncio.run(run())
+
+
+def test_abandoned_stream_returns_its_slot():
+    async def run():
+        adapter = _adapter(Upstream(), max_concurrency=1)
+        deltas = adapter.stream_survey("brief", 1)
+        await deltas.__anext__()
+        assert adapter._slots._value == 0
+        await deltas.aclose()
+        assert adapter._slots._value == 1 and adapter.in_flight == 0
+    asyncio.run(run())